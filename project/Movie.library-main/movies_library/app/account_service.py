@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 from app.adapters.json_adapter import JSONAdapter
 from app.observer import EventBus
+from infra.metrics import Metrics
 
 
 class AccountService:
@@ -15,9 +16,11 @@ class AccountService:
     def list_users(self) -> List[Dict[str, Any]]:
         return self.storage.get_all_users()
 
+    @Metrics.timed("service", op="accounts.get_user")
     def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
         return self.storage.get_user(user_id)
 
+    @Metrics.timed("service", op="accounts.register_user")
     def register_user(
         self,
         user_id: str,
@@ -40,14 +43,23 @@ class AccountService:
         EventBus.publish("USER_REGISTERED", {"user": created})
         return created
 
+    @Metrics.timed("service", op="accounts.authenticate")
     def authenticate(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         user = self.storage.get_user_by_username(username)
         if not user:
             return None
         return user if user.get("password") == password else None
 
+    @Metrics.timed("service", op="accounts.update_user")
     def update_user(self, user_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        return self.storage.update_user(user_id, patch)
+        updated = self.storage.update_user(user_id, patch)
+        if updated is not None:
+            EventBus.publish("USER_UPDATED", {"user": updated})
+        return updated
 
+    @Metrics.timed("service", op="accounts.delete_user")
     def delete_user(self, user_id: str) -> bool:
-        return self.storage.delete_user(user_id)
+        deleted = self.storage.delete_user(user_id)
+        if deleted:
+            EventBus.publish("USER_DELETED", {"user": {"id": user_id}})
+        return deleted
@@ -1,6 +1,23 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Protocol, runtime_checkable
-import os
+from typing import Any, Dict, List, Protocol, Tuple, runtime_checkable
+import asyncio, os, threading, time, weakref
+
+from app.ai.resilience import CircuitBreaker, SingleFlight, TokenBucket
+from infra.metrics import Metrics
+
+# SDK exceptions (OpenAI, google.api_core) that mean "try again later".
+_TRANSIENT = frozenset(("APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError",
+                        "DeadlineExceeded", "ServiceUnavailable", "ResourceExhausted", "TooManyRequests"))
+
+
+def _transient(e: BaseException) -> bool:
+    """Whether a backend error is worth a local stand-in rather than surfacing it."""
+    if isinstance(e, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(e, "status_code", None) or getattr(e, "code", None)
+    if isinstance(status, int) and 400 <= status < 600:
+        return status in (408, 429) or status >= 500
+    return any(c.__name__ in _TRANSIENT for c in type(e).__mro__)
 
 
 @runtime_checkable
@@ -9,28 +26,210 @@ class Recommender(Protocol):
         ...
 
 
+@runtime_checkable
+class AsyncRecommender(Protocol):
+    async def recommend_async(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+        ...
+
+
 class APIAdapter:
     """
     Unified AI adapter. Chooses the backend via:
       - constructor arg `backend`, or
-      - env var AI_BACKEND in {"mock", "openai", "gemini"} (default: "mock").
+      - env var AI_BACKEND in {"mock", "openai", "gemini", "fake"} (default: "mock").
+
+    The backend client is built lazily on first use, so constructing the
+    adapter (and reading `backend_name`) is free. The async path limits
+    in-flight calls per backend with AI_MAX_CONCURRENCY (default 8) and bounds each call, including time spent queued, by
+    AI_TIMEOUT seconds (default 30).
+
+    Remote backends are guarded per backend (the local mock is not):
+      - concurrent identical requests (same catalog, preferences and k) share one call;
+      - AI_QPS (default 0: unlimited) caps the call rate, with bursts of AI_BURST;
+        a request that would wait longer than AI_TIMEOUT for its turn is scored locally;
+      - after AI_BREAKER_FAILURES consecutive errors (default 5; 0 disables) the
+        circuit opens and requests go straight to the local scorer for
+        AI_BREAKER_RESET seconds (default 30), then one probe call is let through.
+    Transient backend errors (timeouts, connection failures, throttling, 5xx)
+    fall back to the local scorer too; any other error (a rejected key, a bad
+    request) propagates. `recommend_with_status` tells stand-in results apart
+    so callers need not cache them.
     """
 
+    # event loop -> backend name -> semaphore (asyncio primitives are per loop)
+    _semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+    # backend name -> (SingleFlight, TokenBucket, CircuitBreaker), shared by all adapters
+    _guards: Dict[str, Tuple[SingleFlight, TokenBucket, CircuitBreaker]] = {}
+    _guards_lock = threading.Lock()
+
     def __init__(self, backend: str | None = None) -> None:
         name = (backend or os.getenv("AI_BACKEND", "mock")).strip().lower()
+        self.backend_name = name if name in ("openai", "gemini", "fake") else "mock"
+        self._client: Recommender | None = None
+        self._client_lock = threading.Lock()
+        self._local: Recommender | None = None
+        self.max_concurrency = max(1, int(os.getenv("AI_MAX_CONCURRENCY", "8")))
+        self.timeout = float(os.getenv("AI_TIMEOUT", "30"))
+
+    @property
+    def client(self) -> Recommender:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
 
-        if name == "openai":
+    def _build_client(self) -> Recommender:
+        if self.backend_name == "openai":
             from app.ai.openai_client import OpenAIAdapter
-            self.client: Recommender = OpenAIAdapter()
-        elif name == "gemini":
+            return OpenAIAdapter()
+        if self.backend_name == "gemini":
             from app.ai.gemini_client import GeminiAdapter
-            self.client = GeminiAdapter()
-        else:
-            from app.ai.mock_client import MockAIAdapter
-            name = "mock"
-            self.client = MockAIAdapter()
+            return GeminiAdapter()
+        if self.backend_name == "fake":
+            from app.ai.fake_client import FakeLLMAdapter
+            return FakeLLMAdapter()
+        from app.ai.mock_client import MockAIAdapter
+        return MockAIAdapter()
 
-        self.backend_name = name
+    @property
+    def model_name(self) -> str:
+        return getattr(self.client, "model_name", self.backend_name)
+
+    @property
+    def guards(self) -> Tuple[SingleFlight, TokenBucket, CircuitBreaker]:
+        guards = self._guards.get(self.backend_name)
+        if guards is None:
+            with self._guards_lock:
+                guards = self._guards.get(self.backend_name)
+                if guards is None:
+                    guards = self._guards[self.backend_name] = (
+                        SingleFlight(),
+                        TokenBucket(float(os.getenv("AI_QPS", "0")), float(os.getenv("AI_BURST", "0"))),
+                        CircuitBreaker(int(os.getenv("AI_BREAKER_FAILURES", "5")), float(os.getenv("AI_BREAKER_RESET", "30"))),
+                    )
+        return guards
 
     def recommend(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
-        return self.client.recommend(user_profile=user_profile, movies=movies, k=k)
+        return self.recommend_with_status(user_profile, movies, k)[0]
+
+    def recommend_with_status(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]],
+                              k: int = 5) -> Tuple[List[Dict[str, Any]], bool]:
+        """(recs, degraded): `degraded` is True when the local scorer stood in for the backend."""
+        with Metrics.span("ai.recommend", backend=self.backend_name):
+            if self.backend_name == "mock":
+                return self.client.recommend(user_profile=user_profile, movies=movies, k=k), False
+            client = self.client  # configuration errors (e.g. a missing key) still raise
+            (recs, degraded), shared = self.guards[0].do(self._flight_key(user_profile, movies, k),
+                                                         lambda: self._guarded(client, user_profile, movies, k))
+            if shared:
+                Metrics.inc("ai.coalesced", backend=self.backend_name)
+            return list(recs), degraded
+
+    async def recommend_async(
+        self,
+        user_profile: Dict[str, Any],
+        movies: List[Dict[str, Any]],
+        k: int = 5,
+        timeout: float | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Raises asyncio.TimeoutError when the deadline passes."""
+        return (await self.recommend_with_status_async(user_profile, movies, k, timeout))[0]
+
+    async def recommend_with_status_async(
+        self,
+        user_profile: Dict[str, Any],
+        movies: List[Dict[str, Any]],
+        k: int = 5,
+        timeout: float | None = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Async `recommend_with_status`; raises asyncio.TimeoutError when the deadline passes."""
+        deadline = self.timeout if timeout is None else timeout
+        with Metrics.span("ai.recommend_async", backend=self.backend_name):
+            if self.backend_name == "mock":
+                recs = await asyncio.wait_for(self._call_async(self.client, user_profile, movies, k), timeout=deadline or None)
+                return recs, False
+            client = self.client
+            flight = self.guards[0].do_async(self._flight_key(user_profile, movies, k),
+                                             lambda: self._guarded_async(client, user_profile, movies, k))
+            (recs, degraded), shared = await asyncio.wait_for(flight, timeout=deadline or None)
+            if shared:
+                Metrics.inc("ai.coalesced", backend=self.backend_name)
+            return list(recs), degraded
+
+    @staticmethod
+    def _flight_key(user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int) -> tuple:
+        # The prompt depends on the preferences only; the catalog list is alive while its call is in flight.
+        return id(movies), len(movies), int(k), tuple(user_profile.get("preferences") or ())
+
+    def _admit(self) -> float | None:
+        """Seconds to wait for a rate-limit slot, or None to score locally right away."""
+        _, bucket, breaker = self.guards
+        if not breaker.allow():
+            Metrics.inc("ai.fallback", backend=self.backend_name, reason="circuit_open")
+            return None
+        wait = bucket.reserve(self.timeout or None)
+        if wait is None:
+            Metrics.inc("ai.fallback", backend=self.backend_name, reason="rate_limited")
+        return wait
+
+    def _fallback(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        if self._local is None:
+            from app.ai.mock_client import MockAIAdapter
+            self._local = MockAIAdapter()
+        return self._local.recommend(user_profile=user_profile, movies=movies, k=k)
+
+    def _failed(self, e: Exception) -> None:
+        """Count a transient failure against the breaker; re-raise any other error."""
+        if not _transient(e):
+            Metrics.inc("ai.error", backend=self.backend_name, type=type(e).__name__)
+            raise e
+        self.guards[2].failure()
+        Metrics.inc("ai.fallback", backend=self.backend_name, reason="error")
+
+    def _guarded(self, client: Recommender, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int) -> tuple:
+        """(recs, degraded), as shared with every caller of the flight."""
+        wait = self._admit()
+        if wait is None:
+            return self._fallback(user_profile, movies, k), True
+        if wait:
+            time.sleep(wait)
+        try:
+            recs = client.recommend(user_profile=user_profile, movies=movies, k=k)
+        except Exception as e:
+            self._failed(e)
+            return self._fallback(user_profile, movies, k), True
+        self.guards[2].success()
+        return recs, False
+
+    async def _guarded_async(self, client: Recommender, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int) -> tuple:
+        wait = self._admit()
+        if wait is None:
+            return self._fallback(user_profile, movies, k), True
+        if wait:
+            await asyncio.sleep(wait)
+        try:
+            recs = await self._call_async(client, user_profile, movies, k)
+        except asyncio.CancelledError:
+            # Every caller gave up waiting (deadline): as good as a failure for the breaker.
+            self.guards[2].failure()
+            raise
+        except Exception as e:
+            self._failed(e)
+            return self._fallback(user_profile, movies, k), True
+        self.guards[2].success()
+        return recs, False
+
+    async def _call_async(self, client: Recommender, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        async with self._semaphore():
+            if isinstance(client, AsyncRecommender):
+                return await client.recommend_async(user_profile=user_profile, movies=movies, k=k)
+            # Blocking-only backend: keep the event loop free.
+            return await asyncio.to_thread(client.recommend, user_profile=user_profile, movies=movies, k=k)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        per_loop = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        sem = per_loop.get(self.backend_name)
+        if sem is None:
+            sem = per_loop[self.backend_name] = asyncio.Semaphore(self.max_concurrency)
+        return sem
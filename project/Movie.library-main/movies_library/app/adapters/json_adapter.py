@@ -1,6 +1,8 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+import base64
 from app.db import JSONStore
+from infra.metrics import Metrics
 
 
 class JSONAdapter:
@@ -13,91 +15,109 @@ class JSONAdapter:
         self.store = JSONStore()
 
     # ---------------- Movies ----------------
+    @Metrics.timed("db.adapter", op="get_all_movies")
     def get_all_movies(self) -> List[Dict[str, Any]]:
+        # The store's snapshot is shared with every reader; callers get their own list.
         return list(self.store.movies)
 
+    MAX_PAGE_SIZE = 1000
+
+    def list_movies_page(self, cursor: Optional[str] = None, limit: int = 20,
+                         genre: Optional[str] = None) -> Dict[str, Any]:
+        """
+        One page of movies in stable id order. Pass the returned `next_cursor`
+        back to continue; it is None on the last page. Movies added or removed
+        between calls never cause repeats or skips of the others.
+        """
+        limit = max(1, min(int(limit), self.MAX_PAGE_SIZE))
+        rows = self.store.page_movies(self._decode_cursor(cursor), limit + 1, genre or None)
+        items = [dict(m) for m in rows[:limit]]
+        more = len(rows) > limit
+        return {"items": items, "next_cursor": self._encode_cursor(items[-1]["id"]) if more else None}
+
+    def iter_movies(self, genre: Optional[str] = None, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Yield every movie (in id order) one page at a time instead of copying the catalog."""
+        after: Optional[str] = None
+        page_size = max(1, min(int(page_size), self.MAX_PAGE_SIZE))
+        while True:
+            rows = self.store.page_movies(after, page_size, genre or None)
+            for m in rows:
+                yield dict(m)
+            if len(rows) < page_size:
+                return
+            after = rows[-1]["id"]
+
+    @staticmethod
+    def _encode_cursor(movie_id: str) -> str:
+        return base64.urlsafe_b64encode(movie_id.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Optional[str]:
+        if not cursor:
+            return None
+        try:
+            return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        except (ValueError, UnicodeError):
+            raise ValueError(f"invalid cursor: {cursor!r}")
+
+    def catalog_version(self) -> int:
+        """Changes whenever the movie catalog does; cheap enough to call per request."""
+        return self.store.movies_version
+
+    def catalog_digest(self) -> str:
+        """Content digest of the catalog; unlike catalog_version it is stable across restarts."""
+        return self.store.catalog_digest
+
     def get_movie(self, movie_id: str) -> Optional[Dict[str, Any]]:
-        for m in self.store.movies:
-            if m.get("id") == movie_id:
-                return dict(m)
-        return None
+        m = self.store.get_movie(movie_id)
+        return dict(m) if m is not None else None
 
     def add_movie(self, movie: Dict[str, Any]) -> Dict[str, Any]:
         if not movie.get("id") or not movie.get("title") or not movie.get("genre"):
             raise ValueError("movie must include 'id', 'title', and 'genre'")
-        if self.get_movie(movie["id"]):
-            raise ValueError(f"movie with id='{movie['id']}' already exists")
-
-        self.store.movies.append(dict(movie))
-        self.store.save_movies()
+        self.store.insert_movie(dict(movie))  # raises ValueError if the id is taken
         return movie
 
+    def has_movie(self, movie_id: str) -> bool:
+        return self.store.get_movie(movie_id) is not None
+
+    def add_movies(self, movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Persist a batch in one write. Ids that already exist are skipped; returns what was added."""
+        for movie in movies:
+            if not movie.get("id") or not movie.get("title") or not movie.get("genre"):
+                raise ValueError("movie must include 'id', 'title', and 'genre'")
+        return self.store.insert_movies([dict(m) for m in movies])
+
     def update_movie(self, movie_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        for i, m in enumerate(self.store.movies):
-            if m.get("id") == movie_id:
-                updated = dict(m)
-                updated.update(patch)
-                updated["id"] = movie_id  # ensure id stays the same
-                self.store.movies[i] = updated
-                self.store.save_movies()
-                return updated
-        return None
+        return self.store.patch_movie(movie_id, dict(patch))  # id stays the same
 
     def delete_movie(self, movie_id: str) -> bool:
-        before = len(self.store.movies)
-        self.store.movies = [m for m in self.store.movies if m.get("id") != movie_id]
-        if len(self.store.movies) != before:
-            self.store.save_movies()
-            return True
-        return False
+        return self.store.remove_movie(movie_id)
 
     # ---------------- Users ----------------
     def get_all_users(self) -> List[Dict[str, Any]]:
         return list(self.store.users)
 
     def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
-        for u in self.store.users:
-            if u.get("id") == user_id:
-                return dict(u)
-        return None
+        u = self.store.get_user(user_id)
+        return dict(u) if u is not None else None
 
     def get_user_by_username(self) -> Optional[Dict[str, Any]]:
         raise NotImplementedError("Use get_user_by_username(username) instead")  # guard against wrong call
 
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:  # type: ignore[override]
-        uname = (username or "").strip().lower()
-        for u in self.store.users:
-            if (u.get("username") or "").strip().lower() == uname:
-                return dict(u)
-        return None
+        u = self.store.get_user_by_username(username)
+        return dict(u) if u is not None else None
 
     def add_user(self, user: Dict[str, Any]) -> Dict[str, Any]:
         if not user.get("id") or not user.get("username"):
             raise ValueError("user must include 'id' and 'username'")
-        if self.get_user(user["id"]):
-            raise ValueError(f"user with id='{user['id']}' already exists")
-        if self.get_user_by_username(user["username"]):
-            raise ValueError(f"username '{user['username']}' is already taken")
-
-        self.store.users.append(dict(user))
-        self.store.save_users()
+        # Id and username checks happen atomically with the insert.
+        self.store.insert_user(dict(user))
         return user
 
     def update_user(self, user_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        for i, u in enumerate(self.store.users):
-            if u.get("id") == user_id:
-                updated = dict(u)
-                updated.update(patch)
-                updated["id"] = user_id  # keep ID unchanged
-                self.store.users[i] = updated
-                self.store.save_users()
-                return updated
-        return None
+        return self.store.patch_user(user_id, dict(patch))  # keeps the ID; raises if the username is taken
 
     def delete_user(self, user_id: str) -> bool:
-        before = len(self.store.users)
-        self.store.users = [u for u in self.store.users if u.get("id") != user_id]
-        if len(self.store.users) != before:
-            self.store.save_users()
-            return True
-        return False
+        return self.store.remove_user(user_id)
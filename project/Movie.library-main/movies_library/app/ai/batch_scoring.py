@@ -0,0 +1,75 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Sequence
+
+from app.ai.scoring import PreferenceIndex
+
+DEFAULT_CHUNK_BYTES = 256 * 1024 * 1024
+
+
+def batch_top_k(
+    preferences: Sequence[Sequence[str]],
+    movies: Sequence[Dict[str, Any]],
+    k: int,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the mock scorer's top-k for each preference list, in input order.
+
+    Users are encoded as a 0/1 matrix over the preference vocabulary and movies
+    as genre/tag occurrence counts over the same vocabulary, so one matrix
+    product scores a whole chunk of users. Rows are processed in chunks whose
+    working set stays under `chunk_bytes`. Results are identical to
+    MockAIAdapter (ties broken by catalog position).
+    """
+    if not movies:
+        for _ in preferences:
+            yield []
+        return
+    try:
+        import numpy as np  # imported on first use to keep startup fast
+    except ImportError:  # optional: fall back to the inverted index per user
+        np = None
+    if np is None or k <= 0:  # k <= 0 slices like the plain scorer; the index does the same
+        index = PreferenceIndex(movies)
+        for prefs in preferences:
+            yield index.top_k(prefs, k)
+        return
+
+    n = len(movies)
+    kk = min(k, n)
+    vocab: Dict[str, int] = {}
+    rows: List[List[int]] = []
+    for prefs in preferences:
+        rows.append([vocab.setdefault(p.lower(), len(vocab)) for p in set(p.lower() for p in prefs)])
+
+    # Movie side: counts[v, pos] = occurrences of vocab term v in the movie's genre + tags.
+    counts = np.zeros((max(len(vocab), 1), n), dtype=np.float32)
+    for pos, m in enumerate(movies):
+        v = vocab.get((m.get("genre") or "").lower())
+        if v is not None:
+            counts[v, pos] += 1
+        for t in m.get("tags") or []:
+            v = vocab.get(t.lower())
+            if v is not None:
+                counts[v, pos] += 1
+
+    # Unique sort key per cell: score first, then earlier catalog position.
+    tiebreak = np.arange(n - 1, -1, -1, dtype=np.int64)
+    per_row = n * (4 + 8 + 8)  # float32 scores + int64 keys + argpartition indices
+    chunk = max(1, int(chunk_bytes) // per_row)
+
+    for start in range(0, len(rows), chunk):
+        block = rows[start:start + chunk]
+        users = np.zeros((len(block), counts.shape[0]), dtype=np.float32)
+        for i, terms in enumerate(block):
+            users[i, terms] = 1.0
+        keys = (users @ counts).astype(np.int64)
+        keys *= n
+        keys += tiebreak
+        if kk < n:
+            top = np.argpartition(-keys, kk - 1, axis=1)[:, :kk]
+        else:
+            top = np.broadcast_to(np.arange(n), keys.shape)
+        order = np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1)
+        for picked in np.take_along_axis(top, order, axis=1):
+            yield [movies[pos] for pos in picked.tolist()]
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import asyncio, os, random, threading, time
+
+from app.ai.mock_client import MockAIAdapter
+
+
+class FakeLLMAdapter:
+    """
+    Stand-in for a remote LLM backend (AI_BACKEND=fake) with injectable
+    latency and failures, for exercising the resilience layer without a key.
+    Each call sleeps `latency` seconds (AI_FAKE_LATENCY, default 0.05), then
+    fails (ConnectionError) with probability `error_rate` (AI_FAKE_ERROR_RATE,
+    default 0), and otherwise answers like the local scorer. `calls` counts
+    backend calls.
+    """
+
+    model_name = "fake"
+
+    def __init__(self, latency: float | None = None, error_rate: float | None = None, seed: Optional[int] = None) -> None:
+        self.latency = float(os.getenv("AI_FAKE_LATENCY", "0.05")) if latency is None else latency
+        self.error_rate = float(os.getenv("AI_FAKE_ERROR_RATE", "0")) if error_rate is None else error_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._local = MockAIAdapter()
+
+    def _outcome(self) -> bool:
+        with self._lock:
+            self.calls += 1
+            return self._random.random() >= self.error_rate
+
+    def recommend(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+        ok = self._outcome()
+        time.sleep(self.latency)
+        if not ok:
+            raise ConnectionError("fake backend: injected failure")
+        return self._local.recommend(user_profile, movies, k)
+
+    async def recommend_async(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+        ok = self._outcome()
+        await asyncio.sleep(self.latency)
+        if not ok:
+            raise ConnectionError("fake backend: injected failure")
+        return self._local.recommend(user_profile, movies, k)
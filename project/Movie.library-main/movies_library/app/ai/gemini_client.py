@@ -1,7 +1,12 @@
 from typing import List, Dict, Any
-import os
+from pathlib import Path
+import hashlib, json, os, time
 import google.generativeai as genai
 
+from app.ai.prompting import CandidateSelector
+from app.ai.title_matcher import TitleMatcher
+from infra.metrics import Metrics
+
 
 class GeminiAdapter:
     """Adapter that integrates Google Gemini for movie recommendations with dynamic model selection."""
@@ -10,7 +15,14 @@ class GeminiAdapter:
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise ValueError("Missing Gemini API key. Please set GEMINI_API_KEY.")
-        genai.configure(api_key=api_key)
+        # GEMINI_API_ENDPOINT lets tests point the REST transport at a local stub.
+        endpoint = os.getenv("GEMINI_API_ENDPOINT")
+        if endpoint:
+            genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+        else:
+            genai.configure(api_key=api_key)
+        timeout = float(os.getenv("AI_TIMEOUT", "30"))
+        self.request_options = {"timeout": timeout} if timeout else {}
 
         # 1) If user explicitly sets a model, try to use it
         preferred = os.getenv("GEMINI_MODEL")
@@ -22,8 +34,35 @@ class GeminiAdapter:
             "gemini-pro",
             "text-bison-001",  # legacy but often available
         ]
-        self.model_name = self._select_model(preferred, fallbacks)
+        self.model_name = self._cached_model(f"{api_key}|{endpoint or ''}", preferred, fallbacks)
         self.model = genai.GenerativeModel(self.model_name)
+        self.candidates = CandidateSelector(backend="gemini")
+
+    def _cached_model(self, account: str, preferred: str | None, fallbacks: List[str]) -> str:
+        """
+        `_select_model` costs a list_models() round trip, so its answer is kept
+        in GEMINI_MODEL_CACHE (default data/gemini_model.json) for
+        GEMINI_MODEL_CACHE_TTL seconds (default 86400; 0 disables).
+        """
+        path = Path(os.getenv("GEMINI_MODEL_CACHE", "data/gemini_model.json"))
+        ttl = float(os.getenv("GEMINI_MODEL_CACHE_TTL", "86400"))
+        key = hashlib.sha256(f"{account}|{preferred or ''}|{','.join(fallbacks)}".encode("utf-8")).hexdigest()
+        if ttl > 0:
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+                if entry["key"] == key and time.time() - float(entry["at"]) < ttl:
+                    return str(entry["model"])
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+        name = self._select_model(preferred, fallbacks)
+        if ttl > 0:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps({"key": key, "model": name, "at": time.time()}), encoding="utf-8")
+            except OSError:
+                pass
+        return name
 
     def _select_model(self, preferred: str | None, fallbacks: List[str]) -> str:
         """Pick a model that supports generateContent. Prefer explicit setting, else fallbacks, else first available."""
@@ -58,9 +97,16 @@ class GeminiAdapter:
             "Enable Generative Language API for your key, or set GEMINI_MODEL to a model visible in your account."
         )
 
-    def recommend(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _line(m: Dict[str, Any]) -> str:
+        return f"- {m.get('title','')} [{m.get('genre','')}] tags={', '.join(m.get('tags', []))}"
+
+    def _prompt(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int) -> tuple:
+        """Prompt text plus the candidate shortlist it lists as the catalog."""
+        with Metrics.span("ai.prompt", backend="gemini"):
+            candidates = self.candidates.select(user_profile, movies, k, line=self._line)
         prefs = ", ".join(user_profile.get("preferences", []))
-        catalog = "\n".join([f"- {m.get('title','')} [{m.get('genre','')}] tags={', '.join(m.get('tags', []))}" for m in movies])
+        catalog = "\n".join([self._line(m) for m in candidates])
 
         prompt = (
             "You are a movie recommendation assistant.\n"
@@ -70,45 +116,30 @@ class GeminiAdapter:
             f"Task: Recommend the top {k} movies from the catalog that best match the user preferences. "
             "Respond with a plain list of titles only, one per line, no numbering and no extra text."
         )
-
-        try:
-            resp = self.model.generate_content(prompt)
-            text = (resp.text or "").strip()
-        except Exception as e:
-            # Graceful fallback: basic preference ranking
-            prefs_set = set(p.lower() for p in user_profile.get("preferences", []))
-            def score(m: Dict[str, Any]) -> int:
-                g = (m.get("genre") or "").lower()
-                tags = [t.lower() for t in m.get("tags", [])]
-                return int(g in prefs_set) + sum(t in prefs_set for t in tags)
-            return sorted(movies, key=score, reverse=True)[:k]
-
-        # Map generated titles back to our catalog
-        lines = [ln.strip("- •\t ").strip() for ln in text.splitlines() if ln.strip()]
-        ranked: List[Dict[str, Any]] = []
-        lower_by_title = {m["title"].lower(): m for m in movies}
-
-        for ln in lines:
-            key = ln.lower()
-            if key in lower_by_title:
-                ranked.append(lower_by_title[key])
-            else:
-                # Try loose match by genre/tags if a title wasn't matched
-                for m in movies:
-                    blob = (m.get("title","") + " " + m.get("genre","") + " " + " ".join(m.get("tags", []))).lower()
-                    if key in blob:
-                        ranked.append(m)
-                        break
-            if len(ranked) >= k:
-                break
-
+        self.candidates.record(prompt, len(candidates), len(movies))
+        return prompt, candidates
+
+    def _rank(self, text: str, user_profile: Dict[str, Any],
+              candidates: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        # Map generated titles back to our catalog in one pass over the reply
+        with Metrics.span("ai.title_map", backend="gemini"):
+            # Only the shortlist was offered, so only it can be named.
+            ranked = TitleMatcher(candidates).find(text, limit=k)
         if not ranked:
-            # Fallback: quick preference sort
-            prefs_set = set(p.lower() for p in user_profile.get("preferences", []))
-            def score(m: Dict[str, Any]) -> int:
-                g = (m.get("genre") or "").lower()
-                tags = [t.lower() for t in m.get("tags", [])]
-                return int(g in prefs_set) + sum(t in prefs_set for t in tags)
-            ranked = sorted(movies, key=score, reverse=True)
-
-        return ranked[:k]
+            # Fallback: the shortlist is already in local-scorer order
+            Metrics.inc("ai.fallback", backend="gemini", reason="unmatched")
+            return candidates[:k]
+        return ranked
+
+    def recommend(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+        # API errors propagate: APIAdapter counts them for its circuit breaker and falls back locally.
+        prompt, candidates = self._prompt(user_profile, movies, k)
+        with Metrics.span("ai.llm_call", backend="gemini"):
+            resp = self.model.generate_content(prompt, request_options=self.request_options)
+        return self._rank((resp.text or "").strip(), user_profile, candidates, k)
+
+    async def recommend_async(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+        prompt, candidates = self._prompt(user_profile, movies, k)
+        with Metrics.span("ai.llm_call", backend="gemini"):
+            resp = await self.model.generate_content_async(prompt, request_options=self.request_options)
+        return self._rank((resp.text or "").strip(), user_profile, candidates, k)
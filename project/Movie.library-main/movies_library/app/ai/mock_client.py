@@ -1,16 +1,24 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
+
+from app.ai.parallel_scoring import ParallelIndex, preference_index
 
 
 class MockAIAdapter:
     """Simple local AI adapter that ranks movies based on user preferences."""
 
-    def recommend(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
-        prefs = set(p.lower() for p in user_profile.get("preferences", []))
+    def __init__(self) -> None:
+        # Rebuilt only when a different catalog list is passed in (callers
+        # reuse the same list while the catalog version is unchanged).
+        self._index: Optional[Any] = None
 
-        def score(m: Dict[str, Any]) -> int:
-            genre = (m.get("genre") or "").lower()
-            tags = [t.lower() for t in m.get("tags", [])]
-            return int(genre in prefs) + sum(t in prefs for t in tags)
+    def recommend(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+        index = self._index = preference_index(movies, self._index)
+        return index.top_k(user_profile.get("preferences", []), k)
 
-        ranked = sorted(movies, key=score, reverse=True)
-        return ranked[:k]
+    async def recommend_async(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+        index = self._index
+        if index is None or not index.covers(movies) or isinstance(index, ParallelIndex):
+            # Building an index, or waiting on the scoring processes, would block the event loop.
+            return await asyncio.to_thread(self.recommend, user_profile, movies, k)
+        return index.top_k(user_profile.get("preferences", []), k)  # in-process lookup: cheap enough inline
@@ -1,6 +1,10 @@
 from typing import List, Dict, Any
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from app.ai.prompting import CandidateSelector
+from app.ai.title_matcher import TitleMatcher
+from infra.metrics import Metrics
 
 
 class OpenAIAdapter:
@@ -10,26 +14,50 @@ class OpenAIAdapter:
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("Missing OpenAI API key. Please set OPENAI_API_KEY.")
-        self.client = OpenAI(api_key=api_key)
+        # OPENAI_BASE_URL (read by the SDK) can point both clients at a local stub.
+        timeout = float(os.getenv("AI_TIMEOUT", "30")) or None
+        self.client = OpenAI(api_key=api_key, timeout=timeout)
+        self.async_client = AsyncOpenAI(api_key=api_key, timeout=timeout)
+        self.model_name = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self.candidates = CandidateSelector(backend="openai")
 
-    def recommend(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+    def _messages(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int) -> tuple:
+        """Chat messages plus the candidate shortlist they mention."""
+        with Metrics.span("ai.prompt", backend="openai"):
+            candidates = self.candidates.select(user_profile, movies, k, line=lambda m: m["title"])
         prefs = ", ".join(user_profile.get("preferences", []))
-        movie_titles = ", ".join([m["title"] for m in movies])
+        movie_titles = ", ".join([m["title"] for m in candidates])
 
         prompt = (
             f"The user prefers: {prefs}.\n"
             f"Movies available: {movie_titles}.\n"
             f"Suggest the top {k} movies most aligned with their preferences."
         )
+        self.candidates.record(prompt, len(candidates), len(movies))
+        return [
+            {"role": "system", "content": "You are a movie recommendation assistant."},
+            {"role": "user", "content": prompt},
+        ], candidates
 
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a movie recommendation assistant."},
-                {"role": "user", "content": prompt},
-            ],
-        )
-
+    def _rank(self, response: Any, candidates: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        # Titles named in the reply, in the order the model gave them.
         text = response.choices[0].message.content.strip()
-        ranked = [m for m in movies if any(t.lower() in text.lower() for t in [m["title"], m["genre"]])]
-        return ranked[:k] if ranked else movies[:k]
+        with Metrics.span("ai.title_map", backend="openai"):
+            # Only the shortlist was offered, so only it can be named.
+            ranked = TitleMatcher(candidates).find(text, limit=k)
+        if ranked:
+            return ranked
+        Metrics.inc("ai.fallback", backend="openai", reason="unmatched")
+        return candidates[:k]
+
+    def recommend(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+        messages, candidates = self._messages(user_profile, movies, k)
+        with Metrics.span("ai.llm_call", backend="openai"):
+            response = self.client.chat.completions.create(model=self.model_name, messages=messages)
+        return self._rank(response, candidates, k)
+
+    async def recommend_async(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
+        messages, candidates = self._messages(user_profile, movies, k)
+        with Metrics.span("ai.llm_call", backend="openai"):
+            response = await self.async_client.chat.completions.create(model=self.model_name, messages=messages)
+        return self._rank(response, candidates, k)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import atexit, heapq, itertools, multiprocessing, os, threading
+
+from app.ai.scoring import PreferenceIndex
+from infra.metrics import Metrics
+
+# ---------------- worker side ----------------
+# Partitions loaded in this worker process: token -> (offset, size, postings).
+# The previous catalog is kept so requests already in flight still resolve.
+_partitions: Dict[int, Tuple[int, int, Dict[str, array]]] = {}
+
+
+def _load_partition(token: int, offset: int, rows: List[Tuple[str, Tuple[str, ...]]]) -> int:
+    postings: Dict[str, array] = defaultdict(lambda: array("I"))
+    for pos, (genre, tags) in enumerate(rows):
+        postings[genre].append(pos)
+        for t in tags:
+            postings[t].append(pos)
+    for stale in sorted(_partitions)[:-1]:
+        del _partitions[stale]
+    _partitions[token] = (offset, len(rows), dict(postings))
+    return len(rows)
+
+
+def _partition_top_k(token: int, preferences: List[str], k: int) -> List[Tuple[int, int]]:
+    """This partition's best k as (score, global position), ranked like PreferenceIndex.top_k."""
+    offset, size, postings = _partitions[token]
+    hits: Dict[int, int] = {}
+    for p in preferences:
+        for pos in postings.get(p, ()):
+            hits[pos] = hits.get(pos, 0) + 1
+    best = heapq.nsmallest(k, hits.items(), key=lambda it: (-it[1], it[0]))
+    ranked = [(score, offset + pos) for pos, score in best]
+    pos = 0
+    while len(ranked) < k and pos < size:
+        if pos not in hits:
+            ranked.append((0, offset + pos))
+        pos += 1
+    return ranked
+
+
+# ---------------- parent side ----------------
+class ParallelIndex:
+    """
+    Drop-in for PreferenceIndex over large catalogs: the catalog is cut into
+    contiguous partitions, each held by its own single-process executor, so a
+    request is scored on every partition at once and the per-partition top-k
+    lists are merged by (score desc, catalog position). The result is exactly
+    PreferenceIndex.top_k.
+
+    Executors are process-wide and persistent; a partition is shipped to its
+    worker once per catalog (when `for_movies` sees a new list), never per
+    request. Sized by AI_SCORING_WORKERS (default: CPU count); catalogs below
+    AI_PARALLEL_MIN_MOVIES (default 200000) stay on the in-process index.
+    A pool with a dead worker is replaced on the next `for_movies`.
+    """
+
+    _executors: List[ProcessPoolExecutor] = []
+    _current: Optional["ParallelIndex"] = None
+    _lock = threading.Lock()
+    _tokens = itertools.count(1)
+
+    def __init__(self, movies: Sequence[Dict[str, Any]], workers: int) -> None:
+        self.movies = movies
+        self.size = len(movies)
+        self.token = next(self._tokens)
+        self._serial: Optional[PreferenceIndex] = None
+        executors = self._pool(workers)
+        step = -(-self.size // len(executors))  # ceiling division
+        loads = []
+        for i, ex in enumerate(executors):
+            rows = [((m.get("genre") or "").lower(), tuple(t.lower() for t in m.get("tags") or []))
+                    for m in movies[i * step:(i + 1) * step]]
+            loads.append(ex.submit(_load_partition, self.token, i * step, rows))
+        for f in loads:
+            f.result()
+
+    @classmethod
+    def _pool(cls, workers: int) -> List[ProcessPoolExecutor]:
+        # Caller holds _lock. Spawned (not forked) workers: the parent runs threads.
+        if len(cls._executors) != workers or cls._broken():
+            cls.shutdown()
+            ctx = multiprocessing.get_context("spawn")
+            cls._executors = [ProcessPoolExecutor(max_workers=1, mp_context=ctx) for _ in range(workers)]
+        return cls._executors
+
+    @classmethod
+    def _broken(cls) -> bool:
+        # A worker that died takes its executor down for good (BrokenProcessPool).
+        return any(getattr(ex, "_broken", False) for ex in cls._executors)
+
+    @classmethod
+    def for_movies(cls, movies: Sequence[Dict[str, Any]], workers: int) -> "ParallelIndex":
+        """Raises if the partitions cannot be loaded even on fresh executors."""
+        with cls._lock:
+            current = cls._current
+            if current is None or not current.covers(movies) or len(cls._executors) != workers or cls._broken():
+                cls._current = None
+                try:
+                    current = cls(movies, workers)
+                except Exception:  # e.g. a worker died while loading: once more on new executors
+                    cls.shutdown()
+                    current = cls(movies, workers)
+                cls._current = current
+            return current
+
+    @classmethod
+    def shutdown(cls) -> None:
+        for ex in cls._executors:
+            ex.shutdown(wait=False, cancel_futures=True)
+        cls._executors = []
+        cls._current = None
+
+    def covers(self, movies: Sequence[Dict[str, Any]]) -> bool:
+        return movies is self.movies and len(movies) == self.size
+
+    def top_k(self, preferences: Iterable[str], k: int) -> List[Dict[str, Any]]:
+        if k <= 0:  # PreferenceIndex's edge-case semantics; not worth a parallel path
+            if self._serial is None:
+                self._serial = PreferenceIndex(self.movies)
+            return self._serial.top_k(preferences, k)
+        prefs = sorted(set(p.lower() for p in preferences))
+        try:
+            futures = [ex.submit(_partition_top_k, self.token, prefs, k) for ex in self._executors]
+            merged = heapq.nsmallest(k, (r for f in futures for r in f.result()), key=lambda r: (-r[0], r[1]))
+        except Exception:  # a worker died or the pool was replaced: same answer, in-process
+            Metrics.inc("ai.parallel_fallback")
+            if self._serial is None:
+                self._serial = PreferenceIndex(self.movies)
+            return self._serial.top_k(prefs, k)
+        return [self.movies[pos] for _, pos in merged]
+
+
+def scoring_workers() -> int:
+    return max(1, int(os.getenv("AI_SCORING_WORKERS", "0")) or os.cpu_count() or 1)
+
+
+def preference_index(movies: Sequence[Dict[str, Any]], current: Any = None) -> Any:
+    """
+    The local scorer for `movies`: `current` while it still covers them, else
+    a PreferenceIndex, or the shared ParallelIndex for catalogs of at least
+    AI_PARALLEL_MIN_MOVIES when more than one worker is configured.
+    """
+    if current is not None and current.covers(movies):
+        return current
+    workers = scoring_workers()
+    if workers > 1 and len(movies) >= int(os.getenv("AI_PARALLEL_MIN_MOVIES", "200000")):
+        try:
+            return ParallelIndex.for_movies(movies, workers)
+        except Exception:
+            Metrics.inc("ai.parallel_fallback")
+    return PreferenceIndex(movies)
+
+
+atexit.register(ParallelIndex.shutdown)
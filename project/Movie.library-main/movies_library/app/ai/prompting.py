@@ -0,0 +1,72 @@
+from __future__ import annotations
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+import os
+
+from app.ai.parallel_scoring import preference_index
+from infra.metrics import Metrics
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); good enough for budgeting."""
+    return (len(text) + 3) // 4
+
+
+class CandidateSelector:
+    """
+    Retrieval stage in front of the LLM backends: the local preference scorer
+    picks the best-matching movies and only those go into the prompt, so the
+    LLM re-ranks a short list instead of reading the whole catalog.
+
+    The list is cut when the catalog lines would exceed AI_PROMPT_TOKEN_BUDGET
+    (default 3000 tokens) or AI_MAX_CANDIDATES movies (default 200). Stats for
+    recent prompts are kept in `history` (newest last).
+    """
+
+    def __init__(self, budget_tokens: int | None = None, max_candidates: int | None = None, backend: str = "") -> None:
+        self.backend = backend  # metrics label
+        self.budget_tokens = int(os.getenv("AI_PROMPT_TOKEN_BUDGET", "3000")) if budget_tokens is None else budget_tokens
+        self.max_candidates = int(os.getenv("AI_MAX_CANDIDATES", "200")) if max_candidates is None else max_candidates
+        self.history: Deque[Dict[str, int]] = deque(maxlen=256)
+        self._index: Optional[Any] = None
+
+    def select(
+        self,
+        user_profile: Dict[str, Any],
+        movies: List[Dict[str, Any]],
+        k: int,
+        line: Callable[[Dict[str, Any]], str],
+    ) -> List[Dict[str, Any]]:
+        ranked = self.top_k(user_profile, movies, max(self.max_candidates, k))
+
+        picked: List[Dict[str, Any]] = []
+        used = 0
+        for m in ranked:
+            cost = estimate_tokens(line(m)) + 1
+            # Always keep at least k so the backend can fill the request.
+            if len(picked) >= k and used + cost > self.budget_tokens:
+                break
+            picked.append(m)
+            used += cost
+        return picked
+
+    def top_k(self, user_profile: Dict[str, Any], movies: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        """The local scorer's ranking (what the backends fall back to)."""
+        index = self._index = preference_index(movies, self._index)
+        return index.top_k(user_profile.get("preferences", []), k)
+
+    def record(self, prompt: str, candidates: int, catalog: int) -> Dict[str, int]:
+        stats = {
+            "catalog": catalog,
+            "candidates": candidates,
+            "prompt_chars": len(prompt),
+            "prompt_tokens": estimate_tokens(prompt),
+        }
+        Metrics.observe("ai.prompt_tokens", stats["prompt_tokens"], backend=self.backend)
+        Metrics.observe("ai.prompt_candidates", candidates, backend=self.backend)
+        self.history.append(stats)
+        return stats
+
+    @property
+    def last(self) -> Optional[Dict[str, int]]:
+        return self.history[-1] if self.history else None
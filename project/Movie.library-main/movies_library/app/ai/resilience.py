@@ -0,0 +1,137 @@
+"""
+Guards for calls to remote LLM backends: request coalescing (SingleFlight),
+client-side rate limiting (TokenBucket) and fail-fast on an unhealthy
+backend (CircuitBreaker). All are thread-safe; APIAdapter holds one of each
+per backend.
+"""
+from __future__ import annotations
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import asyncio, threading, time, weakref
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller
+    runs the function, callers arriving while it is in flight wait for and
+    share its result (or exception). Nothing is cached afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        # asyncio tasks belong to one loop: loop -> key -> [task, waiters]
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, list]]" = weakref.WeakKeyDictionary()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple:
+        """(result, shared): `shared` is True when another caller's call was joined."""
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._calls[key] = Future()
+        if not leader:
+            return fut.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def do_async(self, key: Hashable, make: Callable[[], Awaitable[Any]]) -> tuple:
+        """Async `do`. The shared call is cancelled once every caller waiting on it has given up."""
+        calls = self._tasks.setdefault(asyncio.get_running_loop(), {})
+        entry = calls.get(key)
+        shared = entry is not None
+        if entry is None:
+            entry = calls[key] = [asyncio.ensure_future(make()), 0]
+            entry[0].add_done_callback(lambda t: calls.pop(key, None) if calls.get(key) is entry else None)
+        entry[1] += 1
+        try:
+            # One waiter timing out must not cancel the call for the others.
+            return await asyncio.shield(entry[0]), shared
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not entry[0].done():
+                entry[0].cancel()
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second, bursts up to `burst`. `reserve()` books the next
+    token and returns how long to wait for it, or None if that would exceed
+    `max_wait` (nothing is booked then). rate <= 0 means unlimited.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst if burst else rate)
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float | None = None) -> Optional[float]:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1  # may go negative: later callers queue behind this one
+            return wait
+
+
+class CircuitBreaker:
+    """
+    Closed until `failures` consecutive calls fail, then open: `allow()` is
+    False for `reset_timeout` seconds. After that one probe call per
+    `reset_timeout` is let through (half-open); a success closes the circuit,
+    a failure keeps it open. failures <= 0 disables the breaker.
+    """
+
+    def __init__(self, failures: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self._count = 0
+        self._retry_at = 0.0  # > 0 while open
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if not self._retry_at:
+            return "closed"
+        return "open" if time.monotonic() < self._retry_at else "half-open"
+
+    def allow(self) -> bool:
+        if self.failures <= 0 or not self._retry_at:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if not self._retry_at or now >= self._retry_at:
+                if self._retry_at:
+                    self._retry_at = now + self.reset_timeout  # this caller is the probe
+                return True
+            return False
+
+    def success(self) -> None:
+        if self._count or self._retry_at:
+            with self._lock:
+                self._count = 0
+                self._retry_at = 0.0
+
+    def failure(self) -> None:
+        if self.failures <= 0:
+            return
+        with self._lock:
+            self._count += 1
+            if self._count >= self.failures:
+                self._retry_at = time.monotonic() + self.reset_timeout
@@ -0,0 +1,50 @@
+from __future__ import annotations
+from array import array
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Sequence
+import heapq
+
+
+class PreferenceIndex:
+    """
+    Inverted index from lowercased genre/tag to catalog positions (packed
+    into 4-byte `array("I")` posting lists).
+
+    Scores match the plain scorer exactly (+1 for the genre, +1 per matching
+    tag occurrence) and ties keep catalog order, so `top_k` returns the same
+    list as `sorted(movies, key=score, reverse=True)[:k]` while only touching
+    movies that share at least one preference with the user.
+    """
+
+    def __init__(self, movies: Sequence[Dict[str, Any]]) -> None:
+        self.movies = movies
+        self.size = len(movies)
+        postings: Dict[str, array] = defaultdict(lambda: array("I"))
+        for pos, m in enumerate(movies):
+            postings[(m.get("genre") or "").lower()].append(pos)
+            for t in m.get("tags") or []:
+                postings[t.lower()].append(pos)
+        self.postings = dict(postings)
+
+    def covers(self, movies: Sequence[Dict[str, Any]]) -> bool:
+        return movies is self.movies and len(movies) == self.size
+
+    def scores(self, preferences: Iterable[str]) -> Dict[int, int]:
+        hits: Dict[int, int] = {}
+        for p in set(p.lower() for p in preferences):
+            for pos in self.postings.get(p, ()):
+                hits[pos] = hits.get(pos, 0) + 1
+        return hits
+
+    def top_k(self, preferences: Iterable[str], k: int) -> List[Dict[str, Any]]:
+        hits = self.scores(preferences)
+        want = k if k > 0 else self.size
+        best = heapq.nsmallest(want, hits.items(), key=lambda it: (-it[1], it[0]))
+        ranked = [self.movies[pos] for pos, _ in best]
+        # Unmatched movies score 0 and follow in catalog order.
+        pos = 0
+        while len(ranked) < want and pos < self.size:
+            if pos not in hits:
+                ranked.append(self.movies[pos])
+            pos += 1
+        return ranked if k > 0 else ranked[:k]
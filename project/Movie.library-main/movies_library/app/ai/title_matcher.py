@@ -0,0 +1,114 @@
+from __future__ import annotations
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import re, unicodedata
+
+_WORD = re.compile(r"\w+")
+_TRAILING_ARTICLE = re.compile(r",\s*(the|a|an)\s*$", re.IGNORECASE)  # "Matrix, The"
+ARTICLES = frozenset(("the", "a", "an"))
+
+
+def words(text: Any) -> List[str]:
+    """Casefolded word tokens; punctuation and spacing differences disappear."""
+    return _WORD.findall(unicodedata.normalize("NFKC", str(text or "")).casefold())
+
+
+def title_key(title: Any) -> Tuple[str, ...]:
+    """Normalized title: words without a leading (or ", The"-style trailing) article."""
+    toks = words(_TRAILING_ARTICLE.sub("", str(title or "")))
+    if len(toks) > 1 and toks[0] in ARTICLES:
+        toks = toks[1:]
+    return tuple(toks)
+
+
+class TitleMatcher:
+    """
+    Word-level Aho-Corasick automaton over the normalized titles of a catalog.
+
+    `find` scans a whole LLM response once (O(response words + matches),
+    independent of catalog size) and returns the catalog movies it names in
+    order of first mention. Overlapping mentions resolve leftmost-longest, so
+    "Star Wars: The Empire Strikes Back" does not also count as "Star Wars".
+    Matches never span lines, and a one-word title ("Heat", "Up") only counts
+    when it is the whole line, give or take list numbering and a year: in
+    prose such words are rarely titles.
+    """
+
+    def __init__(self, movies: Sequence[Dict[str, Any]]) -> None:
+        self.movies = movies
+        self.size = len(movies)
+        goto: List[Dict[str, int]] = [{}]
+        depth: List[int] = [0]
+        out: List[Tuple[int, ...]] = [()]  # catalog positions whose title ends at the node
+        for pos, m in enumerate(movies):
+            key = title_key(m.get("title"))
+            if not key:
+                continue
+            node = 0
+            for tok in key:
+                nxt = goto[node].get(tok)
+                if nxt is None:
+                    nxt = goto[node][tok] = len(goto)
+                    goto.append({})
+                    depth.append(depth[node] + 1)
+                    out.append(())
+                node = nxt
+            out[node] += (pos,)
+
+        # fail: longest proper suffix that is also a trie path; link: nearest
+        # node on the fail chain that ends a title (0 = none).
+        fail = [0] * len(goto)
+        link = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            u = queue.popleft()
+            for tok, v in goto[u].items():
+                f = fail[u]
+                while f and tok not in goto[f]:
+                    f = fail[f]
+                fail[v] = goto[f].get(tok, 0)
+                link[v] = fail[v] if out[fail[v]] else link[fail[v]]
+                queue.append(v)
+        self._goto, self._fail, self._link, self._depth, self._out = goto, fail, link, depth, out
+
+    def covers(self, movies: Sequence[Dict[str, Any]]) -> bool:
+        return movies is self.movies and len(movies) == self.size
+
+    def find(self, text: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        goto, fail, link, depth, out = self._goto, self._fail, self._link, self._depth, self._out
+        hits: List[Tuple[int, int, Tuple[int, ...]]] = []  # (start word, -length, positions)
+        base = 0
+        for line in str(text or "").splitlines():
+            toks = words(line)
+            first, last = 0, len(toks) - 1  # the line's words without numbering or year
+            while first < last and toks[first].isdigit():
+                first += 1
+            while last > first and toks[last].isdigit():
+                last -= 1
+            node = 0
+            for i, tok in enumerate(toks):
+                while node and tok not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(tok, 0)
+                hit = node if out[node] else link[node]
+                while hit:
+                    if depth[hit] > 1 or first == i == last:
+                        hits.append((base + i - depth[hit] + 1, -depth[hit], out[hit]))
+                    hit = link[hit]
+            base += len(toks) + 1
+
+        hits.sort()
+        found: List[Dict[str, Any]] = []
+        seen: set = set()
+        covered = -1  # last word consumed by an accepted match
+        for start, neg_len, positions in hits:
+            if start <= covered:
+                continue
+            covered = start - neg_len - 1
+            for pos in positions:
+                if pos not in seen:
+                    seen.add(pos)
+                    found.append(self.movies[pos])
+            if limit is not None and len(found) >= limit:
+                return found[:limit]
+        return found
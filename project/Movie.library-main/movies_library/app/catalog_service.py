@@ -1,8 +1,14 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+import threading
 from app.adapters.json_adapter import JSONAdapter
 from app.observer import EventBus
 from app.factories import create_movie
+from app.ingest import Source, iter_records
+from app.search_index import SearchIndex
+from infra.metrics import Metrics
+
+T = TypeVar("T")
 
 
 class CatalogService:
@@ -11,37 +17,130 @@ class CatalogService:
     """
 
     REQUIRED_FIELDS = ("id", "title", "genre")
+    BULK_BATCH_SIZE = 5000
 
     def __init__(self) -> None:
         self.storage = JSONAdapter()
+        # Built on the first search, then kept current by this service's own
+        # writes; any other change to the catalog version triggers a rebuild.
+        self._search = SearchIndex()
+        self._search_version: Optional[int] = None
+        self._search_lock = threading.RLock()
 
+    @Metrics.timed("service", op="catalog.list_movies")
     def list_movies(self) -> List[Dict[str, Any]]:
         return self.storage.get_all_movies()
 
+    @Metrics.timed("service", op="catalog.list_movies_page")
+    def list_movies_page(self, cursor: Optional[str] = None, limit: int = 20,
+                         genre: Optional[str] = None) -> Dict[str, Any]:
+        """{"items": [...], "next_cursor": str | None}; see JSONAdapter.list_movies_page."""
+        return self.storage.list_movies_page(cursor, limit, genre)
+
+    def iter_movies(self, genre: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        return self.storage.iter_movies(genre)
+
+    @Metrics.timed("service", op="catalog.get_movie")
     def get_movie(self, movie_id: str) -> Optional[Dict[str, Any]]:
         return self.storage.get_movie(movie_id)
 
-    def add_movie(self, movie: Dict[str, Any]) -> Dict[str, Any]:
+    @Metrics.timed("service", op="catalog.search")
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Movies whose title/genre/tags match every word of `query` (the words may be prefixes)."""
+        with self._search_lock:
+            version = self.storage.catalog_version()
+            if self._search_version != version:
+                self._search.rebuild(self.storage.iter_movies())
+                self._search_version = version
+            ids = self._search.search(query, int(limit))
+        return [m for m in map(self.storage.get_movie, ids) if m is not None]
+
+    def _indexed(self, write: Callable[[], T], index: Callable[[T], None]) -> T:
+        """Run a catalog write and apply its (truthy) result to the search index if the index was current."""
+        with self._search_lock:
+            current = self._search_version is not None and self._search_version == self.storage.catalog_version()
+            result = write()
+            if current:
+                if result:
+                    index(result)
+                self._search_version = self.storage.catalog_version()
+        return result
+
+    def _normalize(self, movie: Dict[str, Any]) -> Dict[str, Any]:
         # Normalize via factory (keeps id/title/genre/tags consistent)
+        extra = dict(movie)
         normalized = create_movie(
-            title=movie.get("title", ""),
-            genre=movie.get("genre", ""),
-            tags=movie.get("tags", []),
-            **movie
+            title=extra.pop("title", None) or "",
+            genre=extra.pop("genre", None) or "",
+            tags=extra.pop("tags", None) or [],
+            **extra
         )
         # Ensure required fields exist (adapter will also guard)
         for f in self.REQUIRED_FIELDS:
             if not normalized.get(f):
                 raise ValueError(f"movie must include '{f}'")
+        return normalized
 
-        created = self.storage.add_movie(normalized)
+    @Metrics.timed("service", op="catalog.add_movie")
+    def add_movie(self, movie: Dict[str, Any]) -> Dict[str, Any]:
+        movie = self._normalize(movie)
+        created = self._indexed(lambda: self.storage.add_movie(movie), self._search.add)
         EventBus.publish("MOVIE_ADDED", {"movie": created})
         return created
 
+    @Metrics.timed("service", op="catalog.add_movies_bulk")
+    def add_movies_bulk(self, source: Source, batch_size: int | None = None) -> Dict[str, int]:
+        """
+        Stream movies from an iterable of dicts or a .jsonl/.csv file.
+        Invalid records and ids already in the catalog are skipped; each batch
+        is persisted in one write and announced with one MOVIES_ADDED event.
+        """
+        size = max(1, int(batch_size or self.BULK_BATCH_SIZE))
+        stats = {"added": 0, "duplicates": 0, "invalid": 0}
+        batch: List[Dict[str, Any]] = []
+        pending: set = set()
+
+        def flush() -> None:
+            created = self._indexed(lambda: self.storage.add_movies(batch),
+                                    self._search.add_many)
+            stats["added"] += len(created)
+            stats["duplicates"] += len(batch) - len(created)
+            if created:
+                EventBus.publish("MOVIES_ADDED", {"movies": created})
+            batch.clear()
+            pending.clear()
+
+        for raw in iter_records(source):
+            try:
+                movie = self._normalize(raw)
+            except (TypeError, ValueError, AttributeError):
+                stats["invalid"] += 1
+                continue
+            if movie["id"] in pending or self.storage.has_movie(movie["id"]):
+                stats["duplicates"] += 1
+                continue
+            pending.add(movie["id"])
+            batch.append(movie)
+            if len(batch) >= size:
+                flush()
+        if batch:
+            flush()
+        return stats
+
+    @Metrics.timed("service", op="catalog.update_movie")
     def update_movie(self, movie_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         patch = dict(patch or {})
         patch.pop("id", None)
-        return self.storage.update_movie(movie_id, patch)
+        updated = self._indexed(lambda: self.storage.update_movie(movie_id, patch),
+                                self._search.add)
+        if updated is not None:
+            EventBus.publish("MOVIE_UPDATED", {"movie": updated})
+        return updated
 
+    @Metrics.timed("service", op="catalog.delete_movie")
     def delete_movie(self, movie_id: str) -> bool:
-        return self.storage.delete_movie(movie_id)
+        deleted = self._indexed(lambda: self.storage.delete_movie(movie_id),
+                                lambda _: self._search.remove(movie_id))
+        if deleted:
+            EventBus.publish("MOVIE_DELETED", {"movie": {"id": movie_id}})
+        return deleted
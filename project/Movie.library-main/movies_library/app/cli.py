@@ -17,6 +17,7 @@ def print_header(current_user: Optional[Dict[str, Any]]):
     print("2) Login")
     print("3) List Movies")
     print("4) Get AI-Based Recommendations")
+    print("5) Search Movies")
     print("q) Quit")
 
 
@@ -49,13 +50,41 @@ def login_cli(acc: AccountService) -> Optional[Dict[str, Any]]:
         return None
 
 
+PAGE_SIZE = 20
+
+
 def list_movies(gw: APIGateway):
-    movies = gw.list_movies()
-    if not movies:
-        print("No movies available yet.")
+    genre = input("Filter by genre (blank for all): ").strip() or None
+    cursor: Optional[str] = None
+    shown = 0
+    while True:
+        page = gw.list_movies_page(cursor, limit=PAGE_SIZE, genre=genre)
+        if not page["items"] and shown == 0:
+            print("No movies available yet." if genre is None else f"No {genre} movies found.")
+            return
+        if shown == 0:
+            print("\nMovies:")
+        for m in page["items"]:
+            print(f"- {m.get('id')}: {m.get('title')}  [{m.get('genre')}]  tags={m.get('tags', [])}")
+        shown += len(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            print(f"({shown} shown)")
+            return
+        if input(f"({shown} shown) Enter for more, q to stop: ").strip().lower() in ("q", "quit"):
+            return
+
+
+def search_cli(gw: APIGateway):
+    query = input("\nSearch (title, genre or tag words): ").strip()
+    if not query:
+        return
+    results = gw.search_movies(query, limit=PAGE_SIZE)
+    if not results:
+        print("No matching movies.")
         return
-    print(f"\nMovies ({len(movies)}):")
-    for m in movies:
+    print(f"\nMatches ({len(results)}):")
+    for m in results:
         print(f"- {m.get('id')}: {m.get('title')}  [{m.get('genre')}]  tags={m.get('tags', [])}")
 
 
@@ -76,11 +105,13 @@ def recommend_cli(gw: APIGateway, current_user: Dict[str, Any]):
     try:
         print("\nConnecting to AI...")
         print(f"Generating recommendations for {current_user['name']} ({current_user['id']})...")
-        recs = gw.recommend(current_user["id"], k=k)
+        recs, degraded = gw.recommend_with_status(current_user["id"], k=k)
         if not recs:
             print("No recommendations returned.")
             return
         print(f"\nTop {len(recs)} recommendations for {current_user['name']}:")
+        if degraded:
+            print(f"(AI backend {gw.backend_name} unavailable; showing the local scorer's picks)")
         for i, r in enumerate(recs, 1):
             print(f"{i}. {r.get('title')} [{r.get('genre')}] tags={r.get('tags', [])}")
     except Exception as e:
@@ -89,13 +120,12 @@ def recommend_cli(gw: APIGateway, current_user: Dict[str, Any]):
 
 def main():
     gw = APIGateway()
-    acc = AccountService()
+    acc = gw.accounts
     current_user: Optional[Dict[str, Any]] = None
 
     # Show active AI backend (mock | openai | gemini)
     try:
-        from app.adapters.api_adapter import APIAdapter
-        backend = APIAdapter().backend_name
+        backend = gw.backend_name
     except Exception:
         backend = "unknown"
     print(f"\n[AI Backend Active: {backend.upper()}]")
@@ -113,6 +143,8 @@ def main():
         elif choice == "4":
             if ensure_logged_in(current_user):
                 recommend_cli(gw, current_user)
+        elif choice == "5":
+            search_cli(gw)
         elif choice in ("q", "quit", "exit"):
             print("\nGoodbye!")
             break
@@ -1,18 +1,50 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+import os
 from infra.database_manager import DatabaseManager
 
+
+def open_backend(name: str | None = None):
+    """
+    Storage backend selected by `name` or env STORAGE_BACKEND in {"json", "sqlite"} (default: "json").
+    """
+    name = (name or os.getenv("STORAGE_BACKEND", "json")).strip().lower()
+    if name == "sqlite":
+        from infra.sqlite_store import SQLiteStore
+        return SQLiteStore()
+    return DatabaseManager()
+
+
 class JSONStore:
-    def __init__(self): self._mgr = DatabaseManager()
+    def __init__(self): self._mgr = open_backend()
     @property
     def movies(self) -> List[Dict[str, Any]]: return self._mgr.movies
     @movies.setter
     def movies(self, v: List[Dict[str, Any]]): self._mgr.movies = v
     @property
+    def movies_version(self) -> int: return self._mgr.movies_version
+    @property
+    def catalog_digest(self) -> str: return self._mgr.catalog_digest
+    @property
     def users(self) -> List[Dict[str, Any]]: return self._mgr.users
     @users.setter
     def users(self, v: List[Dict[str, Any]]): self._mgr.users = v
+    def get_movie(self, movie_id: str) -> Optional[Dict[str, Any]]: return self._mgr.get_movie(movie_id)
+    def page_movies(self, after: Optional[str], limit: int, genre: Optional[str] = None) -> List[Dict[str, Any]]: return self._mgr.page_movies(after, limit, genre)
+    def put_movie(self, movie: Dict[str, Any]): self._mgr.put_movie(movie)
+    def put_movies(self, movies: List[Dict[str, Any]]): self._mgr.put_movies(movies)
+    def insert_movie(self, movie: Dict[str, Any]): self._mgr.insert_movie(movie)
+    def insert_movies(self, movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]: return self._mgr.insert_movies(movies)
+    def patch_movie(self, movie_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]: return self._mgr.patch_movie(movie_id, patch)
+    def remove_movie(self, movie_id: str) -> bool: return self._mgr.remove_movie(movie_id)
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]: return self._mgr.get_user(user_id)
+    def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]: return self._mgr.get_user_by_username(username)
+    def put_user(self, user: Dict[str, Any]): self._mgr.put_user(user)
+    def insert_user(self, user: Dict[str, Any]): self._mgr.insert_user(user)
+    def patch_user(self, user_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]: return self._mgr.patch_user(user_id, patch)
+    def remove_user(self, user_id: str) -> bool: return self._mgr.remove_user(user_id)
     def save_movies(self): self._mgr.save_movies()
     def save_users(self): self._mgr.save_users()
     def save_all(self): self._mgr.save_all()
+    def flush(self): self._mgr.flush()
     def reload(self): self._mgr.reload()
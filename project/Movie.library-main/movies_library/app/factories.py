@@ -3,7 +3,7 @@ from uuid import uuid4
 
 def create_movie(title: str, genre: str, tags: List[str] | None = None, **extra) -> Dict[str, Any]:
     return {
-        "id": extra.get("id", f"m-{uuid4().hex[:8]}"),
+        "id": extra["id"] if "id" in extra else f"m-{uuid4().hex[:8]}",
         "title": title.strip(),
         "genre": genre.strip(),
         "tags": list(tags or []),
@@ -12,7 +12,7 @@ def create_movie(title: str, genre: str, tags: List[str] | None = None, **extra)
 
 def create_user(name: str, username: str, password: str, preferences: List[str] | None = None, **extra) -> Dict[str, Any]:
     return {
-        "id": extra.get("id", f"u-{uuid4().hex[:8]}"),
+        "id": extra["id"] if "id" in extra else f"u-{uuid4().hex[:8]}",
         "name": name.strip(),
         "username": username.strip(),
         "password": password,
@@ -1,35 +1,91 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Tuple
+from infra.metrics import Metrics
 
-from app.account_service import AccountService
-from app.catalog_service import CatalogService
-from app.recommendation_service import RecommendationService
+if TYPE_CHECKING:
+    from app.account_service import AccountService
+    from app.catalog_service import CatalogService
+    from app.recommendation_service import RecommendationService
 
 
 class APIGateway:
     """
     Facade: single entry point for the CLI.
+    Services are created on first use, so a session that only logs in never
+    builds the recommendation stack.
     """
 
-    def __init__(self) -> None:
-        self.accounts = AccountService()
-        self.catalog = CatalogService()
-        self.reco = RecommendationService()
+    @cached_property
+    def accounts(self) -> AccountService:
+        from app.account_service import AccountService
+        return AccountService()
+
+    @cached_property
+    def catalog(self) -> CatalogService:
+        from app.catalog_service import CatalogService
+        return CatalogService()
+
+    @cached_property
+    def reco(self) -> RecommendationService:
+        from app.recommendation_service import RecommendationService
+        return RecommendationService()
+
+    @property
+    def backend_name(self) -> str:
+        if "reco" in self.__dict__:
+            return self.reco.ai.backend_name
+        from app.adapters.api_adapter import APIAdapter
+        return APIAdapter().backend_name
 
     # Account
+    @Metrics.timed("gateway", op="register_user")
     def register_user(self, *args, **kwargs) -> Dict[str, Any]:
         return self.accounts.register_user(*args, **kwargs)
 
+    @Metrics.timed("gateway", op="authenticate")
     def authenticate(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         return self.accounts.authenticate(username, password)
 
     # Catalog
+    @Metrics.timed("gateway", op="list_movies")
     def list_movies(self) -> List[Dict[str, Any]]:
         return self.catalog.list_movies()
 
+    @Metrics.timed("gateway", op="list_movies_page")
+    def list_movies_page(self, cursor: Optional[str] = None, limit: int = 20,
+                         genre: Optional[str] = None) -> Dict[str, Any]:
+        return self.catalog.list_movies_page(cursor, limit, genre)
+
+    def iter_movies(self, genre: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        return self.catalog.iter_movies(genre)
+
+    @Metrics.timed("gateway", op="search_movies")
+    def search_movies(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        return self.catalog.search(query, limit)
+
+    @Metrics.timed("gateway", op="add_movie")
     def add_movie(self, movie: Dict[str, Any]) -> Dict[str, Any]:
         return self.catalog.add_movie(movie)
 
+    @Metrics.timed("gateway", op="add_movies_bulk")
+    def add_movies_bulk(self, source, batch_size: int | None = None) -> Dict[str, int]:
+        return self.catalog.add_movies_bulk(source, batch_size=batch_size)
+
     # Recommendation
+    @Metrics.timed("gateway", op="recommend")
     def recommend(self, user_id: str, k: int = 5) -> List[Dict[str, Any]]:
         return self.reco.recommend_for_user(user_id, k=k)
+
+    @Metrics.timed("gateway", op="recommend_with_status")
+    def recommend_with_status(self, user_id: str, k: int = 5) -> Tuple[List[Dict[str, Any]], bool]:
+        """(recs, degraded): `degraded` is True when the AI backend was unavailable and local scoring stood in."""
+        return self.reco.recommend_for_user_with_status(user_id, k=k)
+
+    @Metrics.timed("gateway", op="recommend_async")
+    async def recommend_async(self, user_id: str, k: int = 5, timeout: float | None = None) -> List[Dict[str, Any]]:
+        return await self.reco.recommend_for_user_async(user_id, k=k, timeout=timeout)
+
+    @Metrics.timed("gateway", op="recommend_for_users")
+    def recommend_for_users(self, user_ids: List[str], k: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        return self.reco.recommend_for_users(user_ids, k=k)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+import csv, json
+
+Source = Union[str, Path, Iterable[Dict[str, Any]]]
+
+
+def iter_jsonl(path: str | Path) -> Iterator[Optional[Dict[str, Any]]]:
+    """One JSON object per line; blank lines are skipped, malformed ones yield None."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    yield None  # one bad line must not abort the rest of the feed
+
+
+def iter_csv(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """CSV with a header row (id,title,genre,tags,...). Tags are '|' or ',' separated."""
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            rec: Dict[str, Any] = {k: v for k, v in row.items() if k and v not in (None, "")}
+            tags = rec.get("tags")
+            if isinstance(tags, str):
+                sep = "|" if "|" in tags else ","
+                rec["tags"] = [t.strip() for t in tags.split(sep) if t.strip()]
+            yield rec
+
+
+def iter_records(source: Source) -> Iterator[Dict[str, Any]]:
+    """Stream movie dicts from an iterable, a .jsonl/.ndjson file or a .csv file."""
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        suffix = path.suffix.lower()
+        if suffix in (".jsonl", ".ndjson"):
+            return iter_jsonl(path)
+        if suffix == ".csv":
+            return iter_csv(path)
+        raise ValueError(f"unsupported ingest file type: {path.name} (expected .jsonl or .csv)")
+    return iter(source)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+import hashlib, json, os, sys
+
+from infra.cache import LRUCache
+from infra.persistent_cache import PersistentCache
+
+
+def _sizeof_recs(recs: List[Dict[str, Any]]) -> int:
+    return sys.getsizeof(recs) + sum(sys.getsizeof(m) for m in recs)
+
+
+class RecommendationCache(LRUCache):
+    """
+    LRU + TTL cache of recommendation lists keyed by (user_id, k).
+
+    Keeps a user -> {k} index so every entry of a user can be dropped at once,
+    and answers a request for k from any cached k' >= k by slicing.
+    Bounds come from RECO_CACHE_MAX_ENTRIES (default 10000),
+    RECO_CACHE_MAX_BYTES (default 0 = unbounded) and RECO_CACHE_TTL seconds
+    (default 3600, 0 = never expire).
+    """
+
+    def __init__(self, max_entries: int | None = None, max_bytes: int | None = None, ttl: float | None = None) -> None:
+        super().__init__(
+            max_entries=int(os.getenv("RECO_CACHE_MAX_ENTRIES", "10000")) if max_entries is None else max_entries,
+            max_bytes=int(os.getenv("RECO_CACHE_MAX_BYTES", "0")) if max_bytes is None else max_bytes,
+            ttl=float(os.getenv("RECO_CACHE_TTL", "3600")) if ttl is None else ttl,
+            sizeof=_sizeof_recs,
+            on_evict=self._forget,
+        )
+        self._ks: Dict[str, Set[int]] = {}
+        self.partial_hits = 0  # hits served by slicing a larger-k entry
+
+    def lookup(self, user_id: str, k: int) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            for cached_k in sorted(c for c in self._ks.get(user_id, ()) if c >= k):
+                recs = self._lookup((user_id, cached_k), None)
+                if recs is not None:
+                    self.hits += 1
+                    if cached_k == k:
+                        return recs
+                    self.partial_hits += 1
+                    return recs[:k]
+            self.misses += 1
+            return None
+
+    def store(self, user_id: str, k: int, recs: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.set((user_id, k), recs)
+            if (user_id, k) in self._data:
+                self._ks.setdefault(user_id, set()).add(k)
+
+    def invalidate_user(self, user_id: str) -> int:
+        with self._lock:
+            ks = list(self._ks.get(user_id, ()))
+            for k in ks:
+                self.pop((user_id, k))
+            return len(ks)
+
+    def _forget(self, key: Hashable) -> None:
+        user_id, k = key
+        ks = self._ks.get(user_id)
+        if ks is not None:
+            ks.discard(k)
+            if not ks:
+                del self._ks[user_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._ks.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**super().stats(), "partial_hits": self.partial_hits}
+
+
+class PersistentRecommendationCache:
+    """
+    On-disk second level behind RecommendationCache, so warm restarts skip
+    the AI backend. Entries are keyed by everything the result depends on
+    (backend, model, preferences, k, catalog digest), which makes stale
+    entries unreachable instead of needing invalidation. Only movie ids are
+    stored. Configured by RECO_DISK_CACHE (path, default data/reco_cache.db;
+    "off" disables) and RECO_DISK_CACHE_MAX_BYTES (default 64 MiB).
+    """
+
+    def __init__(self, path: str | None = None, max_bytes: int | None = None) -> None:
+        self.path = path or os.getenv("RECO_DISK_CACHE", "data/reco_cache.db")
+        limit = int(os.getenv("RECO_DISK_CACHE_MAX_BYTES", str(64 * 1024 * 1024))) if max_bytes is None else max_bytes
+        self._store = PersistentCache(self.path, max_bytes=limit)
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.getenv("RECO_DISK_CACHE", "data/reco_cache.db").strip().lower() not in ("", "0", "off", "none")
+
+    @staticmethod
+    def key(backend: str, model: str, preferences: Iterable[str], k: int, catalog_digest: str) -> str:
+        prefs = hashlib.sha256(json.dumps(list(preferences), ensure_ascii=False).encode("utf-8")).hexdigest()[:32]
+        return f"{backend}|{model}|{prefs}|{int(k)}|{catalog_digest}"
+
+    def lookup(self, key: str) -> Optional[List[str]]:
+        return self._store.get(key)
+
+    def store(self, key: str, recs: List[Dict[str, Any]]) -> None:
+        self._store.set(key, [m.get("id") for m in recs])
+
+    def stats(self) -> Dict[str, int]:
+        return self._store.stats()
@@ -1,8 +1,11 @@
 from __future__ import annotations
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from app.adapters.json_adapter import JSONAdapter
 from app.adapters.api_adapter import APIAdapter
+from app.ai.batch_scoring import batch_top_k
 from app.observer import EventBus
+from app.reco_cache import PersistentRecommendationCache, RecommendationCache
+from infra.metrics import Metrics
 
 
 class RecommendationService:
@@ -14,25 +17,123 @@ class RecommendationService:
     def __init__(self) -> None:
         self.storage = JSONAdapter()
         self.ai = APIAdapter()  # reads env AI_BACKEND
-        self._cache: Dict[tuple, List[Dict[str, Any]]] = {}
+        self._cache = RecommendationCache()
+        # Local scoring is cheaper than a disk lookup; only remote backends persist results.
+        self._disk: Optional[PersistentRecommendationCache] = None
+        if self.ai.backend_name != "mock" and PersistentRecommendationCache.enabled():
+            self._disk = PersistentRecommendationCache()
+        # (catalog_version, movies): the same list object is handed to the AI
+        # backend until the catalog changes, so it can reuse derived indexes.
+        self._catalog: tuple | None = None
 
-        # Simple observer usage: invalidate cache when data changes
-        EventBus.subscribe("MOVIE_ADDED", lambda _: self._cache.clear())
-        EventBus.subscribe("USER_REGISTERED", lambda p: self._cache.pop((p["user"]["id"], 5), None))
+        # Simple observer usage: invalidate cache when data changes. With an
+        # async bus, bursts collapse to one clear (or one drop per user).
+        for event in ("MOVIE_ADDED", "MOVIES_ADDED", "MOVIE_UPDATED", "MOVIE_DELETED"):
+            EventBus.subscribe(event, lambda _: self._cache.clear(), coalesce_key=lambda _: None)
+        for event in ("USER_REGISTERED", "USER_UPDATED", "USER_DELETED"):
+            EventBus.subscribe(event, lambda p: self._cache.invalidate_user(p["user"]["id"]),
+                               coalesce_key=lambda p: p["user"]["id"])
 
     def recommend_for_user(self, user_id: str, k: int = 5) -> List[Dict[str, Any]]:
-        key = (user_id, int(k))
-        if key in self._cache:
-            return self._cache[key]
+        return self.recommend_for_user_with_status(user_id, k)[0]
 
+    @Metrics.timed("service", op="reco.recommend_for_user")
+    def recommend_for_user_with_status(self, user_id: str, k: int = 5) -> Tuple[List[Dict[str, Any]], bool]:
+        """(recs, degraded): `degraded` is True when the local scorer stood in for the AI backend."""
+        k = int(k)
+        cached = self._cache.lookup(user_id, k)
+        Metrics.inc("reco.cache", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached, False
+
+        user, movies = self._inputs(user_id)
+        disk_key, recs = self._disk_lookup(user, k)
+        if recs is None:
+            recs, degraded = self.ai.recommend_with_status(user_profile=user, movies=movies, k=k)
+            recs = (recs or [])[:k]
+            if degraded:  # local stand-in while the backend is unavailable: not worth remembering
+                return recs, True
+            self._disk_store(disk_key, recs)
+        self._cache.store(user_id, k, recs)
+        return recs, False
+
+    @Metrics.timed("service", op="reco.recommend_for_user_async")
+    async def recommend_for_user_async(self, user_id: str, k: int = 5, timeout: float | None = None) -> List[Dict[str, Any]]:
+        """Non-blocking variant; `timeout` overrides the backend's AI_TIMEOUT deadline."""
+        k = int(k)
+        cached = self._cache.lookup(user_id, k)
+        Metrics.inc("reco.cache", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+
+        user, movies = self._inputs(user_id)
+        disk_key, recs = self._disk_lookup(user, k)
+        if recs is None:
+            recs, degraded = await self.ai.recommend_with_status_async(user_profile=user, movies=movies, k=k, timeout=timeout)
+            recs = (recs or [])[:k]
+            if degraded:  # local stand-in while the backend is unavailable: not worth remembering
+                return recs
+            self._disk_store(disk_key, recs)
+        self._cache.store(user_id, k, recs)
+        return recs
+
+    def _inputs(self, user_id: str) -> tuple:
         user = self.storage.get_user(user_id)
         if not user:
             raise ValueError(f"User not found: {user_id}")
-        movies = self.storage.get_all_movies()
+        movies = self._movies()
         if not movies:
             raise RuntimeError("No movies available in the catalog.")
+        return user, movies
 
-        recs = self.ai.recommend(user_profile=user, movies=movies, k=k) or []
-        recs = recs[:k]
-        self._cache[key] = recs
-        return recs
+    def _disk_lookup(self, user: Dict[str, Any], k: int) -> tuple:
+        """(key, recs or None) from the persistent cache; key is None when it is disabled."""
+        if self._disk is None:
+            return None, None
+        key = self._disk.key(self.ai.backend_name, self.ai.model_name, user.get("preferences", []), k,
+                             self.storage.catalog_digest())
+        ids = self._disk.lookup(key)
+        recs = None if ids is None else [self.storage.get_movie(mid) for mid in ids]
+        if recs is None or any(m is None for m in recs):
+            Metrics.inc("reco.disk_cache", result="miss")
+            return key, None
+        Metrics.inc("reco.disk_cache", result="hit")
+        return key, recs
+
+    def _disk_store(self, key: Optional[str], recs: List[Dict[str, Any]]) -> None:
+        if key is not None:
+            self._disk.store(key, recs)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = self._cache.stats()
+        if self._disk is not None:
+            stats["disk"] = self._disk.stats()
+        return stats
+
+    @Metrics.timed("service", op="reco.recommend_for_users")
+    def recommend_for_users(self, user_ids: List[str], k: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Recommendations for many users at once (e.g. a nightly job). The mock
+        backend scores all users with one vectorized pass per chunk; other
+        backends fall back to per-user calls.
+        """
+        users = []
+        for uid in user_ids:
+            user = self.storage.get_user(uid)
+            if not user:
+                raise ValueError(f"User not found: {uid}")
+            users.append(user)
+        if self.ai.backend_name != "mock":
+            return {u["id"]: self.recommend_for_user(u["id"], k=k) for u in users}
+
+        movies = self._movies()
+        if not movies:
+            raise RuntimeError("No movies available in the catalog.")
+        prefs = [u.get("preferences", []) for u in users]
+        return {u["id"]: recs for u, recs in zip(users, batch_top_k(prefs, movies, int(k)))}
+
+    def _movies(self) -> List[Dict[str, Any]]:
+        version = self.storage.catalog_version()  # read before the list, never after
+        if self._catalog is None or self._catalog[0] != version:
+            self._catalog = (version, self.storage.get_all_movies())
+        return self._catalog[1]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+from bisect import bisect_left, insort
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import heapq, re, threading
+
+from infra.gc_pause import gc_paused
+
+_TOKEN = re.compile(r"\w+")
+_RANGE_END = "\U0010ffff"
+_SEED_SCAN = 256  # vocabulary entries summed when estimating a prefix's posting size
+
+
+def tokenize(text: Any) -> List[str]:
+    return _TOKEN.findall(str(text or "").casefold())
+
+
+class SearchIndex:
+    """
+    Inverted token index over title, genre and tags.
+
+    Every query token must match a movie token exactly or as a prefix, so
+    "star wa" finds "Star Wars". Prefixes resolve against a sorted vocabulary
+    with bisect; candidates come from the most selective query token and the
+    others are checked per candidate, so a lookup touches only one posting
+    range. Ranking: exact before prefix, title before genre/tags, then shorter
+    titles, then alphabetical.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[str]] = {}
+        self._vocab: List[str] = []  # sorted keys of _postings
+        # id -> (title tokens, all tokens, sort key)
+        self._docs: Dict[str, Tuple[FrozenSet[str], FrozenSet[str], str]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def rebuild(self, movies: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._postings, self._docs = {}, {}
+            # Millions of small sets would otherwise trigger repeated full GC passes.
+            with gc_paused():
+                for m in movies:
+                    self._index(m, sort=False)
+            self._vocab = sorted(self._postings)
+
+    def add(self, movie: Dict[str, Any]) -> None:
+        """Index a movie, replacing whatever was indexed under its id."""
+        with self._lock:
+            self.remove(movie.get("id"))
+            self._index(movie, sort=True)
+
+    def add_many(self, movies: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            for m in movies:
+                self.add(m)
+
+    def remove(self, movie_id: Optional[str]) -> None:
+        with self._lock:
+            doc = self._docs.pop(movie_id, None)
+            if doc is None:
+                return
+            for tok in doc[1]:
+                ids = self._postings[tok]
+                ids.discard(movie_id)
+                if not ids:
+                    del self._postings[tok]
+                    del self._vocab[bisect_left(self._vocab, tok)]
+
+    def _index(self, movie: Dict[str, Any], sort: bool) -> None:
+        mid = movie.get("id")
+        if not mid:
+            return
+        title = tokenize(movie.get("title"))
+        fields = frozenset(title + tokenize(" ".join([str(movie.get("genre") or ""), *map(str, movie.get("tags") or [])])))
+        for tok in fields:
+            ids = self._postings.get(tok)
+            if ids is None:
+                ids = self._postings[tok] = set()
+                if sort:
+                    insort(self._vocab, tok)
+            ids.add(mid)
+        self._docs[mid] = (frozenset(title), fields, str(movie.get("title") or "").casefold())
+
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """Ids of the best `limit` matches for `query`."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        with self._lock:
+            ranges = []
+            for t in terms:
+                lo = bisect_left(self._vocab, t)
+                hi = bisect_left(self._vocab, t + _RANGE_END, lo)
+                if lo == hi:
+                    return []
+                ranges.append((lo, hi))
+            lo, hi = min(ranges, key=self._cost)
+            if hi - lo == 1:
+                candidates: Iterable[str] = self._postings[self._vocab[lo]]
+            else:
+                candidates = set().union(*(self._postings[t] for t in self._vocab[lo:hi]))
+            ranked = []
+            for mid in candidates:
+                title, fields, key = self._docs[mid]
+                score = 0
+                for t in terms:
+                    s = self._match(t, title, fields)
+                    if not s:
+                        break
+                    score += s
+                else:
+                    ranked.append((-score, len(title), key, mid))
+            return [r[-1] for r in heapq.nsmallest(limit, ranked)]
+
+    def _cost(self, span: Tuple[int, int]) -> int:
+        lo, hi = span
+        cost = sum(len(self._postings[t]) for t in self._vocab[lo:min(hi, lo + _SEED_SCAN)])
+        return cost if hi - lo <= _SEED_SCAN else cost * (hi - lo) // _SEED_SCAN
+
+    @staticmethod
+    def _match(term: str, title: FrozenSet[str], fields: FrozenSet[str]) -> int:
+        if term in title:
+            return 4
+        if term in fields:
+            return 3
+        if any(t.startswith(term) for t in title):
+            return 2
+        return 1 if any(t.startswith(term) for t in fields) else 0
@@ -0,0 +1,243 @@
+"""
+JSON-over-HTTP front end for APIGateway (stdlib only).
+
+    python -m app.server [--host 127.0.0.1] [--port 8000] [--workers 16]
+
+Defaults come from HTTP_HOST, HTTP_PORT and HTTP_WORKERS. Connections are
+HTTP/1.1 keep-alive and are served by a fixed pool of worker threads; a
+connection idle for HTTP_KEEPALIVE seconds (default 15) is closed so its
+worker can take the next one. At most HTTP_MAX_PENDING connections (default
+256) wait for a worker; beyond that new ones get 503 straight away.
+
+Endpoints:
+    GET  /health
+    GET  /movies?cursor=&limit=&genre=
+    GET  /movies/search?q=&limit=
+    POST /movies                          movie JSON
+    POST /users                           {id, name, username, password, preferences}
+    POST /login                           {username, password}
+    GET  /users/<id>/recommendations?k=
+    GET  /metrics                         text exposition (METRICS_ENABLED=1)
+    GET  /metrics.json
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+import argparse, json, logging, os, threading
+
+from app.gateway import APIGateway
+from infra.compact_catalog import json_default
+from infra.metrics import Metrics
+
+MAX_BODY = 1 << 20
+_log = logging.getLogger(__name__)
+_BUSY_BODY = b'{"error": "server busy"}'
+_BUSY = (b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json; charset=utf-8\r\n"
+         b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(_BUSY_BODY), _BUSY_BODY))
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _public(user: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in user.items() if k != "password"}
+
+
+class GatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive unless the client says otherwise
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    server: "GatewayServer"
+
+    def setup(self) -> None:
+        self.timeout = self.server.keepalive  # idle keep-alive connections give their worker back
+        super().setup()
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        self._body_read = False
+        self._length: Optional[int] = None  # stays None if the header is unusable
+        try:
+            self._length = self._content_length()
+            status, payload = self._route(method, parts, query)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except ValueError as e:
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception:
+            _log.exception("%s %s failed", method, self.path)  # details stay in the server log
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal server error"}
+        if not self._body_read:
+            # An unread body would be parsed as the next request on this connection.
+            length = self._length
+            if length is None or length > MAX_BODY:
+                self.close_connection = True  # the body cannot be skipped safely
+            elif length:
+                self.rfile.read(length)
+        self._send(status, payload)
+
+    def _route(self, method: str, parts: list, query: Dict[str, str]) -> Tuple[HTTPStatus, Any]:
+        gw = self.server.gateway
+        if parts == ["health"] and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+        if parts == ["metrics"] and method == "GET":
+            return HTTPStatus.OK, Metrics.export_text()
+        if parts == ["metrics.json"] and method == "GET":
+            return HTTPStatus.OK, Metrics.export_json()
+        if parts == ["movies"]:
+            if method == "GET":
+                return HTTPStatus.OK, gw.list_movies_page(query.get("cursor"), int(query.get("limit", 20)), query.get("genre"))
+            if method == "POST":
+                return HTTPStatus.CREATED, gw.add_movie(self._body())
+        if parts == ["movies", "search"] and method == "GET":
+            return HTTPStatus.OK, {"items": gw.search_movies(query.get("q", ""), int(query.get("limit", 20)))}
+        if parts == ["users"] and method == "POST":
+            body = self._body()
+            created = gw.register_user(body.get("id"), body.get("name"), body.get("username"),
+                                       body.get("password"), body.get("preferences"))
+            return HTTPStatus.CREATED, _public(created)
+        if parts == ["login"] and method == "POST":
+            body = self._body()
+            user = gw.authenticate(body.get("username") or "", body.get("password") or "")
+            if user is None:
+                raise HTTPError(HTTPStatus.UNAUTHORIZED, "invalid username or password")
+            return HTTPStatus.OK, _public(user)
+        if len(parts) == 3 and parts[0] == "users" and parts[2] == "recommendations" and method == "GET":
+            if gw.accounts.get_user(parts[1]) is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"user not found: {parts[1]}")
+            try:
+                return HTTPStatus.OK, {"items": gw.recommend(parts[1], k=int(query.get("k", 5)))}
+            except RuntimeError as e:  # e.g. empty catalog
+                raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+        if self._known(parts):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {self.path}")
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"no route for {self.path}")
+
+    @staticmethod
+    def _known(parts: list) -> bool:
+        return parts in (["health"], ["metrics"], ["metrics.json"], ["movies"], ["movies", "search"], ["users"], ["login"]) or (
+            len(parts) == 3 and parts[0] == "users" and parts[2] == "recommendations")
+
+    def _content_length(self) -> int:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        return length
+
+    def _body(self) -> Dict[str, Any]:
+        length = self._length or 0
+        if length > MAX_BODY:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+        raw = self.rfile.read(length)
+        self._body_read = True
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "request body must be JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "request body must be a JSON object")
+        return body
+
+    def _send(self, status: HTTPStatus, payload: Any) -> None:
+        if isinstance(payload, str):
+            data, kind = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            data, kind = json.dumps(payload, ensure_ascii=False, default=json_default).encode("utf-8"), "application/json; charset=utf-8"
+        self.send_response(status)
+        self.send_header("Content-Type", kind)
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class GatewayServer(HTTPServer):
+    """HTTPServer that hands each accepted connection to a bounded thread pool."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], workers: int, gateway: Optional[APIGateway] = None,
+                 keepalive: float | None = None, verbose: bool = False, max_pending: int | None = None) -> None:
+        super().__init__(address, GatewayHandler)
+        self.gateway = gateway or APIGateway()
+        workers = max(1, workers)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+        if max_pending is None:
+            max_pending = int(os.getenv("HTTP_MAX_PENDING", "256"))
+        self._slots = threading.BoundedSemaphore(workers + max(0, max_pending))  # served + queued connections
+        self.keepalive = keepalive if keepalive is not None else float(os.getenv("HTTP_KEEPALIVE", "15"))
+        self.verbose = verbose
+
+    def process_request(self, request, client_address) -> None:
+        if not self._slots.acquire(blocking=False):
+            Metrics.inc("http.rejected")
+            try:
+                request.settimeout(1)
+                request.sendall(_BUSY)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        try:
+            self.pool.submit(self._serve, request, client_address)
+        except RuntimeError:  # pool shut down
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _serve(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve APIGateway over HTTP.")
+    parser.add_argument("--host", default=os.getenv("HTTP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("HTTP_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("HTTP_WORKERS", "16")))
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = GatewayServer((args.host, args.port), args.workers, verbose=args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} "
+          f"({args.workers} workers, AI backend {server.gateway.backend_name})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cold-start cost of DatabaseManager: JSON parse vs the binary snapshot.
+
+Run from the movies_library directory:
+    python -m benchmarks.coldstart [--sizes 10k,100k] [--runs 3] [--layout dict|compact] [--out coldstart.json]
+
+For each size a benchmarks.datagen dataset (cached under bench_data/) is
+copied to a scratch directory. Every run is a fresh process that constructs
+DatabaseManager over it (movies + users) and reports the load time and the
+process's peak RSS. "json" runs with DB_BINARY_SNAPSHOT=0; "snapshot" runs
+with DB_BINARY_SNAPSHOT=1 after one untimed run has written the .snap files.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse, json, os, platform, resource, shutil, statistics, subprocess, sys, tempfile, time
+
+from benchmarks.common import git_revision
+from benchmarks.datagen import SIZES
+from benchmarks.suite import ROOT, dataset
+
+MODES = {"json": "0", "snapshot": "1"}
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def load_once(work: Path) -> Dict[str, Any]:
+    base = peak_rss_bytes()
+    start = time.perf_counter()
+    from infra.database_manager import DatabaseManager
+    mgr = DatabaseManager(work / "movies.json", work / "users.json")
+    elapsed = time.perf_counter() - start
+    return {"load_s": elapsed, "movies": len(mgr.movies), "users": len(mgr.users),
+            "peak_rss_mb": peak_rss_bytes() / 2**20, "base_rss_mb": base / 2**20}
+
+
+def _child(work: Path, mode: str, layout: str) -> Dict[str, Any]:
+    env = dict(os.environ, DB_BINARY_SNAPSHOT=MODES[mode], CATALOG_LAYOUT=layout, PYTHONPATH=str(ROOT))
+    out = subprocess.run([sys.executable, "-m", "benchmarks.coldstart", "--single", str(work)],
+                         cwd=ROOT, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        sys.exit(f"cold-start run failed ({mode}):\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_size(size: str, runs: int, layout: str, seed: int, cache_dir: Path) -> Dict[str, Any]:
+    src = dataset(size, seed, cache_dir)
+    work = Path(tempfile.mkdtemp(prefix="movies-coldstart-"))
+    try:
+        for name in ("movies.json", "users.json"):
+            shutil.copyfile(src / name, work / name)
+        _child(work, "snapshot", layout)  # writes movies.snap / users.snap
+        results: Dict[str, Any] = {}
+        for mode in MODES:
+            samples = [_child(work, mode, layout) for _ in range(runs)]
+            results[mode] = {
+                "load_s_median": round(statistics.median(s["load_s"] for s in samples), 3),
+                "load_s_min": round(min(s["load_s"] for s in samples), 3),
+                "peak_rss_mb": round(max(s["peak_rss_mb"] for s in samples), 1),
+                "movies": samples[0]["movies"],
+                "users": samples[0]["users"],
+            }
+        results["speedup"] = round(results["json"]["load_s_median"] / max(results["snapshot"]["load_s_median"], 1e-9), 2)
+        return {"size": size, "layout": layout, "results": results}
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100k", help=f"comma-separated subset of {','.join(SIZES)}")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--layout", choices=("dict", "compact"), default="dict")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--cache-dir", default=str(ROOT / "bench_data"))
+    parser.add_argument("--out", help="also write the JSON results here")
+    parser.add_argument("--single", metavar="DIR", help=argparse.SUPPRESS)  # child process mode
+    args = parser.parse_args(argv)
+
+    if args.single:
+        print(json.dumps(load_once(Path(args.single))))
+        return
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    runs = [run_size(size, args.runs, args.layout, args.seed, Path(args.cache_dir)) for size in sizes]
+    text = json.dumps({"benchmark": "coldstart", "revision": git_revision(),
+                       "python": platform.python_version(), "runs": runs}, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
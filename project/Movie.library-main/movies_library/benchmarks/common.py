@@ -0,0 +1,32 @@
+from __future__ import annotations
+from typing import Dict, List
+import subprocess
+
+
+def percentile(sorted_ms: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_ms:
+        return 0.0
+    rank = max(0, min(len(sorted_ms) - 1, int(round(p / 100.0 * len(sorted_ms) + 0.5)) - 1))
+    return round(sorted_ms[rank], 3)
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    ms = sorted(samples_ms)
+    return {
+        "n": len(ms),
+        "total_s": round(sum(ms) / 1000.0, 4),
+        "mean_ms": round(sum(ms) / len(ms), 4) if ms else 0.0,
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": round(ms[-1], 3) if ms else 0.0,
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
@@ -0,0 +1,139 @@
+"""
+Synthetic catalogs for benchmarking, built with app.factories.
+
+Run from the movies_library directory:
+    python -m benchmarks.datagen --size 100k --out bench_data/100k [--seed 7]
+
+Sizes: 10k, 100k and 1m movies with 10k, 50k and 100k users (or --movies /
+--users explicitly). Genre popularity and tag popularity follow Zipf-like
+weights, tags are drawn mostly from a per-genre vocabulary, and user
+preferences mix favourite genres with tags, so the preference index sees
+realistic posting-list skew. Output is deterministic for a given seed and
+is written as data/movies.json-compatible files.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+import argparse, json, random
+
+from app.factories import create_movie, create_user
+
+SIZES: Dict[str, Tuple[int, int]] = {"10k": (10_000, 10_000), "100k": (100_000, 50_000), "1m": (1_000_000, 100_000)}
+
+GENRES = ["drama", "comedy", "action", "thriller", "romance", "sci-fi", "horror", "animation",
+          "documentary", "crime", "adventure", "fantasy", "mystery", "family", "music", "war", "western"]
+GENRE_TAGS: Dict[str, List[str]] = {
+    "drama": ["family", "loss", "redemption", "biography", "courtroom", "coming-of-age"],
+    "comedy": ["satire", "parody", "romcom", "slapstick", "buddy", "dark-comedy"],
+    "action": ["heist", "martial-arts", "chase", "explosions", "spy", "revenge"],
+    "thriller": ["suspense", "conspiracy", "psychological", "spy", "twist", "survival"],
+    "romance": ["love", "wedding", "romcom", "period", "tragedy", "music"],
+    "sci-fi": ["space", "robots", "time-travel", "dystopia", "aliens", "science"],
+    "horror": ["ghosts", "slasher", "zombies", "haunted", "monster", "survival"],
+    "animation": ["family", "music", "anime", "fairy-tale", "talking-animals", "love"],
+    "documentary": ["nature", "history", "science", "biography", "music", "sports"],
+    "crime": ["heist", "gangster", "detective", "noir", "courtroom", "revenge"],
+    "adventure": ["quest", "treasure", "jungle", "pirates", "survival", "space"],
+    "fantasy": ["magic", "dragons", "quest", "fairy-tale", "mythology", "swords"],
+    "mystery": ["detective", "whodunit", "twist", "noir", "conspiracy", "haunted"],
+    "family": ["family", "talking-animals", "holiday", "friendship", "coming-of-age", "sports"],
+    "music": ["music", "band", "biography", "dance", "concert", "love"],
+    "war": ["history", "soldiers", "survival", "biography", "resistance", "tragedy"],
+    "western": ["cowboys", "revenge", "outlaws", "frontier", "gunfight", "treasure"],
+}
+GENERIC_TAGS = ["classic", "award-winning", "cult", "indie", "based-on-book", "true-story", "remake",
+                "sequel", "ensemble", "mind", "dream", "friendship", "holiday", "sports", "hero"]
+ADJECTIVES = ["Silent", "Last", "Broken", "Golden", "Hidden", "Crimson", "Endless", "Wild", "Lost",
+              "Distant", "Frozen", "Burning", "Secret", "Electric", "Midnight", "Savage", "Gentle", "Hollow"]
+NOUNS = ["Harbor", "Kingdom", "Signal", "Garden", "Empire", "River", "Orbit", "Witness", "Frontier",
+         "Shadow", "Promise", "Machine", "Voyage", "Storm", "Letter", "Mirror", "Horizon", "Legacy",
+         "Circus", "Station", "Protocol", "Island", "Carnival", "Tide", "Archive", "Citadel"]
+FIRST_NAMES = ["Sara", "Ali", "Mona", "Omar", "Lena", "Yusuf", "Noor", "Adam", "Maya", "Karim",
+               "Hana", "Sami", "Lina", "Zaid", "Rana", "Tariq", "Dana", "Fares", "Jude", "Rami"]
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def _title(rnd: random.Random, i: int) -> str:
+    shape = rnd.random()
+    if shape < 0.35:
+        title = f"The {rnd.choice(ADJECTIVES)} {rnd.choice(NOUNS)}"
+    elif shape < 0.6:
+        title = f"{rnd.choice(NOUNS)} of the {rnd.choice(NOUNS)}"
+    elif shape < 0.85:
+        title = f"{rnd.choice(ADJECTIVES)} {rnd.choice(NOUNS)}"
+    else:
+        title = f"{rnd.choice(NOUNS)}"
+    if rnd.random() < 0.08:
+        title += f" {rnd.randint(2, 4)}"  # sequels
+    # Keep titles mostly unique at scale without looking synthetic.
+    return title if i % 7 else f"{title} ({1950 + i % 75})"
+
+
+def generate_movies(n: int, seed: int = 7) -> Iterator[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    genre_weights = _zipf_weights(len(GENRES))
+    generic_weights = _zipf_weights(len(GENERIC_TAGS), 1.3)
+    for i in range(n):
+        genre = rnd.choices(GENRES, genre_weights)[0]
+        own = GENRE_TAGS[genre]
+        tags = set(rnd.choices(own, _zipf_weights(len(own), 0.8), k=rnd.randint(1, 3)))
+        if rnd.random() < 0.6:
+            tags.update(rnd.choices(GENERIC_TAGS, generic_weights, k=rnd.randint(1, 2)))
+        yield create_movie(_title(rnd, i), genre, sorted(tags), id=f"m{i:07d}",
+                           year=rnd.randint(1950, 2025), rating=round(rnd.uniform(3.0, 9.5), 1))
+
+
+def generate_users(n: int, seed: int = 7) -> Iterator[Dict[str, Any]]:
+    rnd = random.Random(seed + 1)
+    genre_weights = _zipf_weights(len(GENRES))
+    for i in range(n):
+        name = rnd.choice(FIRST_NAMES)
+        favourites = set(rnd.choices(GENRES, genre_weights, k=rnd.randint(1, 2)))
+        prefs = set(favourites)
+        for g in favourites:
+            prefs.update(rnd.sample(GENRE_TAGS[g], k=rnd.randint(0, 2)))
+        if rnd.random() < 0.3:
+            prefs.add(rnd.choice(GENERIC_TAGS))
+        yield create_user(name, f"{name.lower()}{i}", f"pw-{i}", sorted(prefs), id=f"u{i:07d}")
+
+
+def write_json_array(path: Path, records: Iterator[Dict[str, Any]]) -> int:
+    """Stream records into a JSON array without holding them all in memory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for rec in records:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(rec, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def generate(out: str | Path, movies: int, users: int, seed: int = 7) -> Dict[str, Any]:
+    out = Path(out)
+    return {
+        "movies": write_json_array(out / "movies.json", generate_movies(movies, seed)),
+        "users": write_json_array(out / "users.json", generate_users(users, seed)),
+        "dir": str(out),
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="10k")
+    parser.add_argument("--movies", type=int, help="override the movie count of --size")
+    parser.add_argument("--users", type=int, help="override the user count of --size")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", required=True, help="directory for movies.json and users.json")
+    args = parser.parse_args(argv)
+    movies, users = SIZES[args.size]
+    print(json.dumps(generate(args.out, args.movies or movies, args.users or users, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+HTTP load generator for app.server.
+
+Run from the movies_library directory:
+    python -m benchmarks.load [--url http://host:port] [--clients 16] [--duration 10]
+                              [--workers 16] [--mix list=4,login=3,recommend=3]
+
+Without --url it starts `python -m app.server` (AI_BACKEND=mock) on a free
+port, working on a copy of data/ in a temp directory so the real files are
+never touched. Each client keeps one HTTP/1.1 connection open and issues
+requests from the weighted mix until the duration elapses. Throughput and
+p50/p95/p99 latency per operation are printed as JSON.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+import argparse, http.client, json, os, random, shutil, socket, subprocess, sys, tempfile, threading, time
+
+from benchmarks.common import summarize
+
+ROOT = Path(__file__).resolve().parents[1]
+LOAD_USER = {"id": "load-user", "name": "Load", "username": "load_user", "password": "load",
+             "preferences": ["Drama", "Sci-Fi", "space"]}
+
+
+class Client:
+    def __init__(self, host: str, port: int) -> None:
+        self.conn = http.client.HTTPConnection(host, port, timeout=30)
+
+    def call(self, method: str, path: str, body: Dict[str, Any] | None = None) -> Tuple[int, Any]:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        self.conn.request(method, path, body=data, headers=headers)
+        resp = self.conn.getresponse()
+        return resp.status, json.loads(resp.read() or b"null")
+
+
+OPS = {
+    "list": lambda c: c.call("GET", "/movies?limit=20"),
+    "login": lambda c: c.call("POST", "/login", {"username": LOAD_USER["username"], "password": LOAD_USER["password"]}),
+    "recommend": lambda c: c.call("GET", f"/users/{LOAD_USER['id']}/recommendations?k=5"),
+}
+
+
+def start_server(workers: int) -> Tuple[subprocess.Popen, int, Path]:
+    tmp = Path(tempfile.mkdtemp(prefix="movies-load-"))
+    if (ROOT / "data").is_dir():
+        shutil.copytree(ROOT / "data", tmp / "data", ignore=shutil.ignore_patterns("*.journal", "*.db*"))
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = dict(os.environ, AI_BACKEND="mock", PYTHONPATH=str(ROOT), PYTHONUNBUFFERED="1")
+    proc = subprocess.Popen([sys.executable, "-m", "app.server", "--port", str(port), "--workers", str(workers)],
+                            cwd=tmp, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if Client("127.0.0.1", port).call("GET", "/health")[0] == 200:
+                return proc, port, tmp
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("server did not become healthy within 30s")
+
+
+def run(host: str, port: int, clients: int, duration: float, mix: Dict[str, int]) -> Dict[str, Any]:
+    status, _ = Client(host, port).call("POST", "/users", LOAD_USER)
+    if status not in (201, 400):  # 400: already registered by an earlier run
+        raise RuntimeError(f"could not register the load user (HTTP {status})")
+
+    ops = [name for name, weight in mix.items() for _ in range(weight)]
+    samples: Dict[str, List[float]] = {name: [] for name in mix}
+    errors: Dict[str, int] = {name: 0 for name in mix}
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(seed: int) -> None:
+        rnd = random.Random(seed)
+        client = Client(host, port)
+        local: Dict[str, List[float]] = {name: [] for name in mix}
+        failed: Dict[str, int] = {name: 0 for name in mix}
+        while time.perf_counter() < stop_at:
+            name = rnd.choice(ops)
+            start = time.perf_counter()
+            try:
+                ok = OPS[name](client)[0] < 400
+            except (OSError, http.client.HTTPException):
+                ok = False
+                client = Client(host, port)
+            local[name].append((time.perf_counter() - start) * 1000.0)
+            if not ok:
+                failed[name] += 1
+        with lock:
+            for name in mix:
+                samples[name].extend(local[name])
+                errors[name] += failed[name]
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    results: Dict[str, Any] = {}
+    for name, ms in samples.items():
+        results[name] = {**summarize(ms), "errors": errors[name], "rps": round(len(ms) / elapsed, 1)}
+    total = sum(r["n"] for r in results.values())
+    return {"elapsed_s": round(elapsed, 3), "requests": total, "rps": round(total / elapsed, 1), "ops": results}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="existing server; default: spawn one with the mock backend")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=16, help="worker pool size of the spawned server")
+    parser.add_argument("--mix", default="list=4,login=3,recommend=3")
+    args = parser.parse_args(argv)
+    mix = {k.strip(): int(v) for k, v in (p.split("=") for p in args.mix.split(",") if p.strip())}
+    unknown = set(mix) - set(OPS)
+    if unknown:
+        parser.error(f"unknown operations in --mix: {', '.join(sorted(unknown))}")
+
+    proc = tmp = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname or "127.0.0.1", url.port or 80
+    else:
+        proc, port, tmp = start_server(args.workers)
+        host = "127.0.0.1"
+    try:
+        results = run(host, port, args.clients, args.duration, mix)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+            shutil.rmtree(tmp, ignore_errors=True)
+    print(json.dumps({"benchmark": "http_load", "clients": args.clients,
+                      "server_workers": None if args.url else args.workers, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Catalog memory footprint: dict layout vs CATALOG_LAYOUT=compact.
+
+Run from the movies_library directory:
+    python -m benchmarks.memory [--sizes 100k,1m] [--layouts dict,compact] [--out memory.json]
+
+Each (size, layout) pair loads a benchmarks.datagen catalog (cached under
+bench_data/) in a fresh process and reports resident set size after the
+imports, after DatabaseManager has loaded the catalog, and after the
+preference index is built, plus the load time and bytes per movie. Users
+are left out (an empty users file) so the numbers are the catalog's own.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse, ctypes, gc, json, os, platform, resource, subprocess, sys, tempfile, time
+
+from benchmarks.common import git_revision
+from benchmarks.datagen import SIZES
+from benchmarks.suite import ROOT, dataset
+
+LAYOUTS = ("dict", "compact")
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux /proc), else the peak from getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def settle() -> None:
+    """Collect garbage and hand freed heap pages back (glibc), so RSS tracks live data."""
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def measure(size: str, layout: str, seed: int, cache_dir: Path) -> Dict[str, Any]:
+    src = dataset(size, seed, cache_dir)
+    os.environ["CATALOG_LAYOUT"] = layout
+    from infra.database_manager import DatabaseManager
+    from app.ai.scoring import PreferenceIndex
+    no_users = Path(tempfile.mkdtemp(prefix="movies-mem-")) / "users.json"  # measure the catalog alone
+    settle()
+    base = rss_bytes()
+
+    start = time.perf_counter()
+    mgr = DatabaseManager(src / "movies.json", no_users)
+    movies = mgr.movies
+    load_s = time.perf_counter() - start
+    settle()
+    loaded = rss_bytes()
+
+    index = PreferenceIndex(movies)
+    settle()
+    indexed = rss_bytes()
+
+    n = len(movies)
+    return {
+        "size": size,
+        "layout": layout,
+        "movies": n,
+        "load_s": round(load_s, 3),
+        "rss_base_mb": round(base / 2**20, 1),
+        "rss_loaded_mb": round(loaded / 2**20, 1),
+        "rss_indexed_mb": round(indexed / 2**20, 1),
+        "catalog_bytes_per_movie": round((loaded - base) / max(n, 1)),
+        "index_bytes_per_movie": round((indexed - loaded) / max(n, 1)),
+        "postings": len(index.postings),
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100k", help=f"comma-separated subset of {','.join(SIZES)}")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--cache-dir", default=str(ROOT / "bench_data"))
+    parser.add_argument("--out", help="also write the JSON results here")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)  # child process mode
+    args = parser.parse_args(argv)
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    layouts = [s.strip().lower() for s in args.layouts.split(",") if s.strip()]
+    bad = [s for s in sizes if s not in SIZES] + [l for l in layouts if l not in LAYOUTS]
+    if bad:
+        parser.error(f"unknown sizes/layouts: {', '.join(bad)}")
+
+    if args.single:
+        print(json.dumps(measure(sizes[0], layouts[0], args.seed, Path(args.cache_dir))))
+        return
+
+    runs = []
+    for size in sizes:
+        dataset(size, args.seed, Path(args.cache_dir))  # generate once, outside the measured processes
+        for layout in layouts:
+            cmd = [sys.executable, "-m", "benchmarks.memory", "--single", "--sizes", size, "--layouts", layout,
+                   "--seed", str(args.seed), "--cache-dir", args.cache_dir]
+            out = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+            if out.returncode != 0:
+                sys.exit(f"memory benchmark for {size}/{layout} failed:\n{out.stderr}")
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    text = json.dumps({"benchmark": "memory", "revision": git_revision(),
+                       "python": platform.python_version(), "runs": runs}, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
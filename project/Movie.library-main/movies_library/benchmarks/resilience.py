@@ -0,0 +1,124 @@
+"""
+Resilience checks for the LLM backend guards, against the fake backend.
+
+Run from the movies_library directory:
+    python -m benchmarks.resilience [--callers 32] [--latency 0.2] [--qps 20] [--requests 40]
+
+No API key or network needed: APIAdapter runs with AI_BACKEND=fake over a
+generated catalog. Three scenarios; results are printed as JSON and any
+violation exits with code 1:
+
+- coalescing: many concurrent identical requests (threads, then asyncio
+  tasks) must reach the backend once per burst.
+- rate_limit: distinct requests from many threads must not exceed AI_QPS
+  (plus the initial burst).
+- circuit_breaker: with every call failing, the backend sees only
+  AI_BREAKER_FAILURES calls before requests go straight to the local scorer;
+  after AI_BREAKER_RESET a healthy probe closes the circuit again.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List
+import argparse, asyncio, json, os, threading, time
+
+from benchmarks.datagen import generate_movies
+
+
+def _adapter(**env: str) -> Any:
+    from app.adapters.api_adapter import APIAdapter
+    from app.ai.fake_client import FakeLLMAdapter
+
+    os.environ.update(env)
+    APIAdapter._guards.clear()  # guards are read from the env once per backend
+    adapter = APIAdapter("fake")
+    adapter._client = FakeLLMAdapter()
+    return adapter
+
+
+def _threads(n: int, target: Any) -> float:
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(n)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def coalescing(movies: List[Dict[str, Any]], callers: int, latency: float) -> Dict[str, Any]:
+    adapter = _adapter(AI_FAKE_LATENCY=str(latency), AI_FAKE_ERROR_RATE="0", AI_QPS="0")
+    user = {"preferences": ["drama", "space"]}
+    answers: List[Any] = [None] * callers
+
+    def call(i: int) -> None:
+        answers[i] = [m["id"] for m in adapter.recommend(user, movies, 5)]
+
+    elapsed = _threads(callers, call)
+    sync_calls = adapter.client.calls
+
+    async def burst() -> List[Any]:
+        return await asyncio.gather(*(adapter.recommend_async(user, movies, 5) for _ in range(callers)))
+
+    async_answers = [[m["id"] for m in recs] for recs in asyncio.run(burst())]
+    return {"callers": callers, "sync_backend_calls": sync_calls, "async_backend_calls": adapter.client.calls - sync_calls,
+            "elapsed_s": round(elapsed, 3), "same_answer": len({json.dumps(a) for a in answers + async_answers}) == 1,
+            "ok": sync_calls == 1 and adapter.client.calls - sync_calls == 1}
+
+
+def rate_limit(movies: List[Dict[str, Any]], qps: float, requests: int) -> Dict[str, Any]:
+    adapter = _adapter(AI_FAKE_LATENCY="0", AI_FAKE_ERROR_RATE="0", AI_QPS=str(qps), AI_BURST="1")
+
+    def call(i: int) -> None:
+        adapter.recommend({"preferences": [f"tag-{i}"]}, movies, 5)
+
+    elapsed = _threads(requests, call)
+    allowed = 1 + qps * elapsed  # burst + refill over the run
+    return {"qps": qps, "requests": requests, "elapsed_s": round(elapsed, 3),
+            "achieved_qps": round(adapter.client.calls / elapsed, 2), "backend_calls": adapter.client.calls,
+            "ok": adapter.client.calls <= allowed + 1e-6 and elapsed >= (requests - 1) / qps * 0.95}
+
+
+def circuit_breaker(movies: List[Dict[str, Any]], requests: int) -> Dict[str, Any]:
+    from app.ai.mock_client import MockAIAdapter
+
+    adapter = _adapter(AI_FAKE_LATENCY="0.01", AI_FAKE_ERROR_RATE="1", AI_QPS="0",
+                       AI_BREAKER_FAILURES="5", AI_BREAKER_RESET="0.5")
+    local = MockAIAdapter()
+    user = {"preferences": ["comedy"]}
+    expected = [m["id"] for m in local.recommend(user, movies, 5)]
+    start = time.perf_counter()
+    answers = [[m["id"] for m in adapter.recommend(user, movies, 5)] for _ in range(requests)]
+    elapsed = time.perf_counter() - start
+    failing_calls, opened = adapter.client.calls, adapter.guards[2].state
+
+    time.sleep(0.5)
+    adapter.client.error_rate = 0.0
+    adapter.recommend(user, movies, 5)
+    closed = adapter.guards[2].state
+    return {"requests": requests, "backend_calls_while_failing": failing_calls, "state_after_failures": opened,
+            "state_after_probe": closed, "elapsed_s": round(elapsed, 3), "all_local": all(a == expected for a in answers),
+            "ok": failing_calls == 5 and opened == "open" and closed == "closed" and all(a == expected for a in answers)}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--callers", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--qps", type=float, default=20.0)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--movies", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    movies = list(generate_movies(args.movies, 7))
+    results = {
+        "coalescing": coalescing(movies, args.callers, args.latency),
+        "rate_limit": rate_limit(movies, args.qps, args.requests),
+        "circuit_breaker": circuit_breaker(movies, args.requests),
+    }
+    print(json.dumps(results, indent=2))
+    failed = [name for name, r in results.items() if not r["ok"]]
+    if failed:
+        raise SystemExit(f"violations: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
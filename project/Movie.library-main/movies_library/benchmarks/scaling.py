@@ -0,0 +1,77 @@
+"""
+Local preference scoring: in-process PreferenceIndex vs ParallelIndex over 1..N workers.
+
+Run from the movies_library directory:
+    python -m benchmarks.scaling [--size 1m] [--workers 1,2,4,8] [--requests 50] [--k 10] [--out scaling.json]
+
+Scores the same user preference lists (from the dataset's users) with the
+serial index and with ParallelIndex at each worker count, checks every
+parallel answer against the serial one, and reports build time (partition
+shipping included) and per-request latency percentiles. Speedup is serial
+p50 over parallel p50.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse, json, os, platform, time
+
+from benchmarks.common import git_revision, summarize
+from benchmarks.datagen import SIZES, generate_movies, generate_users
+
+
+def timed(index: Any, prefs: List[List[str]], k: int) -> tuple:
+    samples, answers = [], []
+    for p in prefs:
+        start = time.perf_counter()
+        answers.append([m["id"] for m in index.top_k(p, k)])
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return summarize(samples), answers
+
+
+def main(argv: List[str] | None = None) -> None:
+    from app.ai.parallel_scoring import ParallelIndex
+    from app.ai.scoring import PreferenceIndex
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="1m")
+    parser.add_argument("--workers", default=",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)) or "1")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="also write the JSON results here")
+    args = parser.parse_args(argv)
+    counts = [int(w) for w in args.workers.split(",") if w.strip()]
+
+    n_movies, _ = SIZES[args.size]
+    movies = list(generate_movies(n_movies, args.seed))
+    users = generate_users(args.requests, args.seed)
+    prefs = [u["preferences"] for u in users]
+
+    start = time.perf_counter()
+    serial = PreferenceIndex(movies)
+    build = time.perf_counter() - start
+    base, expected = timed(serial, prefs, args.k)
+    runs: List[Dict[str, Any]] = [{"workers": 0, "mode": "serial", "build_s": round(build, 3), **base}]
+
+    for w in counts:
+        start = time.perf_counter()
+        index = ParallelIndex.for_movies(movies, w)
+        build = time.perf_counter() - start
+        index.top_k(prefs[0], args.k)  # warm the workers' code paths
+        stats, answers = timed(index, prefs, args.k)
+        runs.append({"workers": w, "mode": "parallel", "build_s": round(build, 3), **stats,
+                     "speedup": round(base["p50_ms"] / max(stats["p50_ms"], 1e-9), 2),
+                     "exact": answers == expected})
+    ParallelIndex.shutdown()
+
+    text = json.dumps({"benchmark": "scaling", "revision": git_revision(), "python": platform.python_version(),
+                       "cpus": os.cpu_count(), "movies": len(movies), "k": args.k, "runs": runs}, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    if not all(r.get("exact", True) for r in runs):
+        raise SystemExit("parallel results differ from the serial scorer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Time to first prompt of the interactive CLI for each AI_BACKEND.
+
+Run from the movies_library directory:
+    python -m benchmarks.startup [--runs 5] [--backends mock,openai,gemini]
+
+Each run starts `python -m app.cli` in a fresh process and stops the clock
+when the menu prompt ("> ") appears on stdout. Results are printed as JSON.
+"""
+from __future__ import annotations
+from typing import Dict, List
+import argparse, json, os, statistics, subprocess, sys, time
+
+
+def time_to_prompt(backend: str, timeout: float = 60.0) -> float:
+    env = dict(os.environ, AI_BACKEND=backend, PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.cli"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env,
+    )
+    try:
+        seen = b""
+        while not seen.endswith(b"> "):
+            chunk = proc.stdout.read1(4096) if hasattr(proc.stdout, "read1") else proc.stdout.read(1)
+            if not chunk:
+                raise RuntimeError(f"CLI exited before showing a prompt (backend={backend})")
+            seen += chunk
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f"no prompt after {timeout}s (backend={backend})")
+        return time.perf_counter() - start
+    finally:
+        try:
+            proc.communicate(b"q\n", timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--backends", default="mock,openai,gemini")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        samples = [time_to_prompt(backend) for _ in range(args.runs)]
+        results[backend] = {
+            "runs": len(samples),
+            "min_s": round(min(samples), 4),
+            "median_s": round(statistics.median(samples), 4),
+            "max_s": round(max(samples), 4),
+        }
+    print(json.dumps({"benchmark": "startup", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Multi-threaded consistency stress test for the storage layer.
+
+Run from the movies_library directory:
+    python -m benchmarks.stress [--backend json|sqlite] [--write-mode journal|snapshot|deferred]
+                                [--threads 8] [--ops 200] [--switch-interval 1e-6]
+
+Works on a throwaway data directory. Three highly concurrent workloads run
+through the services; violations are reported as JSON (exit code 1 if any):
+
+- lost_updates: every thread patches its own field of one shared movie; all
+  fields must survive with their final value.
+- duplicate_users: every thread registers the same usernames; each must end
+  up owned by exactly one user.
+- snapshot_reads: readers list the catalog while a writer adds fixed-size
+  batches; every listing must contain whole batches only.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+import argparse, json, os, sys, tempfile, threading, time
+
+
+def _run_threads(n: int, target: Callable[[int], None]) -> float:
+    errors: List[BaseException] = []
+
+    def wrapped(i: int) -> None:
+        try:
+            target(i)
+        except BaseException as e:  # surfaced after join
+            errors.append(e)
+
+    threads = [threading.Thread(target=wrapped, args=(i,)) for i in range(n)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return time.perf_counter() - start
+
+
+def lost_updates(catalog, threads: int, ops: int) -> Dict[str, Any]:
+    catalog.add_movie({"id": "stress-shared", "title": "Shared", "genre": "Test"})
+
+    def worker(i: int) -> None:
+        for n in range(ops):
+            catalog.update_movie("stress-shared", {f"field_{i}": n})
+
+    elapsed = _run_threads(threads, worker)
+    final = catalog.get_movie("stress-shared")
+    lost = [i for i in range(threads) if final.get(f"field_{i}") != ops - 1]
+    return {"writes": threads * ops, "elapsed_s": round(elapsed, 4), "violations": len(lost)}
+
+
+def duplicate_users(accounts, threads: int, ops: int) -> Dict[str, Any]:
+    names = [f"stress_user_{n}" for n in range(ops)]
+    won = [0] * threads
+
+    def worker(i: int) -> None:
+        for n, name in enumerate(names):
+            try:
+                accounts.register_user(f"stress-{i}-{n}", name, name, "pw")
+                won[i] += 1
+            except ValueError:
+                pass
+
+    elapsed = _run_threads(threads, worker)
+    owners: Dict[str, int] = {}
+    for u in accounts.list_users():
+        if str(u.get("username", "")).startswith("stress_user_"):
+            owners[u["username"]] = owners.get(u["username"], 0) + 1
+    bad = sum(1 for name in names if owners.get(name) != 1) + abs(sum(won) - len(names))
+    return {"attempts": threads * ops, "registered": sum(won), "elapsed_s": round(elapsed, 4), "violations": bad}
+
+
+def snapshot_reads(catalog, threads: int, ops: int, batch: int = 50) -> Dict[str, Any]:
+    base = len(catalog.list_movies())
+    done = threading.Event()
+    reads = [0] * threads
+    torn = [0] * threads
+
+    def writer() -> None:
+        try:
+            for b in range(ops // 10 or 1):
+                catalog.add_movies_bulk(
+                    [{"id": f"stress-b{b}-{n}", "title": f"Batch {b} #{n}", "genre": "Test"} for n in range(batch)],
+                    batch_size=batch,
+                )
+        finally:
+            done.set()
+
+    def reader(i: int) -> None:
+        while not done.is_set():
+            movies = catalog.list_movies()
+            reads[i] += 1
+            if (len(movies) - base) % batch:
+                torn[i] += 1
+
+    w = threading.Thread(target=writer)
+    w.start()
+    elapsed = _run_threads(threads, reader)
+    w.join()
+    return {"reads": sum(reads), "batches": ops // 10 or 1, "elapsed_s": round(elapsed, 4), "violations": sum(torn)}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--write-mode", choices=("journal", "snapshot", "deferred"), default="journal")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--switch-interval", type=float, default=1e-6,
+                        help="sys.setswitchinterval; tiny values force the thread interleavings races need")
+    args = parser.parse_args(argv)
+    sys.setswitchinterval(args.switch_interval)
+
+    tmp = Path(tempfile.mkdtemp(prefix="movies-stress-"))
+    os.environ["STORAGE_BACKEND"] = args.backend
+    os.environ["DB_WRITE_MODE"] = args.write_mode
+    # Claim the storage singletons with throwaway paths before any service opens them.
+    from infra.database_manager import DatabaseManager
+    DatabaseManager(tmp / "movies.json", tmp / "users.json")
+    if args.backend == "sqlite":
+        from infra.sqlite_store import SQLiteStore
+        SQLiteStore(tmp / "library.db")
+
+    from app.account_service import AccountService
+    from app.catalog_service import CatalogService
+    catalog, accounts = CatalogService(), AccountService()
+    results = {
+        "lost_updates": lost_updates(catalog, args.threads, args.ops),
+        "duplicate_users": duplicate_users(accounts, args.threads, args.ops),
+        "snapshot_reads": snapshot_reads(catalog, args.threads, args.ops),
+    }
+    print(json.dumps({"benchmark": "stress", "backend": args.backend, "write_mode": args.write_mode,
+                      "threads": args.threads, "data_dir": str(tmp), "results": results}, indent=2))
+    if any(r["violations"] for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark suite for the storage and recommendation hot paths.
+
+Run from the movies_library directory:
+    python -m benchmarks.suite [--sizes 10k,100k] [--backend json|sqlite] [--ops 200]
+                               [--write-ops 20] [--out results.json] [--compare baseline.json]
+
+Each size runs in its own process (the stores are singletons) on a scratch
+copy of a dataset from benchmarks.datagen, cached under bench_data/. Timed
+operations: load, get_movie, get_user_by_username, authenticate, list_page,
+add/update/delete_movie, save (JSON backend), recommend (mock scorer, cold
+and warm) and cached recommend. DB_WRITE_MODE is honoured and recorded.
+
+Results are JSON (one entry per size). With --compare, p50 latencies are
+checked against an earlier results file and the run exits 1 if any
+operation got slower than --threshold times the baseline.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+import argparse, json, os, platform, random, shutil, subprocess, sys, tempfile, time
+
+from benchmarks.common import git_revision, summarize
+from benchmarks.datagen import SIZES, generate
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _timed(fn: Callable[[int], Any], n: int) -> List[float]:
+    samples = []
+    for i in range(n):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def dataset(size: str, seed: int, cache_dir: Path) -> Path:
+    path = cache_dir / f"{size}-s{seed}"
+    if not (path / "movies.json").exists() or not (path / "users.json").exists():
+        movies, users = SIZES[size]
+        generate(path, movies, users, seed)
+    return path
+
+
+def run_size(size: str, backend: str, ops: int, write_ops: int, seed: int, cache_dir: Path) -> Dict[str, Any]:
+    src = dataset(size, seed, cache_dir)
+    work = Path(tempfile.mkdtemp(prefix="movies-bench-"))
+    for name in ("movies.json", "users.json"):
+        shutil.copyfile(src / name, work / name)
+    os.environ["STORAGE_BACKEND"] = backend
+    results: Dict[str, Any] = {}
+
+    from infra.database_manager import DatabaseManager
+    if backend == "sqlite":
+        from infra.sqlite_store import SQLiteStore, migrate
+        migrate(work / "movies.json", work / "users.json", work / "library.db")
+        SQLiteStore._instance = None  # migrate() opened the store; time a fresh open
+        start = time.perf_counter()
+        SQLiteStore(work / "library.db")
+        results["load"] = summarize([(time.perf_counter() - start) * 1000.0])
+        mgr = DatabaseManager(work / "movies.json", work / "users.json")  # only to sample ids below
+    else:
+        start = time.perf_counter()
+        mgr = DatabaseManager(work / "movies.json", work / "users.json")
+        results["load"] = summarize([(time.perf_counter() - start) * 1000.0])
+
+    from app.account_service import AccountService
+    from app.catalog_service import CatalogService
+    from app.recommendation_service import RecommendationService
+    catalog, accounts, reco = CatalogService(), AccountService(), RecommendationService()
+    rnd = random.Random(seed)
+    movie_ids = [m["id"] for m in rnd.sample(list(mgr.movies), min(ops, len(mgr.movies)))]
+    users = rnd.sample(list(mgr.users), min(ops, len(mgr.users)))
+    n = min(ops, len(movie_ids), len(users))
+
+    results["get_movie"] = summarize(_timed(lambda i: catalog.get_movie(movie_ids[i]), n))
+    results["get_user_by_username"] = summarize(_timed(lambda i: accounts.storage.get_user_by_username(users[i]["username"]), n))
+    results["authenticate"] = summarize(_timed(lambda i: accounts.authenticate(users[i]["username"], users[i]["password"]), n))
+    results["list_page"] = summarize(_timed(lambda i: catalog.list_movies_page(limit=20, genre="drama" if i % 2 else None), n))
+
+    new = [{"id": f"bench-{i}", "title": f"Bench {i}", "genre": "drama", "tags": ["bench"]} for i in range(write_ops)]
+    results["add_movie"] = summarize(_timed(lambda i: catalog.add_movie(new[i]), write_ops))
+    results["update_movie"] = summarize(_timed(lambda i: catalog.update_movie(new[i]["id"], {"rating": 5.0}), write_ops))
+    results["delete_movie"] = summarize(_timed(lambda i: catalog.delete_movie(new[i]["id"]), write_ops))
+    if backend == "json":
+        results["save"] = summarize(_timed(lambda i: mgr.save_movies(), 3))
+
+    movies = reco._movies()
+    results["recommend_cold"] = summarize(_timed(lambda i: reco.ai.recommend(users[0], movies, 10), 1))
+    results["recommend"] = summarize(_timed(lambda i: reco.ai.recommend(users[i], movies, 10), n))
+    reco.recommend_for_user(users[0]["id"], 10)
+    results["recommend_cached"] = summarize(_timed(lambda i: reco.recommend_for_user(users[0]["id"], 10), n))
+
+    shutil.rmtree(work, ignore_errors=True)
+    return {"size": size, "movies": len(mgr.movies), "users": len(mgr.users), "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Human-readable lines for operations whose p50 regressed past `threshold`."""
+    old = {run["size"]: run["results"] for run in baseline.get("runs", [])}
+    regressions = []
+    for run in current["runs"]:
+        for op, stats in run["results"].items():
+            before = old.get(run["size"], {}).get(op)
+            if not before or not before.get("p50_ms"):
+                continue
+            ratio = stats["p50_ms"] / before["p50_ms"]
+            if ratio > threshold:
+                regressions.append(f"{run['size']}/{op}: p50 {before['p50_ms']}ms -> {stats['p50_ms']}ms (x{ratio:.2f})")
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10k", help=f"comma-separated subset of {','.join(SIZES)}")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--ops", type=int, default=200, help="samples per read operation")
+    parser.add_argument("--write-ops", type=int, default=20, help="samples per add/update/delete")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--cache-dir", default=str(ROOT / "bench_data"))
+    parser.add_argument("--out", help="also write the JSON results here")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)  # child process mode
+    args = parser.parse_args(argv)
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    if args.single:
+        print(json.dumps(run_size(sizes[0], args.backend, args.ops, args.write_ops, args.seed, Path(args.cache_dir))))
+        return
+
+    runs = []
+    for size in sizes:
+        cmd = [sys.executable, "-m", "benchmarks.suite", "--single", "--sizes", size, "--backend", args.backend,
+               "--ops", str(args.ops), "--write-ops", str(args.write_ops), "--seed", str(args.seed),
+               "--cache-dir", args.cache_dir]
+        out = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+        if out.returncode != 0:
+            sys.exit(f"benchmark for {size} failed:\n{out.stderr}")
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "benchmark": "suite",
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "write_mode": os.getenv("DB_WRITE_MODE", "snapshot"),
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        for key in ("backend", "write_mode"):
+            if baseline.get(key) != report[key]:
+                print(f"warning: baseline {key}={baseline.get(key)!r}, this run {report[key]!r}", file=sys.stderr)
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
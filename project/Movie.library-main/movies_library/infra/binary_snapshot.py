@@ -0,0 +1,91 @@
+"""
+Binary sidecar snapshots of the JSON collections, for fast cold start.
+
+`data/movies.json` gets `data/movies.snap`: a fixed header followed by a
+pickle of the record list. The JSON file stays the source of truth; the
+header pins the JSON file's size and mtime (and a blake2b digest of its
+bytes), and a snapshot that does not match is ignored. Loading maps the
+file and unpickles straight from the mapping.
+
+    header = MAGIC | version | json mtime_ns | json size | json digest (16 bytes)
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, List, Optional
+import hashlib, mmap, os, pickle, struct, tempfile
+
+from infra.gc_pause import gc_paused
+
+MAGIC = b"MLSNAP"
+VERSION = 1
+_HEADER = struct.Struct("<6sHQQ16s")
+
+
+def snapshot_path(json_path: Path) -> Path:
+    return json_path.with_suffix(".snap")
+
+
+def digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def load(json_path: Path, verify_hash: bool = False) -> Optional[List[Any]]:
+    """Records from the snapshot of `json_path`, or None if it is missing, unreadable or stale."""
+    snap = snapshot_path(json_path)
+    try:
+        st = json_path.stat()
+        with open(snap, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, mtime_ns, size, want = _HEADER.unpack_from(mm)
+            if magic != MAGIC or version != VERSION or mtime_ns != st.st_mtime_ns or size != st.st_size:
+                return None
+            if verify_hash and digest(json_path.read_bytes()) != want:
+                return None
+            # Unpickling allocates one container per record and field list;
+            # collector passes over them would cost more than the load itself.
+            with gc_paused(), memoryview(mm) as view:
+                records = pickle.loads(view[_HEADER.size:])
+    except (OSError, ValueError, struct.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    return records if isinstance(records, list) else None
+
+
+def save(json_path: Path, records: List[Any], json_bytes: Optional[bytes] = None,
+         st: Optional[os.stat_result] = None) -> None:
+    """
+    Write the snapshot for `json_path`. Pass the JSON file's content and its
+    stat together when at hand, both taken from the same open file: a stat
+    taken after the bytes were read could describe a newer file, and the
+    snapshot would then pass the mtime check with stale records.
+    """
+    if json_bytes is None or st is None:
+        with open(json_path, "rb") as f:
+            st, json_bytes = os.fstat(f.fileno()), f.read()
+    header = _HEADER.pack(MAGIC, VERSION, st.st_mtime_ns, st.st_size, digest(json_bytes))
+    snap = snapshot_path(json_path)
+    fd, tmp = tempfile.mkstemp(prefix=snap.name, dir=str(snap.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snap)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def intern_strings(records: List[Any]) -> None:
+    """
+    Share equal short strings (genres, tags, preferences) between freshly
+    parsed records, in place, so they are stored once in memory and once in
+    the pickle.
+    """
+    table: dict = {}
+    for r in records:
+        if type(r) is not dict:
+            continue
+        for k, v in r.items():
+            if type(v) is str:
+                if len(v) <= 32:
+                    r[k] = table.setdefault(v, v)
+            elif type(v) is list:
+                r[k] = [table.setdefault(x, x) if type(x) is str and len(x) <= 32 else x for x in v]
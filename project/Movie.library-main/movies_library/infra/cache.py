@@ -0,0 +1,109 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+import sys, threading, time
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with optional TTL and entry/byte bounds.
+
+    `sizeof(value)` estimates the footprint counted against `max_bytes`;
+    `on_evict(key)` is called whenever an entry leaves the cache for any
+    reason other than `clear()`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 0,
+        ttl: float = 0,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+        on_evict: Optional[Callable[[Hashable], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries  # 0 = unbounded
+        self.max_bytes = max_bytes      # 0 = unbounded
+        self.ttl = ttl                  # seconds; 0 = never expire
+        self._sizeof = sizeof
+        self._on_evict = on_evict
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def _lookup(self, key: Hashable, default: Any) -> Any:
+        """Live value (marked recently used) or `default`; caller holds the lock, no hit/miss accounting."""
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        value, expires_at, _ = item
+        if expires_at and expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if key in self._data:
+                self._remove(key, notify=False)
+            size = self._sizeof(value)
+            expires_at = self._clock() + self.ttl if self.ttl else 0
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            while self._data and (
+                (self.max_entries and len(self._data) > self.max_entries)
+                or (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._remove(key)
+            return True
+
+    def _remove(self, key: Hashable, notify: bool = True) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+        if notify and self._on_evict is not None:
+            self._on_evict(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,125 @@
+from __future__ import annotations
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+import json
+
+_CORE = ("id", "title", "genre", "tags")
+
+# Interning tables. They only grow with the vocabulary (genres, tags, tag
+# sets, extra-field layouts), never with the number of movies.
+_strings: Dict[str, str] = {}
+_tag_sets: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_key_sets: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern(s: str) -> str:
+    return _strings.setdefault(s, s)
+
+
+def _tags(tags) -> Tuple[str, ...]:
+    t = tuple(_strings.setdefault(x, x) for x in tags)
+    return _tag_sets.setdefault(t, t)
+
+
+class MovieRecord(Mapping):
+    """
+    Read-only, dict-compatible movie with `__slots__` storage.
+
+    The genre and every tag are interned, and so are whole tag tuples and the
+    names of extra fields, so a million movies share a few hundred of each
+    instead of carrying their own copies. Reads behave like the dict it was
+    built from (`m["tags"]` is a fresh list); `to_dict()` gives the plain dict.
+    """
+
+    __slots__ = ("id", "title", "genre", "_tags", "_keys", "_values")
+
+    def __init__(self, id: str, title: str, genre: str, tags: Tuple[str, ...],
+                 keys: Tuple[str, ...] = (), values: Tuple[Any, ...] = ()) -> None:
+        self.id = id
+        self.title = title
+        self.genre = genre
+        self._tags = tags
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "id": return self.id
+        if key == "title": return self.title
+        if key == "genre": return self.genre
+        if key == "tags": return list(self._tags)
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in _CORE or key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _CORE
+        yield from self._keys
+
+    def __len__(self) -> int:
+        return 4 + len(self._keys)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {"id": self.id, "title": self.title, "genre": self.genre, "tags": list(self._tags)}
+        d.update(zip(self._keys, self._values))
+        return d
+
+    copy = to_dict
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def __reduce__(self):
+        # Unpickled records go through the interning tables again.
+        return (_restore, (self.id, self.title, self.genre, self._tags, self._keys, self._values))
+
+
+def _restore(id: str, title: str, genre: str, tags: Tuple[str, ...],
+             keys: Tuple[str, ...], values: Tuple[Any, ...]) -> MovieRecord:
+    return MovieRecord(id, title, _intern(genre), _tags(tags), _key_sets.setdefault(keys, keys), values)
+
+
+def compact_movie(movie: Any) -> Any:
+    """
+    MovieRecord for a movie dict whose first keys are id/title/genre/tags (tags
+    a list of hashable values), in that order, so the conversion is lossless.
+    Anything else is returned unchanged.
+    """
+    if type(movie) is not dict:
+        return movie
+    keys = tuple(movie)
+    if keys[:4] != _CORE or type(movie["tags"]) is not list:
+        return movie
+    try:
+        genre, tags = _strings.setdefault(movie["genre"], movie["genre"]), _tags(movie["tags"])
+    except TypeError:  # unhashable genre or tag
+        return movie
+    if len(keys) == 4:
+        return MovieRecord(movie["id"], movie["title"], genre, tags)
+    keys = _key_sets.setdefault(keys[4:], keys[4:])
+    return MovieRecord(movie["id"], movie["title"], genre, tags, keys, tuple(movie[k] for k in keys))
+
+
+def json_default(obj: Any) -> Any:
+    """`default=` hook for json.dump(s) so compact records serialize as objects."""
+    if isinstance(obj, MovieRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_bytes(data: Any, indent: Optional[int] = None) -> bytes:
+    """UTF-8 JSON as the store writes its files; without indent, dumps() takes the C encoder."""
+    if indent:
+        text = json.dumps(data, ensure_ascii=False, indent=indent, default=json_default)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=json_default)
+    return text.encode("utf-8")
@@ -1,11 +1,37 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Any, Dict, List
-import json, threading, tempfile, os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import atexit, hashlib, json, logging, threading, tempfile, time, os
+
+from infra import binary_snapshot
+from infra.compact_catalog import MovieRecord, compact_movie, json_bytes, json_default
+from infra.journal import Journal
+from infra.metrics import Metrics
+from infra.shards import ShardedMovies
+from infra.sorted_ids import SortedIds
+
+_DIGEST_MASK = (1 << 128) - 1
+_log = logging.getLogger(__name__)
 
 class DatabaseManager:
+    """
+    Process-wide store over data/movies.json and data/users.json.
+
+    Writers serialize on `_write_lock`. Records are never mutated in place: a
+    write swaps in a new dict, so the `movies`/`users` lists handed to readers
+    are immutable point-in-time snapshots (copy-on-write at record level).
+    A snapshot is built once per change and shared by every reader until the
+    next write; reading a current snapshot takes no lock.
+    """
+
     _instance: "DatabaseManager|None" = None
     _lock = threading.Lock()
+    # DB_BINARY_SNAPSHOT=1 keeps a pickled sidecar (movies.snap, users.snap)
+    # next to each JSON file and loads it instead of parsing the JSON while it
+    # is current (same mtime and size; DB_SNAPSHOT_VERIFY=hash also compares a
+    # digest of the JSON bytes). See infra.binary_snapshot.
+    binary_snapshots = os.getenv("DB_BINARY_SNAPSHOT", "0").strip().lower() in ("1", "true", "yes")
+    snapshot_verify = os.getenv("DB_SNAPSHOT_VERIFY", "mtime").strip().lower() == "hash"
 
     def __new__(cls, movies_path: str | Path = Path("data/movies.json"),
                      users_path: str | Path = Path("data/users.json")):
@@ -14,42 +40,556 @@ class DatabaseManager:
                 inst = super().__new__(cls)
                 inst.movies_path = Path(movies_path)
                 inst.users_path = Path(users_path)
+                # DB_WRITE_MODE: "snapshot" rewrites the collection file on every
+                # mutation; "journal" appends to a write-ahead log with group
+                # commit and only rewrites the snapshots on compaction;
+                # "deferred" marks the collection dirty and a background thread
+                # rewrites it DB_FLUSH_INTERVAL seconds after the first unsaved
+                # change, or once DB_FLUSH_PENDING changes have piled up.
+                inst.write_mode = os.getenv("DB_WRITE_MODE", "snapshot").strip().lower()
+                inst.compact_every = int(os.getenv("DB_COMPACT_EVERY", "1000"))
+                inst.flush_interval = float(os.getenv("DB_FLUSH_INTERVAL", "1.0"))
+                inst.flush_pending = int(os.getenv("DB_FLUSH_PENDING", "500"))
+                # DB_JSON_INDENT=0 writes one-line JSON (much faster at scale).
+                inst.json_indent = int(os.getenv("DB_JSON_INDENT", "2")) or None
+                # CATALOG_LAYOUT: "dict" keeps movies as the parsed dicts;
+                # "compact" stores read-only MovieRecords with interned strings.
+                inst.compact_records = os.getenv("CATALOG_LAYOUT", "dict").strip().lower() == "compact"
+                # DB_MOVIE_SHARDS=N (> 0) keeps movies in N lazily loaded shard
+                # files under data/movies/ (see infra.shards) instead of movies.json.
+                inst.movie_shards = int(os.getenv("DB_MOVIE_SHARDS", "0"))
+                inst.journal = Journal(inst.movies_path.with_name("db.journal"))
+                inst._write_lock = threading.RLock()
+                inst._flush_lock = threading.Lock()  # orders snapshot writes
+                inst._flush_cond = threading.Condition(inst._write_lock)
+                inst._flusher: Optional[threading.Thread] = None
+                inst._dirty: Dict[str, float] = {}  # collection -> time of its first unsaved change
+                inst._pending = 0
                 inst._load()
                 cls._instance = inst
             return cls._instance
 
     def _load(self) -> None:
-        self.movies: List[Dict[str, Any]] = self._read(self.movies_path)
-        self.users:  List[Dict[str, Any]] = self._read(self.users_path)
+        # Records are kept in insertion-ordered dicts keyed by id, so the id
+        # index *is* the collection; usernames get a secondary index.
+        hook = compact_movie if self.compact_records else None
+        if self.movie_shards > 0:
+            self._movies: Dict[str, Dict[str, Any]] = ShardedMovies.open(  # type: ignore[assignment]
+                self.movies_path.with_suffix(""), self.movie_shards, self.movies_path,
+                lambda path: self._by_id(self._read(path, hook)), self.json_indent)
+        else:
+            self._movies = self._by_id(self._read(self.movies_path, hook))
+        # Bumped on every catalog change so readers can cache derived data.
+        self.movies_version = getattr(self, "movies_version", 0) + 1
+        self._digest: Optional[int] = None  # computed on first use, then kept incrementally
+        self._order: Optional[Dict[Optional[str], SortedIds]] = None  # id order per genre (None = all); lazy
+        self._movies_snap: Optional[List[Dict[str, Any]]] = None
+        self._users_snap: Optional[List[Dict[str, Any]]] = None
+        self._users:  Dict[str, Dict[str, Any]] = self._by_id(self._read(self.users_path))
+        self._usernames: Dict[str, Dict[str, Any]] = {}
+        for u in self._users.values():
+            self._usernames.setdefault(self.normalize_username(u.get("username")), u)
+        self._recover()
+
+    def _recover(self) -> None:
+        # Replay mutations that reached the journal but not the snapshots, then
+        # fold them in so the log never grows past a torn tail.
+        replayed = 0
+        for rec in self.journal.replay():
+            self._apply(rec)
+            replayed += 1
+        if replayed:
+            self._write_snapshots()
+            self.journal.truncate()
+
+    def _apply(self, rec: Dict[str, Any]) -> None:
+        coll, op = rec.get("c"), rec.get("op")
+        if coll == "movies":
+            self.movies_version += 1
+            if op == "put": self._set_movie(rec["doc"])
+            elif op == "del": self._unset_movie(rec.get("id"))
+        elif coll == "users":
+            if op == "put": self._set_user(rec["doc"])
+            elif op == "del": self._unset_user(rec.get("id"))
+
+    @staticmethod
+    def _by_id(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        return {r.get("id"): r for r in records if isinstance(r, (dict, MovieRecord))}
 
     @staticmethod
-    def _read(path: Path) -> List[Dict[str, Any]]:
+    def normalize_username(username: Optional[str]) -> str:
+        return (username or "").strip().lower()
+
+    @classmethod
+    def _read(cls, path: Path, hook: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[Dict[str, Any]]:
         if not path.exists():
             path.parent.mkdir(parents=True, exist_ok=True)
             path.write_text("[]", encoding="utf-8")
-        txt = path.read_text(encoding="utf-8").strip() or "[]"
+        if cls.binary_snapshots:
+            with Metrics.span("db.read_snapshot", file=path.name):
+                records = binary_snapshot.load(path, cls.snapshot_verify)
+            if records is not None:
+                # The pickle holds whatever layout wrote it; convert to the one asked for.
+                if hook is not None:
+                    return [hook(r) for r in records]
+                return [r.to_dict() if isinstance(r, MovieRecord) else r for r in records]
+        with Metrics.span("db.read", file=path.name), open(path, "rb") as f:
+            st, raw = os.fstat(f.fileno()), f.read()  # the stat describes exactly these bytes
         try:
-            data = json.loads(txt)
-            return data if isinstance(data, list) else []
-        except json.JSONDecodeError:
+            data = json.loads(raw.strip() or b"[]", object_hook=hook)  # hook converts each record as it is parsed
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return []
+        if not isinstance(data, list):
             return []
+        if cls.binary_snapshots:
+            if hook is None:
+                binary_snapshot.intern_strings(data)
+            try:
+                binary_snapshot.save(path, data, raw, st)
+            except OSError:
+                pass  # only a cache; the next start parses the JSON again
+        return data
 
-    @staticmethod
-    def _atomic_write(path: Path, data: List[Dict[str, Any]]) -> None:
+    def _atomic_write(self, path: Path, data: List[Dict[str, Any]]) -> None:
         fd, tmp = tempfile.mkstemp(prefix=path.name, dir=str(path.parent))
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with Metrics.span("db.write", file=path.name), os.fdopen(fd, "wb") as f:
+                raw = json_bytes(data, self.json_indent)
+                f.write(raw)
                 f.flush(); os.fsync(f.fileno())
+                st = os.fstat(f.fileno())
             os.replace(tmp, path)
+            if self.binary_snapshots:
+                try:
+                    binary_snapshot.save(path, data, raw, st)  # digest the bytes just written, not a re-read
+                except OSError:
+                    pass
         finally:
             if os.path.exists(tmp):
                 try: os.remove(tmp)
                 except OSError: pass
 
-    def reload(self): self._load()
-    def save_movies(self): self._atomic_write(self.movies_path, self.movies)
-    def save_users(self):  self._atomic_write(self.users_path, self.users)
+    # ---------------- Collections ----------------
+    # The lists are shared snapshots: treat them (and their records) as read-only.
+    @property
+    def movies(self) -> List[Dict[str, Any]]:
+        snap = self._movies_snap
+        if snap is None:
+            with self._write_lock:  # waits out a write in progress, never sees half of it
+                snap = self._movies_snap
+                if snap is None:
+                    snap = self._movies_snap = list(self._movies.values())
+        return snap
+    @movies.setter
+    def movies(self, v: List[Dict[str, Any]]):
+        with self._write_lock:
+            records = self._by_id([compact_movie(m) for m in v] if self.compact_records else v)
+            if isinstance(self._movies, ShardedMovies):
+                self._movies.replace(records)
+            else:
+                self._movies = records
+            self.movies_version += 1
+            self._digest = None
+            self._order = None
+            self._movies_snap = None
+            self._touch("movies")
+
+    @property
+    def users(self) -> List[Dict[str, Any]]:
+        snap = self._users_snap
+        if snap is None:
+            with self._write_lock:
+                snap = self._users_snap
+                if snap is None:
+                    snap = self._users_snap = list(self._users.values())
+        return snap
+    @users.setter
+    def users(self, v: List[Dict[str, Any]]):
+        with self._write_lock:
+            self._users = self._by_id(v)
+            self._usernames = {}
+            for u in self._users.values():
+                self._usernames.setdefault(self.normalize_username(u.get("username")), u)
+            self._users_snap = None
+            self._touch("users")
+
+    # ---------------- Indexed access ----------------
+    def get_movie(self, movie_id: str) -> Optional[Dict[str, Any]]:
+        return self._movies.get(movie_id)
+
+    def put_movie(self, movie: Dict[str, Any]) -> None:
+        self._check_json(movie)
+        with self._write_lock:
+            self._set_movie(movie)
+            self.movies_version += 1
+            seq = self._commit("movies", "put", doc=movie)
+        self._settle(seq)
+
+    def insert_movie(self, movie: Dict[str, Any]) -> None:
+        """Add a movie whose id must be new; the check and the write are atomic."""
+        self._check_json(movie)
+        with self._write_lock:
+            if movie["id"] in self._movies:
+                raise ValueError(f"movie with id='{movie['id']}' already exists")
+            self._set_movie(movie)
+            self.movies_version += 1
+            seq = self._commit("movies", "put", doc=movie)
+        self._settle(seq)
+
+    def insert_movies(self, movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Atomically add the movies whose ids are not taken yet (first one wins); returns those added."""
+        with self._write_lock:
+            fresh: Dict[str, Dict[str, Any]] = {}
+            for m in movies:
+                if m["id"] not in self._movies and m["id"] not in fresh:
+                    fresh[m["id"]] = m
+            added = list(fresh.values())
+            seq = self._put_many(added)
+        self._settle(seq)
+        return added
+
+    def patch_movie(self, movie_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Read-modify-write under the writer lock, so concurrent patches never lose each other's fields."""
+        with self._write_lock:
+            old = self._movies.get(movie_id)
+            if old is None:
+                return None
+            updated = {**old, **patch, "id": movie_id}
+            self._check_json(updated)
+            self._set_movie(updated)
+            self.movies_version += 1
+            seq = self._commit("movies", "put", doc=updated)
+        self._settle(seq)
+        return updated
+
+    def put_movies(self, movies: List[Dict[str, Any]]) -> None:
+        """Batch put: one snapshot rewrite, or one journal sync for the whole batch."""
+        with self._write_lock:
+            seq = self._put_many(movies)
+        self._settle(seq)
+
+    def _put_many(self, movies: List[Dict[str, Any]]) -> Optional[int]:
+        if not movies:
+            return None
+        for m in movies:  # all or nothing
+            self._check_json(m)
+        seq = None
+        self.movies_version += 1
+        for m in movies:
+            self._set_movie(m)
+            if self.write_mode == "journal":
+                seq = self.journal.append({"c": "movies", "op": "put", "doc": m})
+        if self.write_mode != "journal":
+            self._persist("movies")
+        return seq
+
+    def remove_movie(self, movie_id: str) -> bool:
+        with self._write_lock:
+            if not self._unset_movie(movie_id):
+                return False
+            self.movies_version += 1
+            seq = self._commit("movies", "del", id=movie_id)
+        self._settle(seq)
+        return True
+
+    def _set_movie(self, movie: Dict[str, Any]) -> None:
+        # Replacing an existing key keeps its position, so file order is stable.
+        old = self._movies.get(movie["id"])
+        stored = compact_movie(movie) if self.compact_records else movie
+        self._movies[movie["id"]] = stored
+        self._movies_snap = None
+        if self._digest is not None:
+            self._digest = (self._digest - (self._hash(old) if old is not None else 0) + self._hash(movie)) & _DIGEST_MASK
+        if self._order is not None:
+            if old is not None:
+                self._unorder(old)
+            self._reorder(stored)
+
+    def _unset_movie(self, movie_id: str) -> bool:
+        old = self._movies.pop(movie_id, None)
+        if old is None:
+            return False
+        self._movies_snap = None
+        if self._digest is not None:
+            self._digest = (self._digest - self._hash(old)) & _DIGEST_MASK
+        if self._order is not None:
+            self._unorder(old)
+        return True
+
+    @staticmethod
+    def _genre_key(movie: Dict[str, Any]) -> str:
+        return (movie.get("genre") or "").strip().lower()
+
+    def _reorder(self, movie: Dict[str, Any]) -> None:
+        mid = movie.get("id")
+        if isinstance(mid, str):
+            self._order[None].add(mid)
+            self._order.setdefault(self._genre_key(movie), SortedIds()).add(mid)
+
+    def _unorder(self, movie: Dict[str, Any]) -> None:
+        mid = movie.get("id")
+        if isinstance(mid, str):
+            self._order[None].discard(mid)
+            per_genre = self._order.get(self._genre_key(movie))
+            if per_genre is not None:
+                per_genre.discard(mid)
+
+    def page_movies(self, after: Optional[str], limit: int, genre: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Up to `limit` movies with id > `after` in id order, optionally of one genre (case-insensitive)."""
+        with self._write_lock:
+            if self._order is None:
+                self._order = {None: SortedIds()}
+                for m in self._movies.values():
+                    self._reorder(m)
+            ids = self._order.get(None if genre is None else genre.strip().lower())
+            page = ids.after(after, limit) if ids is not None else []
+            return [self._movies[mid] for mid in page]
+
+    @staticmethod
+    def _check_json(record: Dict[str, Any]) -> None:
+        """Reject a record the JSON files could not hold before it changes anything."""
+        try:
+            json.dumps(record, ensure_ascii=False, default=json_default)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"record {record.get('id')!r} is not JSON-serializable: {e}") from None
+
+    @staticmethod
+    def _hash(record: Dict[str, Any]) -> int:
+        doc = json.dumps(record, sort_keys=True, ensure_ascii=False, default=json_default).encode("utf-8")
+        return int.from_bytes(hashlib.blake2b(doc, digest_size=16).digest(), "big")
+
+    @property
+    def catalog_digest(self) -> str:
+        """
+        Content hash of the catalog that is stable across restarts (unlike
+        movies_version). It is a sum of per-record hashes, so each mutation
+        updates it in O(1) after the first full pass.
+        """
+        with self._write_lock:
+            if self._digest is None:
+                self._digest = sum(self._hash(m) for m in self._movies.values()) & _DIGEST_MASK
+            return f"{self._digest:032x}"
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return self._users.get(user_id)
+
+    def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        return self._usernames.get(self.normalize_username(username))
+
+    def put_user(self, user: Dict[str, Any]) -> None:
+        self._check_json(user)
+        with self._write_lock:
+            self._set_user(user)
+            seq = self._commit("users", "put", doc=user)
+        self._settle(seq)
+
+    def insert_user(self, user: Dict[str, Any]) -> None:
+        """Add a user whose id and username must both be new; the checks and the write are atomic."""
+        self._check_json(user)
+        with self._write_lock:
+            if user["id"] in self._users:
+                raise ValueError(f"user with id='{user['id']}' already exists")
+            if self.normalize_username(user.get("username")) in self._usernames:
+                raise ValueError(f"username '{user.get('username')}' is already taken")
+            self._set_user(user)
+            seq = self._commit("users", "put", doc=user)
+        self._settle(seq)
+
+    def patch_user(self, user_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Atomic read-modify-write; a username taken by another user raises ValueError."""
+        with self._write_lock:
+            old = self._users.get(user_id)
+            if old is None:
+                return None
+            if "username" in patch:
+                owner = self._usernames.get(self.normalize_username(patch["username"]))
+                if owner is not None and owner.get("id") != user_id:
+                    raise ValueError(f"username '{patch['username']}' is already taken")
+            updated = {**old, **patch, "id": user_id}
+            self._check_json(updated)
+            self._set_user(updated)
+            seq = self._commit("users", "put", doc=updated)
+        self._settle(seq)
+        return updated
+
+    def remove_user(self, user_id: str) -> bool:
+        with self._write_lock:
+            if not self._unset_user(user_id):
+                return False
+            seq = self._commit("users", "del", id=user_id)
+        self._settle(seq)
+        return True
+
+    def _set_user(self, user: Dict[str, Any]) -> None:
+        old = self._users.get(user["id"])
+        if old is not None:
+            self._drop_username(old)
+        self._users[user["id"]] = user
+        self._users_snap = None
+        self._usernames.setdefault(self.normalize_username(user.get("username")), user)
+
+    def _unset_user(self, user_id: str) -> bool:
+        old = self._users.pop(user_id, None)
+        if old is None:
+            return False
+        self._users_snap = None
+        self._drop_username(old)
+        return True
+
+    def _drop_username(self, user: Dict[str, Any]) -> None:
+        key = self.normalize_username(user.get("username"))
+        if self._usernames.get(key) is user:
+            del self._usernames[key]
+
+    # ---------------- Persistence ----------------
+    def _commit(self, collection: str, op: str, **fields: Any) -> Optional[int]:
+        """Persist one mutation (caller holds _write_lock). Returns the journal seq to wait on."""
+        if self.write_mode == "journal":
+            return self.journal.append({"c": collection, "op": op, **fields})
+        self._persist(collection)
+        return None
+
+    def _persist(self, collection: str) -> None:
+        if self.write_mode == "deferred":
+            self._touch(collection)
+            self._pending += 1
+            if self._pending >= self.flush_pending:
+                self._flush_cond.notify()
+        elif collection == "movies": self.save_movies()
+        else: self.save_users()
+
+    def _touch(self, collection: str) -> None:
+        # Caller holds _write_lock.
+        if collection not in self._dirty:
+            self._dirty[collection] = time.monotonic()
+            if self.write_mode == "deferred":
+                self._start_flusher()
+                self._flush_cond.notify()
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None:
+            atexit.register(self.flush)
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_loop, name="db-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._write_lock:
+                while True:
+                    if self._dirty:
+                        if self._pending >= self.flush_pending:
+                            break
+                        wait = min(self._dirty.values()) + self.flush_interval - time.monotonic()
+                        if wait <= 0:
+                            break
+                    else:
+                        wait = None
+                    self._flush_cond.wait(wait)
+            try:
+                self.flush()
+            except Exception:  # whatever failed is still dirty and retried on the next round
+                Metrics.inc("db.flush_error")
+                _log.exception("deferred flush failed; retrying in %.1fs", self.flush_interval)
+                time.sleep(self.flush_interval)
+
+    def flush(self) -> None:
+        """Write every collection changed since it was last saved; a no-op when nothing is."""
+        if self.write_mode != "deferred":
+            with self._write_lock:
+                for collection in list(self._dirty):
+                    self._save(collection)
+            return
+        # Deferred mode: every snapshot write goes through here, one at a time,
+        # so a file is never overwritten by an older snapshot.
+        with self._flush_lock:
+            with self._write_lock:
+                since = dict(self._dirty)
+                files = [f for c in since for f in self._files(c)]
+                self._dirty.clear()
+                self._pending = 0
+            # Snapshots are immutable, so the (slow) write runs without blocking writers.
+            self._write_files(files, since)
+
+    def _files(self, collection: str) -> List[Tuple[str, Path, List[Dict[str, Any]], Optional[int]]]:
+        """(collection, path, records, shard) for each file to rewrite; caller holds _write_lock."""
+        if collection == "users":
+            return [("users", self.users_path, self.users, None)]
+        if isinstance(self._movies, ShardedMovies):  # only the shards that changed
+            return [("movies", path, records, i) for i, path, records in self._movies.take_dirty()]
+        return [("movies", self.movies_path, self.movies, None)]
+
+    def _write_files(self, files: List[Tuple[str, Path, List[Dict[str, Any]], Optional[int]]],
+                     since: Dict[str, float]) -> None:
+        """Write every file; one that fails stays dirty and the first error is raised after the rest are written."""
+        error: Optional[Exception] = None
+        for n, (_, path, records, _) in enumerate(files):
+            try:
+                self._atomic_write(path, records)
+            except Exception as e:
+                error = error or e
+                self._redirty(files[n:n + 1], since)
+            except BaseException:
+                self._redirty(files[n:], since)
+                raise
+        if error is not None:
+            raise error
+
+    def _redirty(self, files: List[Tuple[str, Path, List[Dict[str, Any]], Optional[int]]],
+                 since: Dict[str, float]) -> None:
+        with self._write_lock:
+            for collection, _, _, shard in files:
+                self._dirty.setdefault(collection, since.get(collection, time.monotonic()))
+                if shard is not None:
+                    self._movies.mark_dirty([shard])
+
+    def _settle(self, seq: Optional[int]) -> None:
+        if seq is None:
+            return
+        self.journal.sync(seq)
+        if self.journal.records >= self.compact_every:
+            with self._write_lock:
+                if self.journal.records >= self.compact_every:
+                    self.compact()
+
+    def compact(self) -> None:
+        """Fold the journal into fresh JSON snapshots and truncate it."""
+        with self._write_lock:
+            try:
+                self.journal.sync()
+            except OSError:
+                pass  # memory holds every mutation; the snapshots below supersede the log
+            self._write_snapshots()
+            self.journal.truncate()
+
+    def _write_snapshots(self) -> None:
+        # Caller holds _write_lock.
+        self._write_files(self._files("movies") + self._files("users"), {})
+        self._dirty.clear()
+        self._pending = 0
+
+    def reload(self):
+        self.flush()
+        with self._write_lock:
+            self.journal.sync()
+            self._load()
+
+    def save_movies(self): self._save("movies")
+    def save_users(self): self._save("users")
     def save_all(self):
-        self._atomic_write(self.movies_path, self.movies)
-        self._atomic_write(self.users_path, self.users)
+        """Rewrite only the collections with unsaved changes."""
+        self.flush()
+
+    def _save(self, collection: str) -> None:
+        with self._write_lock:
+            if self.write_mode == "journal":
+                # The log may hold records the new snapshot drops (e.g. a movie
+                # removed through the `movies` setter); they must not be replayed.
+                self.compact()
+                return
+            if self.write_mode != "deferred":
+                self._write_files(self._files(collection), {})
+                self._dirty.pop(collection, None)
+                return
+            self._touch(collection)
+        self.flush()
@@ -1,18 +1,167 @@
 from __future__ import annotations
 from collections import defaultdict
-from typing import Callable, Dict, List, Any
+from typing import Callable, Dict, Hashable, List, Any, Optional
+import atexit, os, queue, threading, time
+
+_FLUSH = object()
+
+
+class _Subscription:
+    __slots__ = ("handler", "coalesce_key", "name")
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], None], coalesce_key: Optional[Callable[[Dict[str, Any]], Hashable]]):
+        self.handler = handler
+        self.coalesce_key = coalesce_key
+        self.name = getattr(handler, "__qualname__", None) or repr(handler)
+
 
 class EventBus:
-    _subs: Dict[str, List[Callable[[Dict[str, Any]], None]]] = defaultdict(list)
+    """
+    Process-wide publish/subscribe.
+
+    By default handlers run inline in `publish`. With EVENT_BUS_ASYNC=1 (or
+    `configure(async_mode=True)`) events go to a bounded queue drained by one
+    worker thread, so publishers return immediately (and block only when the
+    queue is full). Handlers subscribed with `coalesce_key` are invoked once
+    per key per EVENT_BUS_COALESCE_MS window (default 50) with the latest
+    payload, which turns a burst of identical invalidations into one.
+    Handler errors never reach the publisher; `stats()` reports per-handler
+    calls, errors and timings.
+    """
+
+    _subs: Dict[str, List[_Subscription]] = defaultdict(list)
+    _stats: Dict[str, Dict[str, Any]] = {}
+    _stats_lock = threading.Lock()
+
+    async_mode = os.getenv("EVENT_BUS_ASYNC", "0").strip().lower() in ("1", "true", "yes")
+    queue_size = int(os.getenv("EVENT_BUS_QUEUE_SIZE", "10000"))
+    coalesce_window = float(os.getenv("EVENT_BUS_COALESCE_MS", "50")) / 1000.0
+    _queue: "queue.Queue|None" = None
+    _worker: "threading.Thread|None" = None
+    _worker_lock = threading.Lock()
 
     @classmethod
-    def subscribe(cls, event: str, handler: Callable[[Dict[str, Any]], None]):
-        cls._subs[event].append(handler)
+    def subscribe(
+        cls,
+        event: str,
+        handler: Callable[[Dict[str, Any]], None],
+        coalesce_key: Optional[Callable[[Dict[str, Any]], Hashable]] = None,
+    ):
+        cls._subs[event].append(_Subscription(handler, coalesce_key))
 
     @classmethod
     def publish(cls, event: str, payload: Dict[str, Any]):
-        for h in cls._subs.get(event, []):
+        if not cls.async_mode:
+            for sub in list(cls._subs.get(event, [])):
+                cls._invoke(event, sub, payload)
+            return
+        cls._ensure_worker().put((event, payload))
+
+    @classmethod
+    def configure(cls, async_mode: bool | None = None, queue_size: int | None = None, coalesce_ms: float | None = None):
+        """Switch dispatch mode at runtime; pending async events are delivered first."""
+        cls.flush()
+        if queue_size is not None:
+            cls.queue_size = queue_size
+        if coalesce_ms is not None:
+            cls.coalesce_window = coalesce_ms / 1000.0
+        if async_mode is not None:
+            cls.async_mode = async_mode
+
+    @classmethod
+    def flush(cls, timeout: float | None = None) -> bool:
+        """
+        Block until every queued event (coalesced ones included) has been handled.
+        Called from a handler it cannot wait for itself and returns False at once.
+        """
+        q = cls._queue
+        if q is None or cls._worker is None or not cls._worker.is_alive():
+            return True
+        if threading.current_thread() is cls._worker:
+            return False
+        done = threading.Event()
+        q.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, Any]]:
+        with cls._stats_lock:
+            out = {key: dict(s) for key, s in cls._stats.items()}
+        for s in out.values():
+            s["avg_ms"] = round(s["total_ms"] / s["calls"], 4) if s["calls"] else 0.0
+        if cls._queue is not None:
+            out["__queue__"] = {"depth": cls._queue.qsize(), "capacity": cls._queue.maxsize}
+        return out
+
+    # ---------------- internals ----------------
+    @classmethod
+    def _invoke(cls, event: str, sub: _Subscription, payload: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        error: Exception | None = None
+        try:
+            sub.handler(payload)
+        except Exception as e:
+            error = e
+        elapsed = (time.perf_counter() - start) * 1000.0
+        key = f"{event}:{sub.name}"
+        with cls._stats_lock:
+            s = cls._stats.get(key)
+            if s is None:
+                s = cls._stats[key] = {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_error": None}
+            s["calls"] += 1
+            s["total_ms"] += elapsed
+            s["max_ms"] = max(s["max_ms"], elapsed)
+            if error is not None:
+                s["errors"] += 1
+                s["last_error"] = repr(error)
+
+    @classmethod
+    def _ensure_worker(cls) -> "queue.Queue":
+        with cls._worker_lock:
+            if cls._worker is None or not cls._worker.is_alive():
+                cls._queue = queue.Queue(maxsize=cls.queue_size)
+                cls._worker = threading.Thread(target=cls._run, args=(cls._queue,), name="event-bus", daemon=True)
+                cls._worker.start()
+            return cls._queue
+
+    @classmethod
+    def _run(cls, q: "queue.Queue") -> None:
+        # (id(sub), key) -> [deadline, event, sub, latest payload]
+        pending: Dict[tuple, list] = {}
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, min(p[0] for p in pending.values()) - time.monotonic())
             try:
-                h(payload)
-            except Exception:
-                pass
+                event, payload = q.get(timeout=timeout)
+            except queue.Empty:
+                event = None
+            if event is _FLUSH:
+                cls._drain(pending, force=True)
+                payload.set()
+                continue
+            if event is not None:
+                for sub in list(cls._subs.get(event, [])):
+                    if sub.coalesce_key is None:
+                        cls._invoke(event, sub, payload)
+                        continue
+                    try:
+                        slot = (id(sub), sub.coalesce_key(payload))
+                    except Exception:
+                        cls._invoke(event, sub, payload)
+                        continue
+                    if slot in pending:
+                        pending[slot][3] = payload
+                    else:
+                        pending[slot] = [time.monotonic() + cls.coalesce_window, event, sub, payload]
+            cls._drain(pending)
+
+    @classmethod
+    def _drain(cls, pending: Dict[tuple, list], force: bool = False) -> None:
+        now = time.monotonic()
+        for slot in [s for s, p in pending.items() if force or p[0] <= now]:
+            _, event, sub, payload = pending.pop(slot)
+            cls._invoke(event, sub, payload)
+
+
+atexit.register(EventBus.flush, 5.0)
@@ -0,0 +1,33 @@
+"""
+Pausing the cyclic garbage collector around bulk allocations.
+
+`gc.disable()`/`gc.enable()` are process-wide, so two threads toggling them
+independently can leave the collector off (or turn it back on under the
+other). `gc_paused()` counts holders under a lock: the first one in disables
+the collector and the last one out restores whatever state the first found.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Iterator
+import gc, threading
+
+_lock = threading.Lock()
+_holders = 0
+_was_enabled = False
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    global _holders, _was_enabled
+    with _lock:
+        if not _holders:
+            _was_enabled = gc.isenabled()
+            gc.disable()
+        _holders += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _holders -= 1
+            if not _holders and _was_enabled:
+                gc.enable()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import json, threading, os
+
+from infra.metrics import Metrics
+
+
+class Journal:
+    """
+    Append-only write-ahead log (one compact JSON record per line).
+
+    Writers `append` under the caller's lock (so log order == apply order) and
+    then `sync` outside it. Whoever finds no flush in progress becomes the
+    leader and writes + fsyncs everything pending; the others just wait, so a
+    burst of concurrent writers shares a single fsync (group commit).
+
+    A failed flush cuts the file back to where the batch started and requeues
+    the batch, so the next flush writes it again (its callers still get the
+    OSError). If the file cannot be cut back, the journal refuses to flush
+    until `truncate` (compaction) has made its contents redundant.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._cond = threading.Condition()
+        self._pending: List[str] = []
+        self._appended = 0      # seq of the last appended record
+        self._durable = 0       # seq of the last fsynced record
+        self._flushing = False
+        self._failed: Optional[tuple] = None  # (upto_seq, exc) of the last failed flush
+        self._broken: Optional[BaseException] = None  # set when a failed write could not be undone
+        self._fh = None
+        self.records = 0        # records in the file since the last truncate
+
+    def append(self, record: Dict[str, Any]) -> int:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._cond:
+            self._pending.append(line)
+            self._appended += 1
+            return self._appended
+
+    def sync(self, seq: Optional[int] = None) -> None:
+        with self._cond:
+            seq = self._appended if seq is None else seq
+            while self._durable < seq:
+                if self._broken is not None:
+                    raise OSError(f"journal unusable until compaction: {self._broken}")
+                if self._failed and seq <= self._failed[0]:
+                    raise OSError(f"journal flush failed: {self._failed[1]}")
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                batch, self._pending = self._pending, []
+                upto = self._appended
+                self._flushing = True
+                self._cond.release()
+                try:
+                    with Metrics.span("db.journal_flush"):
+                        self._write(batch)
+                    Metrics.observe("db.journal_batch", len(batch))
+                except Exception as e:
+                    self._cond.acquire()
+                    self._pending[:0] = batch  # retried by the next flush
+                    self._failed = (upto, e)
+                    self._flushing = False
+                    self._cond.notify_all()
+                    raise
+                self._cond.acquire()
+                self._durable = upto
+                self.records += len(batch)
+                self._flushing = False
+                self._cond.notify_all()
+
+    def _write(self, lines: List[str]) -> None:
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "ab")
+        offset = os.fstat(self._fh.fileno()).st_size
+        try:
+            if lines:
+                self._fh.write(("\n".join(lines) + "\n").encode("utf-8"))
+            self._fh.flush(); os.fsync(self._fh.fileno())
+        except BaseException:
+            self._rollback(offset)
+            raise
+
+    def _rollback(self, offset: int) -> None:
+        """Cut off whatever part of a failed batch reached the file."""
+        fh, self._fh = self._fh, None
+        try:
+            fh.close()
+        except OSError:
+            pass
+        try:
+            os.truncate(self.path, offset)
+        except OSError as e:
+            self._broken = e  # later records would land after a torn line
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Yield records from disk, stopping at a torn or corrupt tail."""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    return
+                try:
+                    rec = json.loads(raw)
+                except ValueError:
+                    return
+                if isinstance(rec, dict):
+                    yield rec
+
+    def truncate(self) -> None:
+        """Drop all records; caller must have persisted the effects of everything appended."""
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self._pending = []
+            self._durable = self._appended
+            self._broken = None
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if self.path.exists():
+                with open(self.path, "wb") as f:
+                    f.flush(); os.fsync(f.fileno())
+            self.records = 0
@@ -0,0 +1,240 @@
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import atexit, functools, inspect, json, os, threading, time
+
+# Upper bounds (inclusive) of the latency buckets, in milliseconds.
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50,
+                                         100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+SIZE_BUCKETS: Tuple[float, ...] = tuple(float(2 ** p) for p in range(4, 21))  # 16 .. ~1M
+
+
+def _le(bound: Any) -> str:
+    return bound if isinstance(bound, str) else f"{bound:g}"
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative export, quantiles estimated from buckets)."""
+
+    __slots__ = ("bounds", "unit", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Sequence[float], unit: str = "") -> None:
+        self.bounds = tuple(bounds)
+        self.unit = unit
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot: above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "min": round(self.min, 4) if self.count else 0.0,
+            "max": round(self.max, 4),
+            "mean": round(self.total / self.count, 4) if self.count else 0.0,
+            "p50": round(self.quantile(0.50), 4),
+            "p95": round(self.quantile(0.95), 4),
+            "p99": round(self.quantile(0.99), 4),
+            "buckets": {_le(b): c for b, c in zip(self.bounds + ("+Inf",), self.counts) if c},
+        }
+
+
+class _Span:
+    __slots__ = ("key", "start")
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        Metrics._record(self.key, (time.perf_counter() - self.start) * 1000.0, exc_type is not None)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def _key(name: str, labels: Dict[str, Any]) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{labels[k]}"' for k in sorted(labels)) + "}"
+
+
+class Metrics:
+    """
+    Process-wide spans, histograms and counters.
+
+    Off unless METRICS_ENABLED=1 (or `configure(enabled=True)`); while off,
+    `span()` hands back a shared no-op context manager and `inc`/`observe`
+    return after one attribute check. Spans record latency in ms under
+    `name{labels}` plus an `<name>.errors` counter when the body raises.
+    Export with `export_text()` (Prometheus-style) or `export_json()`; with
+    METRICS_DUMP=<path> a JSON dump is written at exit.
+    """
+
+    enabled = os.getenv("METRICS_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+    _counters: Dict[str, float] = {}
+    _histograms: Dict[str, Histogram] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, enabled: bool | None = None) -> None:
+        if enabled is not None:
+            cls.enabled = enabled
+
+    @classmethod
+    def span(cls, name: str, **labels: Any):
+        if not cls.enabled:
+            return _NOOP
+        return _Span(_key(name, labels))
+
+    @classmethod
+    def timed(cls, name: str, **labels: Any) -> Callable[[Callable], Callable]:
+        """Decorator form of `span` (sync and async functions)."""
+        key = _key(name, labels)
+
+        def wrap(fn: Callable) -> Callable:
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    if not cls.enabled:
+                        return await fn(*args, **kwargs)
+                    with _Span(key):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not cls.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(key):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return wrap
+
+    @classmethod
+    def inc(cls, name: str, value: float = 1, **labels: Any) -> None:
+        if not cls.enabled:
+            return
+        key = _key(name, labels)
+        with cls._lock:
+            cls._counters[key] = cls._counters.get(key, 0) + value
+
+    @classmethod
+    def observe(cls, name: str, value: float, buckets: Sequence[float] = SIZE_BUCKETS, **labels: Any) -> None:
+        """Record a non-latency value (sizes, counts) in a histogram."""
+        if not cls.enabled:
+            return
+        cls._observe(_key(name, labels), value, buckets)
+
+    @classmethod
+    def _record(cls, key: str, ms: float, failed: bool) -> None:
+        cls._observe(key, ms, LATENCY_BUCKETS_MS, "ms")
+        if failed:
+            name, _, labels = key.partition("{")
+            err = f"{name}.errors" + ("{" + labels if labels else "")
+            with cls._lock:
+                cls._counters[err] = cls._counters.get(err, 0) + 1
+
+    @classmethod
+    def _observe(cls, key: str, value: float, buckets: Sequence[float], unit: str = "") -> None:
+        with cls._lock:
+            h = cls._histograms.get(key)
+            if h is None:
+                h = cls._histograms[key] = Histogram(buckets, unit)
+            h.observe(value)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._counters.clear()
+            cls._histograms.clear()
+
+    # ---------------- export ----------------
+    @classmethod
+    def export_json(cls) -> Dict[str, Any]:
+        with cls._lock:
+            return {
+                "enabled": cls.enabled,
+                "counters": dict(sorted(cls._counters.items())),
+                "histograms": {k: h.to_dict() for k, h in sorted(cls._histograms.items())},
+            }
+
+    @classmethod
+    def export_text(cls) -> str:
+        lines: List[str] = []
+        with cls._lock:
+            counters = sorted(cls._counters.items())
+            histograms = sorted((k, h.unit, h.bounds, list(h.counts), h.count, h.total) for k, h in cls._histograms.items())
+        typed: set = set()
+        for key, value in counters:
+            name, labels = cls._prom(key)
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name}_total counter")
+            lines.append(f"{name}_total{labels} {value:g}")
+        for key, unit, bounds, counts, count, total in histograms:
+            name, labels = cls._prom(key)
+            name = f"{name}_{unit}" if unit else name
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            inner = labels[1:-1] + "," if labels else ""
+            cumulative = 0
+            for bound, c in zip(bounds + ("+Inf",), counts):
+                cumulative += c
+                lines.append(f'{name}_bucket{{{inner}le="{_le(bound)}"}} {cumulative}')
+            lines.append(f"{name}_sum{labels} {total:.6g}")
+            lines.append(f"{name}_count{labels} {count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _prom(key: str) -> Tuple[str, str]:
+        name, brace, labels = key.partition("{")
+        name = "".join(ch if ch.isalnum() else "_" for ch in name)
+        return name, (brace + labels if brace else "")
+
+    @classmethod
+    def dump(cls, path: Optional[str] = None) -> None:
+        path = path or os.getenv("METRICS_DUMP")
+        if path and cls.enabled:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(cls.export_json(), f, indent=2)
+
+
+atexit.register(Metrics.dump)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Optional
+import json, sqlite3, threading, time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size  INTEGER NOT NULL,
+    used  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_used ON entries(used);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('bytes', 0);
+"""
+
+
+class PersistentCache:
+    """
+    Small sqlite-backed key/value cache (JSON values) that survives restarts.
+    Least-recently-used entries are evicted once stored values exceed
+    `max_bytes`.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        doc = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        size = len(doc.encode("utf-8")) + len(key)
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT INTO entries (key, value, size, used) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, used = excluded.used",
+                    (key, doc, size, time.time()),
+                )
+                conn.execute("UPDATE meta SET value = value + ? WHERE key = 'bytes'", (size - (old[0] if old else 0),))
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT value FROM meta WHERE key = 'bytes'").fetchone()[0]
+        while self.max_bytes and total > self.max_bytes:
+            victims = conn.execute("SELECT key, size FROM entries ORDER BY used LIMIT 64").fetchall()
+            if not victims:
+                break
+            for key, size in victims:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                self.evictions += 1
+                if total <= self.max_bytes:
+                    break
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'bytes'", (total,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("UPDATE meta SET value = 0 WHERE key = 'bytes'")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            size, = self._conn.execute("SELECT value FROM meta WHERE key = 'bytes'").fetchone()
+        return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
@@ -0,0 +1,217 @@
+"""
+Sharded on-disk catalog: movies split by id hash over N JSON files.
+
+    data/movies/manifest.json     {"format": 1, "shards": N, "hash": "crc32"}
+    data/movies/shard-000.json    JSON array, same records as movies.json
+    ...
+
+DatabaseManager uses it when DB_MOVIE_SHARDS=N (N > 0); on first start the
+existing movies.json is split automatically. Convert by hand with:
+    python -m infra.shards split data/movies.json [--shards 16]
+    python -m infra.shards join data/movies data/movies.json
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import argparse, json, os, tempfile, threading, zlib
+
+from infra.compact_catalog import json_bytes
+
+MANIFEST = "manifest.json"
+FORMAT = 1
+
+Records = Dict[Any, Dict[str, Any]]
+
+
+def shard_of(movie_id: Any, shards: int) -> int:
+    return zlib.crc32(str(movie_id).encode("utf-8")) % shards
+
+
+def shard_path(directory: Path, index: int) -> Path:
+    return directory / f"shard-{index:03d}.json"
+
+
+def read_manifest(directory: Path) -> Optional[Dict[str, Any]]:
+    path = directory / MANIFEST
+    if not path.exists():
+        return None
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("format") != FORMAT or manifest.get("hash") != "crc32" or int(manifest.get("shards", 0)) < 1:
+        raise ValueError(f"unsupported shard manifest: {path}")
+    return manifest
+
+
+def default_indent() -> Optional[int]:
+    """DB_JSON_INDENT (default 2; 0 for one-line JSON), as DatabaseManager reads it."""
+    return int(os.getenv("DB_JSON_INDENT", "2")) or None
+
+
+def write_json(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.name, dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json_bytes(data, indent))
+            f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def split(source: Path, directory: Path, shards: int, indent: Optional[int] = 2) -> List[int]:
+    """Write `source` (a movies.json array) as `shards` shard files; returns the record count per shard."""
+    records = json.loads(source.read_text(encoding="utf-8").strip() or "[]") if source.exists() else []
+    buckets: List[List[Dict[str, Any]]] = [[] for _ in range(shards)]
+    for r in records:
+        if isinstance(r, dict):
+            buckets[shard_of(r.get("id"), shards)].append(r)
+    for i, bucket in enumerate(buckets):
+        write_json(shard_path(directory, i), bucket, indent)
+    # The manifest goes last: a directory without one is an unfinished split.
+    write_json(directory / MANIFEST, {"format": FORMAT, "shards": shards, "hash": "crc32"}, indent)
+    return [len(b) for b in buckets]
+
+
+def join(directory: Path, target: Path, indent: Optional[int] = 2) -> int:
+    """Write every shard of `directory`, in shard order, as one movies.json array."""
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"no {MANIFEST} in {directory}")
+    records: List[Dict[str, Any]] = []
+    for i in range(int(manifest["shards"])):
+        path = shard_path(directory, i)
+        if path.exists():
+            records.extend(json.loads(path.read_text(encoding="utf-8").strip() or "[]"))
+    write_json(target, records, indent)
+    return len(records)
+
+
+class ShardedMovies:
+    """
+    Id-keyed movie map over shard files, each parsed the first time a lookup
+    or write touches it (`values()`, `len()` and iteration load them all).
+
+    Supports the dict operations DatabaseManager uses. Writes mark their
+    shard dirty and `take_dirty()` hands the dirty shards out for saving, so
+    a save rewrites only what changed. Iteration order is shard order, then
+    insertion order within a shard. Writers are serialized by the caller;
+    lookups may run concurrently with them.
+    """
+
+    def __init__(self, directory: Path, shards: int, load: Callable[[Path], Records]) -> None:
+        self.directory = directory
+        self.shards = shards
+        self._load = load
+        self._maps: List[Optional[Records]] = [None] * shards
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, directory: Path, shards: int, source: Path, load: Callable[[Path], Records],
+             indent: Optional[int] = 2) -> "ShardedMovies":
+        """Open `directory`, splitting `source` into `shards` files (written with `indent`) first if it has no manifest yet."""
+        manifest = read_manifest(directory)
+        if manifest is None:
+            split(source, directory, shards, indent)
+            manifest = read_manifest(directory)
+        return cls(directory, int(manifest["shards"]), load)
+
+    @property
+    def loaded(self) -> int:
+        return sum(m is not None for m in self._maps)
+
+    def _shard(self, index: int) -> Records:
+        m = self._maps[index]
+        if m is None:
+            with self._lock:
+                m = self._maps[index]
+                if m is None:
+                    m = self._maps[index] = self._load(shard_path(self.directory, index))
+        return m
+
+    def _owner(self, movie_id: Any) -> Records:
+        return self._shard(shard_of(movie_id, self.shards))
+
+    # ---------------- dict protocol ----------------
+    def get(self, movie_id: Any, default: Any = None) -> Any:
+        return self._owner(movie_id).get(movie_id, default)
+
+    def __getitem__(self, movie_id: Any) -> Dict[str, Any]:
+        return self._owner(movie_id)[movie_id]
+
+    def __contains__(self, movie_id: Any) -> bool:
+        return movie_id in self._owner(movie_id)
+
+    def __setitem__(self, movie_id: Any, movie: Dict[str, Any]) -> None:
+        index = shard_of(movie_id, self.shards)
+        self._shard(index)[movie_id] = movie
+        self._dirty.add(index)
+
+    def pop(self, movie_id: Any, default: Any = None) -> Any:
+        index = shard_of(movie_id, self.shards)
+        found = self._shard(index).pop(movie_id, default)
+        if found is not default:
+            self._dirty.add(index)
+        return found
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.shards):
+            yield from self._shard(i).values()
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self.shards):
+            yield from self._shard(i)
+
+    def __len__(self) -> int:
+        return sum(len(self._shard(i)) for i in range(self.shards))
+
+    def replace(self, records: Records) -> None:
+        """Swap in a whole new catalog (every shard becomes dirty)."""
+        maps: List[Records] = [{} for _ in range(self.shards)]
+        for movie_id, movie in records.items():
+            maps[shard_of(movie_id, self.shards)][movie_id] = movie
+        self._maps = list(maps)
+        self._dirty = set(range(self.shards))
+
+    # ---------------- persistence ----------------
+    def take_dirty(self) -> List[Tuple[int, Path, List[Dict[str, Any]]]]:
+        """(index, path, records) for every dirty shard, marking them clean."""
+        dirty, self._dirty = sorted(self._dirty), set()
+        return [(i, shard_path(self.directory, i), list(self._maps[i].values())) for i in dirty]
+
+    def mark_dirty(self, indices: List[int]) -> None:
+        self._dirty.update(indices)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert between movies.json and a sharded catalog directory.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("split", help="movies.json -> <dir>/manifest.json + shard files")
+    p.add_argument("source")
+    p.add_argument("directory", nargs="?", help="default: the source path without .json")
+    p.add_argument("--shards", type=int, default=16)
+    p = sub.add_parser("join", help="<dir> -> one movies.json")
+    p.add_argument("directory")
+    p.add_argument("target")
+    for p in sub.choices.values():
+        p.add_argument("--indent", type=int, help="default: DB_JSON_INDENT, else 2; 0 for one-line JSON")
+    args = parser.parse_args(argv)
+
+    indent = default_indent() if args.indent is None else args.indent or None
+    if args.cmd == "split":
+        if args.shards < 1:
+            parser.error("--shards must be at least 1")
+        source = Path(args.source)
+        directory = Path(args.directory) if args.directory else source.with_suffix("")
+        if read_manifest(directory) is not None:
+            parser.error(f"{directory} already holds a sharded catalog")
+        counts = split(source, directory, args.shards, indent)
+        print(json.dumps({"directory": str(directory), "shards": args.shards, "movies": sum(counts)}))
+    else:
+        count = join(Path(args.directory), Path(args.target), indent)
+        print(json.dumps({"target": args.target, "movies": count}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional
+
+
+class SortedIds:
+    """Sorted list of ids supporting O(log n) cursor seeks ("ids after X")."""
+
+    __slots__ = ("_ids",)
+
+    def __init__(self, ids: Iterable[str] = ()) -> None:
+        self._ids: List[str] = sorted(ids)
+
+    def add(self, movie_id: str) -> None:
+        i = bisect_left(self._ids, movie_id)
+        if i == len(self._ids) or self._ids[i] != movie_id:
+            self._ids.insert(i, movie_id)
+
+    def discard(self, movie_id: str) -> None:
+        i = bisect_left(self._ids, movie_id)
+        if i < len(self._ids) and self._ids[i] == movie_id:
+            del self._ids[i]
+
+    def after(self, cursor: Optional[str], limit: int) -> List[str]:
+        start = 0 if cursor is None else bisect_right(self._ids, cursor)
+        return self._ids[start:start + limit]
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import argparse, json, os, sqlite3, threading
+
+from infra.database_manager import DatabaseManager
+from infra.metrics import Metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS movies (
+    id    TEXT PRIMARY KEY,
+    title TEXT,
+    genre TEXT,
+    doc   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS movies_genre ON movies(genre);
+CREATE INDEX IF NOT EXISTS movies_genre_page ON movies(lower(trim(genre)), id);
+CREATE TABLE IF NOT EXISTS users (
+    id       TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    doc      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_username ON users(username);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('movies_version', 0);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('db_id', abs(random()));
+CREATE TRIGGER IF NOT EXISTS movies_ins AFTER INSERT ON movies
+    BEGIN UPDATE meta SET value = value + 1 WHERE key = 'movies_version'; END;
+CREATE TRIGGER IF NOT EXISTS movies_upd AFTER UPDATE ON movies
+    BEGIN UPDATE meta SET value = value + 1 WHERE key = 'movies_version'; END;
+CREATE TRIGGER IF NOT EXISTS movies_del AFTER DELETE ON movies
+    BEGIN UPDATE meta SET value = value + 1 WHERE key = 'movies_version'; END;
+"""
+
+# Fixed SQL text: sqlite3 keeps a per-connection statement cache, so each of
+# these is prepared once and re-bound on every call.
+_SQL_MOVIES_VERSION = "SELECT value FROM meta WHERE key = 'movies_version'"
+_SQL_DB_ID = "SELECT value FROM meta WHERE key = 'db_id'"
+_SQL_ALL_MOVIES = "SELECT doc FROM movies ORDER BY rowid"
+_SQL_PAGE_MOVIES = "SELECT doc FROM movies WHERE id > ? ORDER BY id LIMIT ?"
+_SQL_PAGE_GENRE = "SELECT doc FROM movies WHERE lower(trim(genre)) = ? AND id > ? ORDER BY id LIMIT ?"
+_SQL_GET_MOVIE = "SELECT doc FROM movies WHERE id = ?"
+_SQL_PUT_MOVIE = ("INSERT INTO movies (id, title, genre, doc) VALUES (?, ?, ?, ?) "
+                  "ON CONFLICT(id) DO UPDATE SET title = excluded.title, genre = excluded.genre, doc = excluded.doc")
+_SQL_ADD_MOVIE = "INSERT OR IGNORE INTO movies (id, title, genre, doc) VALUES (?, ?, ?, ?)"
+_SQL_DEL_MOVIE = "DELETE FROM movies WHERE id = ?"
+_SQL_ALL_USERS = "SELECT doc FROM users ORDER BY rowid"
+_SQL_GET_USER = "SELECT doc FROM users WHERE id = ?"
+_SQL_GET_USERNAME = "SELECT doc FROM users WHERE username = ? ORDER BY rowid LIMIT 1"
+_SQL_PUT_USER = ("INSERT INTO users (id, username, doc) VALUES (?, ?, ?) "
+                 "ON CONFLICT(id) DO UPDATE SET username = excluded.username, doc = excluded.doc")
+_SQL_DEL_USER = "DELETE FROM users WHERE id = ?"
+
+
+class SQLiteStore:
+    """
+    sqlite3 storage backend exposing the same surface as DatabaseManager, so
+    JSONStore/JSONAdapter work unchanged. Rows keep the full record as JSON in
+    `doc`; id/username/genre are real indexed columns. WAL mode lets several
+    processes share the file (readers never block the writer).
+    """
+
+    _instance: "SQLiteStore|None" = None
+    _lock = threading.Lock()
+
+    def __new__(cls, db_path: str | Path | None = None):
+        with cls._lock:
+            if cls._instance is None:
+                inst = super().__new__(cls)
+                inst.db_path = Path(db_path or os.getenv("SQLITE_PATH", "data/library.db"))
+                inst.db_path.parent.mkdir(parents=True, exist_ok=True)
+                inst._local = threading.local()
+                inst._write_lock = threading.Lock()
+                inst._conn().executescript(_SCHEMA)
+                cls._instance = inst
+            return cls._instance
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections must not be shared.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _one(self, sql: str, *args: Any) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(sql, args).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _all(self, sql: str) -> List[Dict[str, Any]]:
+        with Metrics.span("db.sqlite_scan"):
+            return [json.loads(doc) for (doc,) in self._conn().execute(sql)]
+
+    def _write(self, sql: str, *args: Any) -> int:
+        with self._write_lock, Metrics.span("db.sqlite_write"):
+            return self._conn().execute(sql, args).rowcount
+
+    # ---------------- Collections ----------------
+    @property
+    def movies(self) -> List[Dict[str, Any]]: return self._all(_SQL_ALL_MOVIES)
+    @movies.setter
+    def movies(self, v: List[Dict[str, Any]]): self._replace("movies", v)
+
+    @property
+    def movies_version(self) -> int:
+        # Maintained by triggers, so writes from other processes are seen too.
+        return self._conn().execute(_SQL_MOVIES_VERSION).fetchone()[0]
+
+    @property
+    def catalog_digest(self) -> str:
+        # The trigger-maintained version persists with the file, so the
+        # database id plus version identifies catalog contents across restarts.
+        conn = self._conn()
+        return f"{conn.execute(_SQL_DB_ID).fetchone()[0]:x}-{conn.execute(_SQL_MOVIES_VERSION).fetchone()[0]}"
+
+    @property
+    def users(self) -> List[Dict[str, Any]]: return self._all(_SQL_ALL_USERS)
+    @users.setter
+    def users(self, v: List[Dict[str, Any]]): self._replace("users", v)
+
+    def _replace(self, table: str, records: List[Dict[str, Any]]) -> None:
+        if table == "movies":
+            self._write_many(_SQL_PUT_MOVIE, [self._movie_row(m) for m in records], clear="movies")
+        else:
+            self._write_many(_SQL_PUT_USER, [self._user_row(u) for u in records], clear="users")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the database write lock up front, so checks
+        # made inside the transaction still hold when it commits, even
+        # against other processes.
+        with self._write_lock, Metrics.span("db.sqlite_txn"):
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _write_many(self, sql: str, rows: List[tuple], clear: str | None = None) -> None:
+        # One transaction for the whole batch (a single WAL commit).
+        with self._transaction() as conn:
+            if clear:
+                conn.execute(f"DELETE FROM {clear}")
+            conn.executemany(sql, rows)
+
+    @staticmethod
+    def _movie_row(m: Dict[str, Any]) -> tuple:
+        return (m["id"], m.get("title"), m.get("genre"), json.dumps(m, ensure_ascii=False))
+
+    @staticmethod
+    def _user_row(u: Dict[str, Any]) -> tuple:
+        return (u["id"], DatabaseManager.normalize_username(u.get("username")), json.dumps(u, ensure_ascii=False))
+
+    # ---------------- Indexed access ----------------
+    def get_movie(self, movie_id: str) -> Optional[Dict[str, Any]]:
+        return self._one(_SQL_GET_MOVIE, movie_id)
+
+    def page_movies(self, after: Optional[str], limit: int, genre: Optional[str] = None) -> List[Dict[str, Any]]:
+        if genre is None:
+            rows = self._conn().execute(_SQL_PAGE_MOVIES, (after or "", limit))
+        else:
+            rows = self._conn().execute(_SQL_PAGE_GENRE, (genre.strip().lower(), after or "", limit))
+        return [json.loads(doc) for (doc,) in rows]
+
+    def put_movie(self, movie: Dict[str, Any]) -> None:
+        self._write(_SQL_PUT_MOVIE, *self._movie_row(movie))
+
+    def put_movies(self, movies: List[Dict[str, Any]]) -> None:
+        self._write_many(_SQL_PUT_MOVIE, [self._movie_row(m) for m in movies])
+
+    def insert_movie(self, movie: Dict[str, Any]) -> None:
+        with self._transaction() as conn:
+            if conn.execute(_SQL_ADD_MOVIE, self._movie_row(movie)).rowcount == 0:
+                raise ValueError(f"movie with id='{movie['id']}' already exists")
+
+    def insert_movies(self, movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        with self._transaction() as conn:
+            return [m for m in movies if conn.execute(_SQL_ADD_MOVIE, self._movie_row(m)).rowcount]
+
+    def patch_movie(self, movie_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._transaction() as conn:
+            row = conn.execute(_SQL_GET_MOVIE, (movie_id,)).fetchone()
+            if row is None:
+                return None
+            updated = {**json.loads(row[0]), **patch, "id": movie_id}
+            conn.execute(_SQL_PUT_MOVIE, self._movie_row(updated))
+        return updated
+
+    def remove_movie(self, movie_id: str) -> bool:
+        return self._write(_SQL_DEL_MOVIE, movie_id) > 0
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return self._one(_SQL_GET_USER, user_id)
+
+    def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        return self._one(_SQL_GET_USERNAME, DatabaseManager.normalize_username(username))
+
+    def put_user(self, user: Dict[str, Any]) -> None:
+        self._write(_SQL_PUT_USER, *self._user_row(user))
+
+    def insert_user(self, user: Dict[str, Any]) -> None:
+        row = self._user_row(user)
+        with self._transaction() as conn:
+            if conn.execute(_SQL_GET_USER, (user["id"],)).fetchone() is not None:
+                raise ValueError(f"user with id='{user['id']}' already exists")
+            if conn.execute(_SQL_GET_USERNAME, (row[1],)).fetchone() is not None:
+                raise ValueError(f"username '{user.get('username')}' is already taken")
+            conn.execute(_SQL_PUT_USER, row)
+
+    def patch_user(self, user_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._transaction() as conn:
+            row = conn.execute(_SQL_GET_USER, (user_id,)).fetchone()
+            if row is None:
+                return None
+            if "username" in patch:
+                owner = conn.execute(_SQL_GET_USERNAME, (DatabaseManager.normalize_username(patch["username"]),)).fetchone()
+                if owner is not None and json.loads(owner[0]).get("id") != user_id:
+                    raise ValueError(f"username '{patch['username']}' is already taken")
+            updated = {**json.loads(row[0]), **patch, "id": user_id}
+            conn.execute(_SQL_PUT_USER, self._user_row(updated))
+        return updated
+
+    def remove_user(self, user_id: str) -> bool:
+        return self._write(_SQL_DEL_USER, user_id) > 0
+
+    # Every statement commits on its own; these exist for JSONStore parity.
+    def reload(self): pass
+    def save_movies(self): pass
+    def save_users(self): pass
+    def save_all(self): pass
+    def flush(self): pass
+
+
+def migrate(movies_path: str | Path, users_path: str | Path, db_path: str | Path | None = None) -> Dict[str, int]:
+    """Import the JSON files into the sqlite database (replacing its contents)."""
+    store = SQLiteStore(db_path)
+    movies = [m for m in DatabaseManager._read(Path(movies_path)) if isinstance(m, dict) and m.get("id")]
+    users = [u for u in DatabaseManager._read(Path(users_path)) if isinstance(u, dict) and u.get("id")]
+    store.movies = movies
+    store.users = users
+    return {"movies": len(movies), "users": len(users)}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Import data/movies.json and data/users.json into SQLite.")
+    parser.add_argument("--movies", default="data/movies.json")
+    parser.add_argument("--users", default="data/users.json")
+    parser.add_argument("--db", default=None, help="target database (default: $SQLITE_PATH or data/library.db)")
+    args = parser.parse_args(argv)
+    counts = migrate(args.movies, args.users, args.db)
+    print(f"Imported {counts['movies']} movies and {counts['users']} users into {SQLiteStore().db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import json, os, pytest, tempfile, shutil
+
+@pytest.fixture
+def temp_data(monkeypatch):
+    tmp = tempfile.mkdtemp()
+
+    movies = [
+        {"id": "m1", "title": "Inception", "genre": "Sci-Fi", "tags": ["dream"]},
+        {"id": "m2", "title": "Interstellar", "genre": "Sci-Fi", "tags": ["space"]},
+        {"id": "m3", "title": "The Dark Knight", "genre": "Action", "tags": ["hero", "crime"]}
+    ]
+    users = [
+        {"id": "u1", "name": "Alice", "username": "alice", "password": "pass", "preferences": ["Sci-Fi"]}
+    ]
+
+    os.makedirs(f"{tmp}/data", exist_ok=True)
+    open(f"{tmp}/data/movies.json", "w").write(json.dumps(movies))
+    open(f"{tmp}/data/users.json", "w").write(json.dumps(users))
+
+    monkeypatch.setenv("MOVIES_JSON_PATH", f"{tmp}/data/movies.json")
+    monkeypatch.setenv("USERS_JSON_PATH", f"{tmp}/data/users.json")
+
+    yield tmp
+    shutil.rmtree(tmp)
+
+
+@pytest.fixture(autouse=True)
+def isolated_class_state(monkeypatch):
+    """Event subscriptions and per-backend AI guards are class-level; give each test its own."""
+    from collections import defaultdict
+    from app.adapters.api_adapter import APIAdapter
+    from infra.event_bus import EventBus
+    monkeypatch.setattr(EventBus, "_subs", defaultdict(list))
+    monkeypatch.setattr(APIAdapter, "_guards", {})
+
+
+@pytest.fixture
+def open_db(tmp_path, monkeypatch):
+    """
+    Opens a fresh DatabaseManager singleton over tmp_path/data; call it again
+    to simulate a restart. Set DB_* variables before the first call. The
+    paths are absolute so every write lands in tmp_path whatever the working
+    directory is at the time.
+    """
+    from infra.database_manager import DatabaseManager
+
+    def open_() -> DatabaseManager:
+        monkeypatch.setattr(DatabaseManager, "_instance", None)
+        return DatabaseManager(tmp_path / "data" / "movies.json", tmp_path / "data" / "users.json")
+    return open_
@@ -0,0 +1,30 @@
+import json, os
+
+from infra import binary_snapshot
+
+
+def write(path, records, mtime_ns):
+    path.write_text(json.dumps(records), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_snapshot_of_a_replaced_file_is_never_served(tmp_path):
+    path = tmp_path / "movies.json"
+    old = [{"id": "m1", "title": "Old"}]
+    write(path, old, 1_000_000_000)
+    with open(path, "rb") as f:
+        st, raw = os.fstat(f.fileno()), f.read()
+    write(path, [{"id": "m1", "title": "New"}], 2_000_000_000)  # replaced after it was read
+
+    binary_snapshot.save(path, old, raw, st)
+    assert binary_snapshot.load(path) is None
+
+
+def test_store_writes_a_snapshot_that_matches_the_json(open_db, monkeypatch):
+    from infra.database_manager import DatabaseManager
+    monkeypatch.setattr(DatabaseManager, "binary_snapshots", True)
+    db = open_db()
+    db.put_movie({"id": "m1", "title": "Inception", "genre": "Sci-Fi", "tags": ["dream"]})
+
+    records = binary_snapshot.load(db.movies_path, verify_hash=True)
+    assert records == json.loads(db.movies_path.read_text(encoding="utf-8"))
@@ -0,0 +1,18 @@
+import pytest
+
+from infra.compact_catalog import MovieRecord
+
+
+@pytest.mark.parametrize("layout", ["dict", "compact"])
+def test_journal_compaction_with_either_layout(open_db, monkeypatch, layout):
+    monkeypatch.setenv("CATALOG_LAYOUT", layout)
+    monkeypatch.setenv("DB_WRITE_MODE", "journal")
+    monkeypatch.setenv("DB_COMPACT_EVERY", "3")
+    db = open_db()
+    for i in range(7):
+        db.put_movie({"id": f"m{i}", "title": f"Movie {i}", "genre": "Drama", "tags": ["x"]})
+    assert db.journal.records < 3  # compacted twice on the way
+
+    reopened = open_db()
+    assert [m["id"] for m in reopened.movies] == [f"m{i}" for i in range(7)]
+    assert all(isinstance(m, MovieRecord) == (layout == "compact") for m in reopened.movies)
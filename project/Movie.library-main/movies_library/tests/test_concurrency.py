@@ -0,0 +1,38 @@
+import sys, pytest
+
+from benchmarks.stress import duplicate_users, lost_updates, snapshot_reads
+
+
+@pytest.fixture(params=["snapshot", "journal", "deferred"])
+def services(request, open_db, monkeypatch):
+    monkeypatch.setenv("STORAGE_BACKEND", "json")
+    monkeypatch.setenv("DB_WRITE_MODE", request.param)
+    open_db()
+    from app.account_service import AccountService
+    from app.catalog_service import CatalogService
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # force the interleavings races need
+    yield CatalogService(), AccountService()
+    sys.setswitchinterval(interval)
+
+
+def test_concurrent_patches_lose_no_fields(services):
+    catalog, _ = services
+    assert lost_updates(catalog, threads=8, ops=40)["violations"] == 0
+
+
+def test_concurrent_registrations_claim_each_username_once(services):
+    _, accounts = services
+    assert duplicate_users(accounts, threads=8, ops=20)["violations"] == 0
+
+
+def test_readers_never_see_half_a_batch(services):
+    catalog, _ = services
+    assert snapshot_reads(catalog, threads=4, ops=50, batch=20)["violations"] == 0
+
+
+def test_listing_is_a_private_copy(services):
+    catalog, _ = services
+    catalog.add_movie({"id": "m1", "title": "Inception", "genre": "Sci-Fi"})
+    catalog.list_movies().clear()
+    assert [m["id"] for m in catalog.list_movies()] == ["m1"]
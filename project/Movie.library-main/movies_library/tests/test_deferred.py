@@ -0,0 +1,51 @@
+import json, time, pytest
+
+
+@pytest.fixture
+def db(open_db, monkeypatch):
+    monkeypatch.setenv("DB_WRITE_MODE", "deferred")
+    monkeypatch.setenv("DB_FLUSH_INTERVAL", "0.05")
+    return open_db()
+
+
+def on_disk(path):
+    return {r["id"]: r for r in json.loads(path.read_text(encoding="utf-8"))}
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_unserializable_values_are_rejected_at_write_time(db):
+    db.put_user({"id": "u1", "username": "alice", "preferences": []})
+    with pytest.raises(ValueError):
+        db.patch_user("u1", {"tags": {"a", "b"}})
+    with pytest.raises(ValueError):
+        db.put_movies([{"id": "m1", "title": "A", "genre": "G"}, {"id": "m2", "title": "B", "genre": object()}])
+    assert db.get_user("u1") == {"id": "u1", "username": "alice", "preferences": []}
+    assert db.get_movie("m1") is None
+    db.flush()
+    assert set(on_disk(db.users_path)) == {"u1"}
+
+
+def test_a_failing_collection_neither_kills_the_flusher_nor_blocks_the_others(db, monkeypatch):
+    real = type(db)._atomic_write
+    failures = []
+
+    def flaky(self, path, data):
+        if path == self.users_path and not failures:
+            failures.append(path)
+            raise TypeError("boom")
+        real(self, path, data)
+
+    monkeypatch.setattr(type(db), "_atomic_write", flaky)
+    db.put_user({"id": "u1", "username": "alice"})
+    db.put_movie({"id": "m1", "title": "A", "genre": "G"})
+    wait_for(lambda: failures and db.movies_path.exists() and "m1" in on_disk(db.movies_path))
+    wait_for(lambda: db.users_path.exists() and "u1" in on_disk(db.users_path))  # retried
+    db.put_movie({"id": "m2", "title": "B", "genre": "G"})
+    wait_for(lambda: "m2" in on_disk(db.movies_path))
+    assert db._flusher.is_alive()
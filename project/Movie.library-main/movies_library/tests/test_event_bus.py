@@ -0,0 +1,17 @@
+import time
+
+from infra.event_bus import EventBus
+
+
+def test_flush_from_a_handler_returns_at_once(monkeypatch):
+    monkeypatch.setattr(EventBus, "async_mode", True)
+    seen = []
+
+    def handler(payload):
+        start = time.perf_counter()
+        seen.append((EventBus.flush(timeout=2), time.perf_counter() - start < 1))
+
+    EventBus.subscribe("ping", handler)
+    EventBus.publish("ping", {})
+    assert EventBus.flush(timeout=5)
+    assert seen == [(False, True)]
@@ -0,0 +1,23 @@
+import gc, threading
+
+from infra.gc_pause import gc_paused
+
+
+def test_overlapping_pauses_restore_the_collector():
+    assert gc.isenabled()
+    first_in, second_out = threading.Event(), threading.Event()
+
+    def second():
+        first_in.wait()
+        with gc_paused():
+            pass
+        second_out.set()
+
+    t = threading.Thread(target=second)
+    t.start()
+    with gc_paused():
+        first_in.set()
+        second_out.wait(5)
+        assert not gc.isenabled()  # the other holder leaving must not re-enable it
+    t.join()
+    assert gc.isenabled()
@@ -0,0 +1,27 @@
+import json, pytest
+
+
+@pytest.fixture
+def catalog(open_db):
+    open_db()
+    from app.catalog_service import CatalogService
+    return CatalogService()
+
+
+def test_bulk_ingest_skips_malformed_lines(catalog, tmp_path):
+    feed = tmp_path / "feed.jsonl"
+    feed.write_text("\n".join([
+        json.dumps({"id": "a1", "title": "Alpha", "genre": "Drama", "tags": ["x"]}),
+        '{"id": "broken", "title": ',
+        "",
+        json.dumps({"id": "a2", "title": "Beta", "genre": "Comedy"}),
+        "not json at all",
+        json.dumps({"id": "a3", "genre": "Drama"}),  # no title
+        json.dumps({"id": "a1", "title": "Alpha again", "genre": "Drama"}),
+        json.dumps({"id": "a4", "title": "Gamma", "genre": "Sci-Fi"}),
+    ]) + "\n", encoding="utf-8")
+
+    stats = catalog.add_movies_bulk(feed, batch_size=2)
+
+    assert stats == {"added": 3, "duplicates": 1, "invalid": 3}
+    assert {m["id"] for m in catalog.list_movies()} == {"a1", "a2", "a4"}
@@ -0,0 +1,63 @@
+import os, pytest
+
+from infra.journal import Journal
+
+
+class TornWrites:
+    """File handle whose next write lands only half its bytes and then fails."""
+
+    def __init__(self, fh):
+        self.fh = fh
+
+    def write(self, data):
+        self.fh.write(data[: len(data) // 2])
+        self.fh.flush()
+        raise OSError("disk full")
+
+    def __getattr__(self, name):
+        return getattr(self.fh, name)
+
+
+def test_replay_stops_at_torn_tail(tmp_path):
+    path = tmp_path / "db.journal"
+    path.write_bytes(b'{"n":0}\n{"n":1}\n{"n":2')
+    assert [r["n"] for r in Journal(path).replay()] == [0, 1]
+
+
+def test_failed_flush_is_rolled_back_and_retried(tmp_path):
+    j = Journal(tmp_path / "db.journal")
+    j.append({"n": 0}); j.sync()
+    j._fh = TornWrites(j._fh)
+    seq = j.append({"n": 1})
+    with pytest.raises(OSError):
+        j.sync(seq)
+    j.append({"n": 2}); j.sync()
+    j.append({"n": 3}); j.sync()
+    assert [r["n"] for r in Journal(j.path).replay()] == [0, 1, 2, 3]
+
+
+def test_journal_refuses_flushes_until_truncated_when_rollback_fails(tmp_path, monkeypatch):
+    j = Journal(tmp_path / "db.journal")
+    j.append({"n": 0}); j.sync()
+    j._fh = TornWrites(j._fh)
+    monkeypatch.setattr(os, "truncate", lambda *a: (_ for _ in ()).throw(OSError("read-only")))
+    j.append({"n": 1})
+    with pytest.raises(OSError):
+        j.sync()
+    monkeypatch.undo()
+    j.append({"n": 2})
+    with pytest.raises(OSError):
+        j.sync()
+    j.truncate()  # the caller has persisted everything elsewhere
+    j.append({"n": 3}); j.sync()
+    assert [r["n"] for r in Journal(j.path).replay()] == [3]
+
+
+def test_full_save_drops_journaled_records(open_db, monkeypatch):
+    monkeypatch.setenv("DB_WRITE_MODE", "journal")
+    db = open_db()
+    db.put_movie({"id": "x", "title": "Gone", "genre": "Drama"})
+    db.put_movie({"id": "y", "title": "Kept", "genre": "Drama"})
+    db.movies = [m for m in db.movies if m["id"] != "x"]
+    db.save_movies()
+    assert [m["id"] for m in open_db().movies] == ["y"]
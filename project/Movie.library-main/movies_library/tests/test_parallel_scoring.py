@@ -0,0 +1,70 @@
+import os, signal, time, pytest
+
+from app.ai.parallel_scoring import ParallelIndex, preference_index
+from app.ai.scoring import PreferenceIndex
+
+GENRES = ["drama", "comedy", "sci-fi", "action"]
+
+
+def catalog(n):
+    return [{"id": f"m{i}", "title": f"Movie {i}", "genre": GENRES[i % 4], "tags": [f"t{i % 7}"]} for i in range(n)]
+
+
+def ids(movies):
+    return [m["id"] for m in movies]
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    monkeypatch.setenv("AI_SCORING_WORKERS", "2")
+    monkeypatch.setenv("AI_PARALLEL_MIN_MOVIES", "1")
+    yield
+    ParallelIndex.shutdown()
+
+
+def kill_a_worker():
+    ex = ParallelIndex._executors[0]
+    for pid in list(ex._processes):
+        os.kill(pid, signal.SIGKILL)
+    deadline = time.monotonic() + 10
+    while not ex._broken and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_dead_worker_falls_back_and_the_pool_is_rebuilt(parallel):
+    prefs = ["drama", "t3"]
+    movies = catalog(300)
+    index = preference_index(movies)
+    assert isinstance(index, ParallelIndex)
+    assert ids(index.top_k(prefs, 10)) == ids(PreferenceIndex(movies).top_k(prefs, 10))
+
+    kill_a_worker()
+    assert ids(index.top_k(prefs, 10)) == ids(PreferenceIndex(movies).top_k(prefs, 10))  # in-process
+
+    changed = movies + catalog(310)[300:]
+    rebuilt = preference_index(changed, index)
+    assert isinstance(rebuilt, ParallelIndex)
+    assert ids(rebuilt.top_k(prefs, 10)) == ids(PreferenceIndex(changed).top_k(prefs, 10))
+
+
+def test_partitions_that_cannot_load_fall_back_to_the_local_index(parallel, monkeypatch):
+    def unusable(cls, workers):
+        raise RuntimeError("cannot start workers")
+
+    monkeypatch.setattr(ParallelIndex, "_pool", classmethod(unusable))
+    assert isinstance(preference_index(catalog(50)), PreferenceIndex)
+
+
+def test_async_scoring_keeps_off_the_event_loop(parallel, monkeypatch):
+    import asyncio, threading
+    from app.ai.mock_client import MockAIAdapter
+    movies, ai, threads = catalog(50), MockAIAdapter(), []
+    top_k = ParallelIndex.top_k
+    monkeypatch.setattr(ParallelIndex, "top_k", lambda self, *a: threads.append(threading.current_thread()) or top_k(self, *a))
+
+    async def twice():
+        return [await ai.recommend_async({"preferences": ["drama"]}, movies, 3) for _ in range(2)]
+
+    first, second = asyncio.run(twice())
+    assert ids(first) == ids(second) == ids(PreferenceIndex(movies).top_k(["drama"], 3))
+    assert len(threads) == 2 and threading.main_thread() not in threads
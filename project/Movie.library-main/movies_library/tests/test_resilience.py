@@ -0,0 +1,213 @@
+import asyncio, threading, time, pytest
+
+from app.ai.fake_client import FakeLLMAdapter
+from app.ai.resilience import CircuitBreaker, SingleFlight, TokenBucket
+
+PROFILE = {"preferences": ["drama"]}
+MOVIES = [{"id": f"m{i}", "title": f"Movie {i}", "genre": "Drama" if i % 2 else "Comedy", "tags": []} for i in range(20)]
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    """APIAdapter over a fresh fake backend, with its own per-backend guards."""
+    from app.adapters.api_adapter import APIAdapter
+    monkeypatch.setenv("AI_FAKE_LATENCY", "0")
+
+    def make(latency=0.0, error_rate=0.0, **env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        ai = APIAdapter("fake")
+        ai._client = FakeLLMAdapter(latency=latency, error_rate=error_rate, seed=1)
+        return ai
+    return make
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    flight, calls, results = SingleFlight(), [], []
+    started = threading.Event()
+
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "answer"
+
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+    for t in followers:
+        t.start()
+    for t in [leader, *followers]:
+        t.join()
+    assert len(calls) == 1
+    assert sorted(results) == [("answer", False)] + [("answer", True)] * 5
+    assert flight.do("k", lambda: "fresh") == ("fresh", False)  # nothing is cached afterwards
+
+
+def test_single_flight_async_survives_one_waiter_giving_up():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.1)
+        return "answer"
+
+    async def main():
+        impatient = asyncio.ensure_future(flight.do_async("k", call))
+        await asyncio.sleep(0)  # it now owns the call
+        patient = asyncio.ensure_future(flight.do_async("k", call))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(main()) == ("answer", True)
+
+
+def test_token_bucket_paces_calls_and_refuses_long_waits():
+    bucket = TokenBucket(rate=10, burst=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]  # the burst
+    assert waits[2] == pytest.approx(0.1, abs=0.02) and waits[3] == pytest.approx(0.2, abs=0.02)
+    assert bucket.reserve(max_wait=0.1) is None  # would queue behind the two booked slots
+    assert TokenBucket(rate=0).reserve() == 0.0  # unlimited
+
+
+def test_circuit_breaker_opens_then_probes():
+    breaker = CircuitBreaker(failures=3, reset_timeout=0.1)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.failure()
+    assert breaker.state == "open" and not breaker.allow()
+    time.sleep(0.12)
+    assert breaker.allow()  # the probe
+    assert not breaker.allow()  # only one per reset_timeout
+    breaker.success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_identical_requests_reach_the_backend_once(adapter):
+    ai = adapter(latency=0.2)
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(ai.recommend_with_status(PROFILE, MOVIES, 3))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert ai.client.calls == 1
+    assert all(o == out[0] for o in out) and out[0][1] is False
+
+
+def test_open_circuit_serves_the_local_scorer_without_calling_the_backend(adapter):
+    from app.ai.mock_client import MockAIAdapter
+    ai = adapter(error_rate=1.0, AI_BREAKER_FAILURES=2, AI_BREAKER_RESET=60)
+    local = MockAIAdapter().recommend(PROFILE, MOVIES, 3)
+    results = [ai.recommend_with_status(PROFILE, MOVIES, 3) for _ in range(5)]
+    assert ai.client.calls == 2
+    assert results == [(local, True)] * 5
+    assert ai.guards[2].state == "open"
+
+
+def test_rate_limited_requests_fall_back_instead_of_queueing_past_the_timeout(adapter):
+    ai = adapter(AI_QPS=1, AI_BURST=1, AI_TIMEOUT=0.2)
+    assert ai.recommend_with_status(PROFILE, MOVIES, 3)[1] is False
+    assert ai.recommend_with_status({"preferences": ["comedy"]}, MOVIES, 3)[1] is True
+    assert ai.client.calls == 1
+
+
+def test_degraded_results_are_not_cached(adapter, open_db, tmp_path, monkeypatch):
+    open_db()
+    monkeypatch.setenv("AI_BACKEND", "fake")
+    monkeypatch.setenv("RECO_DISK_CACHE", str(tmp_path / "reco_cache.db"))
+    from app.gateway import APIGateway
+    gw = APIGateway()
+    gw.catalog.add_movies_bulk(MOVIES)
+    gw.register_user("u1", "Ann", "ann", "pw", ["drama"])
+    svc = gw.reco
+    svc.ai = adapter(error_rate=1.0, AI_BREAKER_FAILURES=1, AI_BREAKER_RESET=0.05)
+
+    svc.recommend_for_user("u1", k=3)  # backend down: local stand-in
+    assert svc.ai.client.calls == 1 and svc.cache_stats()["disk"]["entries"] == 0
+
+    time.sleep(0.06)
+    svc.ai.client.error_rate = 0.0
+    svc.recommend_for_user("u1", k=3)  # not served from a cache: the backend is asked again
+    svc.recommend_for_user("u1", k=3)  # now cached
+    assert svc.ai.client.calls == 2 and svc.cache_stats()["disk"]["entries"] == 1
+
+
+class Rejected(Exception):
+    status_code = 401
+
+
+class Overloaded(Exception):
+    status_code = 503
+
+
+def test_only_transient_errors_fall_back(adapter):
+    ai = adapter(AI_BREAKER_FAILURES=1, AI_BREAKER_RESET=60)
+
+    def fail(error):
+        def recommend(**_):
+            raise error
+        ai._client.recommend = recommend
+
+    fail(Rejected("bad key"))
+    with pytest.raises(Rejected):
+        ai.recommend_with_status(PROFILE, MOVIES, 3)
+    assert ai.guards[2].state == "closed"  # a configuration error is not an outage
+
+    fail(Overloaded("try later"))
+    assert ai.recommend_with_status(PROFILE, MOVIES, 3)[1] is True
+    assert ai.guards[2].state == "open"
+
+
+def test_cli_marks_degraded_recommendations(adapter, open_db, monkeypatch, capsys):
+    open_db()
+    from app import cli
+    from app.gateway import APIGateway
+    gw = APIGateway()
+    gw.catalog.add_movies_bulk(MOVIES)
+    user = gw.register_user("u1", "Ann", "ann", "pw", ["drama"])
+    gw.reco.ai = adapter(error_rate=1.0)
+    monkeypatch.setattr("builtins.input", lambda _="": "3")
+    cli.recommend_cli(gw, user)
+    assert "unavailable; showing the local scorer's picks" in capsys.readouterr().out
+
+
+def test_async_calls_respect_the_concurrency_limit(adapter):
+    ai = adapter(latency=0.05, AI_MAX_CONCURRENCY=2)
+    inner, active, peak = ai._client.recommend_async, [0], [0]
+
+    async def counted(**kw):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        try:
+            return await inner(**kw)
+        finally:
+            active[0] -= 1
+    ai._client.recommend_async = counted
+
+    async def burst():
+        return await asyncio.gather(*(ai.recommend_with_status_async({"preferences": [f"tag-{i}"]}, MOVIES, 3)
+                                      for i in range(6)))
+
+    results = asyncio.run(burst())
+    assert ai.client.calls == 6 and peak[0] == 2
+    assert all(degraded is False for _, degraded in results)
+
+
+def test_async_deadline_covers_time_spent_queued(adapter):
+    ai = adapter(latency=0.3, AI_MAX_CONCURRENCY=1)
+
+    async def main():
+        slow = asyncio.ensure_future(ai.recommend_async(PROFILE, MOVIES, 3))
+        await asyncio.sleep(0.01)  # holds the only slot
+        start = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await ai.recommend_async({"preferences": ["comedy"]}, MOVIES, 3, timeout=0.1)
+        waited = time.perf_counter() - start
+        return await slow, waited
+
+    recs, waited = asyncio.run(main())
+    assert len(recs) == 3 and waited < 0.25
+    assert ai.client.calls == 1  # the queued call never reached the backend
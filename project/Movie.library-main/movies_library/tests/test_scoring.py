@@ -0,0 +1,60 @@
+import random, pytest
+
+from app.ai.batch_scoring import batch_top_k
+from app.ai.mock_client import MockAIAdapter
+from app.ai.scoring import PreferenceIndex
+
+WORDS = ["Drama", "comedy", "space", "heist", "noir"]
+
+
+def baseline(preferences, movies, k):
+    """The original mock scorer: sorted(..., reverse=True)[:k]."""
+    prefs = set(p.lower() for p in preferences)
+
+    def score(m):
+        return int((m.get("genre") or "").lower() in prefs) + sum(t.lower() in prefs for t in m.get("tags", []))
+    return sorted(movies, key=score, reverse=True)[:k]
+
+
+def catalog(n, seed=3):
+    rnd = random.Random(seed)
+    movies = []
+    for i in range(n):
+        m = {"id": f"m{i}", "title": f"Movie {i}"}
+        if i % 9:
+            m["genre"] = rnd.choice(WORDS)
+        if i % 7:
+            m["tags"] = [rnd.choice(WORDS) for _ in range(rnd.randint(0, 3))]  # repeats count twice
+        movies.append(m)
+    return movies
+
+
+def ids(movies):
+    return [m["id"] for m in movies]
+
+
+MOVIES = catalog(60)
+PROFILES = [[], ["drama"], ["SPACE", "heist"], ["noir", "noir", "comedy"], ["unknown"], WORDS]
+KS = [-3, 0, 1, 5, len(MOVIES), len(MOVIES) + 10]
+
+
+@pytest.mark.parametrize("k", KS)
+def test_index_matches_the_plain_scorer_including_ties(k):
+    index = PreferenceIndex(MOVIES)
+    for prefs in PROFILES:
+        expected = ids(baseline(prefs, MOVIES, k))
+        assert ids(index.top_k(prefs, k)) == expected
+        assert ids(MockAIAdapter().recommend({"preferences": prefs}, MOVIES, k)) == expected
+
+
+@pytest.mark.parametrize("k", KS)
+@pytest.mark.parametrize("chunk_bytes", [1, 1 << 20])
+def test_batch_matches_the_mock_adapter(k, chunk_bytes):
+    got = [ids(r) for r in batch_top_k(PROFILES, MOVIES, k, chunk_bytes=chunk_bytes)]
+    ai = MockAIAdapter()
+    assert got == [ids(ai.recommend({"preferences": prefs}, MOVIES, k)) for prefs in PROFILES]
+
+
+def test_empty_catalog():
+    assert PreferenceIndex([]).top_k(["drama"], 3) == []
+    assert list(batch_top_k([["drama"], []], [], 3)) == [[], []]
@@ -0,0 +1,60 @@
+import socket, threading, pytest
+
+
+@pytest.fixture
+def server(open_db, monkeypatch):
+    monkeypatch.setenv("AI_BACKEND", "mock")
+    open_db()
+    from app.server import GatewayServer
+    srv = GatewayServer(("127.0.0.1", 0), workers=2, keepalive=5)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv.server_address
+    srv.shutdown()
+    srv.server_close()
+
+
+def exchange(address, raw: bytes) -> bytes:
+    """Send one request and read until the server closes the connection."""
+    with socket.create_connection(address, timeout=3) as s:
+        s.sendall(raw)
+        chunks = []
+        while True:
+            chunk = s.recv(65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-1"])
+def test_bad_content_length_gets_400_and_a_closed_connection(server, length):
+    reply = exchange(server, b"POST /login HTTP/1.1\r\nHost: x\r\nContent-Length: " + length + b"\r\n\r\n{}")
+    assert reply.startswith(b"HTTP/1.1 400")
+    assert b"Connection: close" in reply
+
+
+def test_unexpected_errors_get_a_generic_500_and_are_logged(server, monkeypatch, caplog):
+    from app.gateway import APIGateway
+    monkeypatch.setattr(APIGateway, "search_movies", lambda self, q, limit: 1 / 0)
+    reply = exchange(server, b"GET /movies/search?q=x HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+    assert reply.startswith(b"HTTP/1.1 500")
+    assert reply.endswith(b'{"error": "internal server error"}')
+    assert b"ZeroDivisionError" not in reply
+    assert any(r.exc_info and r.exc_info[0] is ZeroDivisionError for r in caplog.records)
+
+
+def test_connections_beyond_the_backlog_get_503(open_db, monkeypatch):
+    monkeypatch.setenv("AI_BACKEND", "mock")
+    open_db()
+    from app.server import GatewayServer
+    srv = GatewayServer(("127.0.0.1", 0), workers=1, keepalive=5, max_pending=1)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        # One idle keep-alive connection holds the worker, the next one waits for it.
+        held = [socket.create_connection(srv.server_address, timeout=3) for _ in range(2)]
+        reply = exchange(srv.server_address, b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n")
+        assert reply.startswith(b"HTTP/1.1 503")
+        for s in held:
+            s.close()
+    finally:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,24 @@
+import json
+
+from infra import shards
+
+MOVIES = [{"id": f"m{i}", "title": f"Movie {i}", "genre": "Drama", "tags": []} for i in range(10)]
+
+
+def test_shard_files_follow_the_store_indent(open_db, tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "movies.json").write_text(json.dumps(MOVIES, indent=2), encoding="utf-8")
+    monkeypatch.setenv("DB_MOVIE_SHARDS", "2")
+    monkeypatch.setenv("DB_JSON_INDENT", "0")
+    db = open_db()
+    assert len(db.movies) == 10
+    directory = tmp_path / "data" / "movies"
+    split_files = [shards.shard_path(directory, i) for i in range(2)] + [directory / shards.MANIFEST]
+    assert all(b"\n" not in p.read_bytes() for p in split_files)
+
+    db.put_movie({"id": "m0", "title": "Renamed", "genre": "Drama", "tags": []})
+    assert all(b"\n" not in p.read_bytes() for p in split_files)
+
+    shards.main(["join", str(directory), str(tmp_path / "joined.json")])
+    joined = (tmp_path / "joined.json").read_bytes()
+    assert b"\n" not in joined and len(json.loads(joined)) == 10
@@ -0,0 +1,23 @@
+from app.ai.title_matcher import TitleMatcher
+
+CATALOG = [{"id": str(i), "title": t} for i, t in enumerate(
+    ["It", "Up", "Heat", "Drama", "Star Wars", "Star Wars: The Empire Strikes Back", "The Dark Knight", "1917"])]
+
+
+def titles(text, limit=None):
+    return [m["title"] for m in TitleMatcher(CATALOG).find(text, limit)]
+
+
+def test_one_word_titles_in_prose_do_not_match():
+    assert titles("If you liked it, pick up Heat") == []
+    assert titles("A slow drama that heats up, much like Star Wars") == ["Star Wars"]
+
+
+def test_one_word_titles_match_as_whole_lines():
+    assert titles("1. Heat (1995)\n2) Up\n- It\n1917") == ["Heat", "Up", "It", "1917"]
+
+
+def test_longest_mention_wins_in_order_of_appearance():
+    text = "Try Star Wars: The Empire Strikes Back, then the dark knight, then Star Wars."
+    assert titles(text) == ["Star Wars: The Empire Strikes Back", "The Dark Knight", "Star Wars"]
+    assert titles(text, limit=1) == ["Star Wars: The Empire Strikes Back"]